@@ -3,15 +3,38 @@
 __copyright__ = "Copyright (c) 2018-2025 Alex Laird"
 __license__ = "MIT"
 
+import base64
 import logging
-from typing import Any, Dict, List, Optional
-
-from pyngrok import conf
+import re
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import cached_property
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Set, Union
+
+from pyngrok import codec, conf
 from pyngrok.conf import PyngrokConfig
+from pyngrok.deadline import Deadline, resolve_deadline
+from pyngrok.exception import PyngrokError
 from pyngrok.ngrok import get_ngrok_process, api_request
+from pyngrok.ratelimit import TokenBucket
 
 logger = logging.getLogger(__name__)
 
+#: The default delay, in seconds, between polls in :func:`~pyngrok.agent.iter_requests` while requests are arriving.
+DEFAULT_POLL_INTERVAL = 0.25
+#: The default max delay, in seconds, that polls in :func:`~pyngrok.agent.iter_requests` back off to while idle.
+DEFAULT_MAX_POLL_INTERVAL = 5.0
+
+#: The default number of requests :func:`~pyngrok.agent.replay_many` replays at once.
+DEFAULT_REPLAY_CONCURRENCY = 8
+
+# The smallest page of requests fetched per poll once iter_requests() is caught up
+_MIN_PAGE_SIZE = 10
+# How many recently seen request IDs iter_requests() remembers to avoid yielding a capture twice
+_SEEN_IDS_SIZE = 1000
+
 
 class NgrokAgent:
     """
@@ -59,6 +82,66 @@ class CapturedRequest:
         self.request: Any = data.get("request")
         self.response: Any = data.get("response")
 
+    @cached_property
+    def request_raw(self) -> Optional[bytes]:
+        """
+        The raw request, decoded on first access, or ``None`` if it was not captured or was excluded.
+        """
+        return _decode_raw(self.request)
+
+    @cached_property
+    def request_body(self) -> Optional[memoryview]:
+        """
+        The request body, as a view over :attr:`request_raw`, so it is not copied.
+        """
+        return _body(self.request_raw)
+
+    @cached_property
+    def request_headers(self) -> Dict[str, List[str]]:
+        """
+        The request headers, parsed from :attr:`request_raw` if ``ngrok`` did not report them.
+        """
+        return _headers(self.request, self.request_raw)
+
+    @cached_property
+    def request_json(self) -> Any:
+        """
+        The request body parsed as JSON, or ``None`` if it is empty.
+
+        :raises: :py:class:`ValueError`: When the body is not valid JSON.
+        """
+        return _json(self.request_body)
+
+    @cached_property
+    def response_raw(self) -> Optional[bytes]:
+        """
+        The raw response, decoded on first access, or ``None`` if it was not captured or was excluded.
+        """
+        return _decode_raw(self.response)
+
+    @cached_property
+    def response_body(self) -> Optional[memoryview]:
+        """
+        The response body, as a view over :attr:`response_raw`, so it is not copied.
+        """
+        return _body(self.response_raw)
+
+    @cached_property
+    def response_headers(self) -> Dict[str, List[str]]:
+        """
+        The response headers, parsed from :attr:`response_raw` if ``ngrok`` did not report them.
+        """
+        return _headers(self.response, self.response_raw)
+
+    @cached_property
+    def response_json(self) -> Any:
+        """
+        The response body parsed as JSON, or ``None`` if it is empty.
+
+        :raises: :py:class:`ValueError`: When the body is not valid JSON.
+        """
+        return _json(self.response_body)
+
     def __repr__(self) -> str:
         return f"<CapturedRequest: \"{self.id}\">"
 
@@ -66,7 +149,38 @@ class CapturedRequest:
         return f"CapturedRequest: \"{self.id}\""
 
 
-def get_agent_status(pyngrok_config: Optional[PyngrokConfig] = None, ) -> NgrokAgent:
+class ReplayResult:
+    """
+    An object containing the outcome of a request replayed by :func:`~pyngrok.agent.replay_many`.
+    """
+
+    def __init__(self,
+                 request_id: str,
+                 latency: float,
+                 error: Optional[PyngrokError] = None) -> None:
+        #: The ID of the replayed request.
+        self.request_id: str = request_id
+        #: How long, in seconds, ``ngrok`` took to accept the replay.
+        self.latency: float = latency
+        #: The error, if the replay failed.
+        self.error: Optional[PyngrokError] = error
+
+    @property
+    def ok(self) -> bool:
+        """
+        Whether the request was replayed successfully.
+        """
+        return self.error is None
+
+    def __repr__(self) -> str:
+        return f"<ReplayResult: \"{self.request_id}\" ok={self.ok}>"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"ReplayResult: \"{self.request_id}\" ok={self.ok}"
+
+
+def get_agent_status(pyngrok_config: Optional[PyngrokConfig] = None,
+                     deadline: Optional[Union[float, Deadline]] = None) -> NgrokAgent:
     """
     Get the ``ngrok`` agent status.
 
@@ -78,22 +192,34 @@ def get_agent_status(pyngrok_config: Optional[PyngrokConfig] = None, ) -> NgrokA
 
     :param pyngrok_config: A ``pyngrok`` configuration to use when interacting with the ``ngrok`` binary,
         overriding :func:`~pyngrok.conf.get_default()`.
+    :param deadline: The overall deadline, or its budget in seconds, shared by installing and starting ``ngrok``
+        and the request.
     :return: The requests made to the tunnels.
+    :raises: :class:`~pyngrok.exception.PyngrokDeadlineError`: When the ``deadline`` is exhausted.
     """
     if pyngrok_config is None:
         pyngrok_config = conf.get_default()
+    deadline = resolve_deadline(deadline)
 
-    api_url = get_ngrok_process(pyngrok_config).api_url
+    api_url = get_ngrok_process(pyngrok_config, deadline).api_url
 
     return NgrokAgent(api_request(f"{api_url}/api/status", "GET",
-                                  timeout=pyngrok_config.request_timeout))
+                                  timeout=pyngrok_config.request_timeout,
+                                  retry_policy=pyngrok_config.retry_policy,
+                                  deadline=deadline))
 
 
 def get_requests(tunnel_name: Optional[str] = None,
-                 pyngrok_config: Optional[PyngrokConfig] = None, ) -> List[CapturedRequest]:
+                 pyngrok_config: Optional[PyngrokConfig] = None,
+                 include_raw: bool = True,
+                 deadline: Optional[Union[float, Deadline]] = None) -> List[CapturedRequest]:
     """
     Get the list of requests made to either all tunnels, or the given tunnel name.
 
+    For summary views of many requests, pass ``include_raw=False``, so the raw requests and responses, which
+    include their bodies, are discarded as soon as they are parsed, rather than held on to by each
+    :class:`~pyngrok.agent.CapturedRequest`.
+
     If ``ngrok`` is not installed at :class:`~pyngrok.conf.PyngrokConfig`'s ``ngrok_path``, calling this method
     will first download and install ``ngrok``.
 
@@ -103,24 +229,36 @@ def get_requests(tunnel_name: Optional[str] = None,
     :param tunnel_name: The tunnel name to filter by.
     :param pyngrok_config: A ``pyngrok`` configuration to use when interacting with the ``ngrok`` binary,
         overriding :func:`~pyngrok.conf.get_default()`.
+    :param include_raw: Keep the raw requests and responses.
+    :param deadline: The overall deadline, or its budget in seconds, shared by installing and starting ``ngrok``
+        and the request.
     :return: The requests made to the tunnels.
+    :raises: :class:`~pyngrok.exception.PyngrokDeadlineError`: When the ``deadline`` is exhausted.
     """
     if pyngrok_config is None:
         pyngrok_config = conf.get_default()
+    deadline = resolve_deadline(deadline)
     params = {"tunnel_name": tunnel_name} if tunnel_name else None
 
-    api_url = get_ngrok_process(pyngrok_config).api_url
+    api_url = get_ngrok_process(pyngrok_config, deadline).api_url
 
     requests = []
     for request in api_request(f"{api_url}/api/requests/http", "GET",
                                params=params,
-                               timeout=pyngrok_config.request_timeout)["requests"]:
+                               timeout=pyngrok_config.request_timeout,
+                               retry_policy=pyngrok_config.retry_policy,
+                               deadline=deadline)["requests"]:
+        if not include_raw:
+            for message in [request.get("request"), request.get("response")]:
+                if isinstance(message, dict):
+                    message.pop("raw", None)
         requests.append(CapturedRequest(request))
     return requests
 
 
 def get_request(request_id: str,
-                pyngrok_config: Optional[PyngrokConfig] = None, ) -> CapturedRequest:
+                pyngrok_config: Optional[PyngrokConfig] = None,
+                deadline: Optional[Union[float, Deadline]] = None) -> CapturedRequest:
     """
     Get the given request made.
 
@@ -133,20 +271,27 @@ def get_request(request_id: str,
     :param request_id: The ID of the request to fetch.
     :param pyngrok_config: A ``pyngrok`` configuration to use when interacting with the ``ngrok`` binary,
         overriding :func:`~pyngrok.conf.get_default()`.
+    :param deadline: The overall deadline, or its budget in seconds, shared by installing and starting ``ngrok``
+        and the request.
     :return: The request made to the tunnel.
+    :raises: :class:`~pyngrok.exception.PyngrokDeadlineError`: When the ``deadline`` is exhausted.
     """
     if pyngrok_config is None:
         pyngrok_config = conf.get_default()
+    deadline = resolve_deadline(deadline)
 
-    api_url = get_ngrok_process(pyngrok_config).api_url
+    api_url = get_ngrok_process(pyngrok_config, deadline).api_url
 
     return CapturedRequest(api_request(f"{api_url}/api/requests/http/{request_id}", "GET",
-                                       timeout=pyngrok_config.request_timeout))
+                                       timeout=pyngrok_config.request_timeout,
+                                       retry_policy=pyngrok_config.retry_policy,
+                                       deadline=deadline))
 
 
 def replay_request(request_id: str,
                    tunnel_name: Optional[str] = None,
-                   pyngrok_config: Optional[PyngrokConfig] = None, ) -> None:
+                   pyngrok_config: Optional[PyngrokConfig] = None,
+                   deadline: Optional[Union[float, Deadline]] = None) -> None:
     """
     Replay a given request through its original tunnel, or through a different given tunnel.
 
@@ -160,20 +305,43 @@ def replay_request(request_id: str,
     :param tunnel_name: The name of tunnel to replay the request through.
     :param pyngrok_config: A ``pyngrok`` configuration to use when interacting with the ``ngrok`` binary,
         overriding :func:`~pyngrok.conf.get_default()`.
+    :param deadline: The overall deadline, or its budget in seconds, shared by installing and starting ``ngrok``
+        and the request.
+    :raises: :class:`~pyngrok.exception.PyngrokDeadlineError`: When the ``deadline`` is exhausted.
     """
     if pyngrok_config is None:
         pyngrok_config = conf.get_default()
+    deadline = resolve_deadline(deadline)
 
-    api_url = get_ngrok_process(pyngrok_config).api_url
+    api_url = get_ngrok_process(pyngrok_config, deadline).api_url
 
     api_request(f"{api_url}/api/requests/http", "POST",
                 data={"id": request_id, "tunnel_name": tunnel_name},
-                timeout=pyngrok_config.request_timeout)
+                timeout=pyngrok_config.request_timeout,
+                retry_policy=pyngrok_config.retry_policy,
+                deadline=deadline)
 
 
-def delete_requests(pyngrok_config: Optional[PyngrokConfig] = None) -> None:
+def replay_many(request_ids: Iterable[str],
+                tunnel_name: Optional[str] = None,
+                concurrency: int = DEFAULT_REPLAY_CONCURRENCY,
+                rate: Optional[float] = None,
+                pyngrok_config: Optional[PyngrokConfig] = None) -> List[ReplayResult]:
     """
-    Delete request history.
+    Replay the given requests through their original tunnels, or through a different given tunnel, with up to
+    ``concurrency`` replays in flight at once. With ``rate``, replays are started at no more than that many per
+    second, so captured traffic can be replayed against an upstream at a controlled rate.
+
+    A failed replay does not stop the others; its error is instead set on its result.
+
+    .. code-block:: python
+
+        from pyngrok import agent
+
+        request_ids = [r.id for r in agent.get_requests(tunnel_name="webhooks")]
+        results = agent.replay_many(request_ids, concurrency=4, rate=20)
+
+        failed = [r for r in results if not r.ok]
 
     If ``ngrok`` is not installed at :class:`~pyngrok.conf.PyngrokConfig`'s ``ngrok_path``, calling this method
     will first download and install ``ngrok``.
@@ -181,13 +349,257 @@ def delete_requests(pyngrok_config: Optional[PyngrokConfig] = None) -> None:
     If ``ngrok`` is not running, calling this method will first start a process with
     :class:`~pyngrok.conf.PyngrokConfig`.
 
+    :param request_ids: The request IDs.
+    :param tunnel_name: The name of tunnel to replay the requests through.
+    :param concurrency: The max number of replays in flight at once.
+    :param rate: The max number of replays started per second.
     :param pyngrok_config: A ``pyngrok`` configuration to use when interacting with the ``ngrok`` binary,
         overriding :func:`~pyngrok.conf.get_default()`.
+    :return: The outcome of each replay, in the same order as ``request_ids``.
     """
     if pyngrok_config is None:
         pyngrok_config = conf.get_default()
+    if concurrency < 1:
+        raise ValueError("\"concurrency\" must be at least 1.")
+    if rate is not None and rate <= 0:
+        raise ValueError("\"rate\" must be greater than 0.")
 
     api_url = get_ngrok_process(pyngrok_config).api_url
+    request_timeout = pyngrok_config.request_timeout
+    bucket = TokenBucket(rate) if rate is not None else None
+
+    def replay(request_id: str) -> ReplayResult:
+        if bucket is not None:
+            bucket.acquire()
+
+        start = time.perf_counter()
+        try:
+            api_request(f"{api_url}/api/requests/http", "POST",
+                        data={"id": request_id, "tunnel_name": tunnel_name},
+                        timeout=request_timeout,
+                        retry_policy=pyngrok_config.retry_policy)
+        except PyngrokError as e:
+            logger.debug(f"Error replaying request {request_id}: {e}")
+
+            return ReplayResult(request_id, time.perf_counter() - start, e)
+
+        return ReplayResult(request_id, time.perf_counter() - start)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="pyngrok-replay") as executor:
+        return list(executor.map(replay, request_ids))
+
+
+def delete_requests(pyngrok_config: Optional[PyngrokConfig] = None,
+                    deadline: Optional[Union[float, Deadline]] = None) -> None:
+    """
+    Delete request history.
+
+    If ``ngrok`` is not installed at :class:`~pyngrok.conf.PyngrokConfig`'s ``ngrok_path``, calling this method
+    will first download and install ``ngrok``.
+
+    If ``ngrok`` is not running, calling this method will first start a process with
+    :class:`~pyngrok.conf.PyngrokConfig`.
+
+    :param pyngrok_config: A ``pyngrok`` configuration to use when interacting with the ``ngrok`` binary,
+        overriding :func:`~pyngrok.conf.get_default()`.
+    :param deadline: The overall deadline, or its budget in seconds, shared by installing and starting ``ngrok``
+        and the request.
+    :raises: :class:`~pyngrok.exception.PyngrokDeadlineError`: When the ``deadline`` is exhausted.
+    """
+    if pyngrok_config is None:
+        pyngrok_config = conf.get_default()
+    deadline = resolve_deadline(deadline)
+
+    api_url = get_ngrok_process(pyngrok_config, deadline).api_url
 
     api_request(f"{api_url}/api/requests/http", "DELETE",
-                timeout=pyngrok_config.request_timeout)
+                timeout=pyngrok_config.request_timeout,
+                retry_policy=pyngrok_config.retry_policy,
+                deadline=deadline)
+
+
+def iter_requests(tunnel_name: Optional[str] = None,
+                  since: Optional[Union[str, datetime]] = None,
+                  follow: bool = True,
+                  limit: Optional[int] = None,
+                  poll_interval: float = DEFAULT_POLL_INTERVAL,
+                  max_poll_interval: float = DEFAULT_MAX_POLL_INTERVAL,
+                  pyngrok_config: Optional[PyngrokConfig] = None) -> Iterator[CapturedRequest]:
+    """
+    Iterate over requests made to either all tunnels, or the given tunnel name, oldest first. Unlike
+    :func:`~pyngrok.agent.get_requests`, only captures that have not already been yielded are parsed, and once
+    caught up, each poll only fetches a page sized to the recent traffic, rather than the whole history.
+
+    With ``follow``, this generator does not end; it keeps polling ``ngrok`` for new requests, backing off from
+    ``poll_interval`` to ``max_poll_interval`` while no new requests arrive.
+
+    .. code-block:: python
+
+        from pyngrok import agent
+
+        for captured_request in agent.iter_requests(tunnel_name="my-tunnel"):
+            print(captured_request.request["uri"])
+
+    If ``ngrok`` is not installed at :class:`~pyngrok.conf.PyngrokConfig`'s ``ngrok_path``, calling this method
+    will first download and install ``ngrok``.
+
+    If ``ngrok`` is not running, calling this method will first start a process with
+    :class:`~pyngrok.conf.PyngrokConfig`.
+
+    :param tunnel_name: The tunnel name to filter by.
+    :param since: Only yield requests that started after this time, either as a :py:class:`~datetime.datetime`
+        (assumed to be UTC if naive) or an ISO 8601 string.
+    :param follow: Keep polling for new requests, rather than stopping after those already captured.
+    :param limit: The max number of requests to fetch from ``ngrok`` per poll.
+    :param poll_interval: The delay, in seconds, between polls while requests are arriving.
+    :param max_poll_interval: The max delay, in seconds, between polls while no requests are arriving.
+    :param pyngrok_config: A ``pyngrok`` configuration to use when interacting with the ``ngrok`` binary,
+        overriding :func:`~pyngrok.conf.get_default()`.
+    :return: The requests made to the tunnels.
+    """
+    if pyngrok_config is None:
+        pyngrok_config = conf.get_default()
+
+    last_start = _parse_start(since) if isinstance(since, str) else since
+    if last_start is not None and last_start.tzinfo is None:
+        last_start = last_start.replace(tzinfo=timezone.utc)
+    seen_ids: Set[str] = set()
+    seen_order: Deque[str] = deque()
+
+    # Until caught up, fetch the whole history (or as much as the limit allows)
+    page_size = limit
+    interval = poll_interval
+    while True:
+        new_requests = _fetch_new_requests(pyngrok_config, tunnel_name, page_size, limit, last_start, seen_ids)
+
+        for data in reversed(new_requests):
+            start = _parse_start(data.get("start"))
+            if start is not None and (last_start is None or start > last_start):
+                last_start = start
+
+            request_id = data.get("id")
+            if request_id is not None:
+                seen_ids.add(request_id)
+                seen_order.append(request_id)
+                if len(seen_order) > _SEEN_IDS_SIZE:
+                    seen_ids.discard(seen_order.popleft())
+
+            yield CapturedRequest(data)
+
+        if not follow:
+            return
+
+        page_size = max(_MIN_PAGE_SIZE, 2 * len(new_requests))
+        if limit is not None:
+            page_size = min(page_size, limit)
+
+        interval = poll_interval if new_requests else min(interval * 2, max_poll_interval)
+        time.sleep(interval)
+
+
+def _fetch_new_requests(pyngrok_config: PyngrokConfig,
+                        tunnel_name: Optional[str],
+                        page_size: Optional[int],
+                        limit: Optional[int],
+                        last_start: Optional[datetime],
+                        seen_ids: Set[str]) -> List[Dict[str, Any]]:
+    """
+    Fetch the requests that have not been seen yet, newest first. If an entire page is new, there may be more new
+    requests beyond it, so the page is grown until it reaches requests that have already been seen, or ``limit``.
+    """
+    api_url = get_ngrok_process(pyngrok_config).api_url
+
+    while True:
+        params: Dict[str, Any] = {}
+        if tunnel_name:
+            params["tunnel_name"] = tunnel_name
+        if page_size:
+            params["limit"] = page_size
+
+        page = api_request(f"{api_url}/api/requests/http", "GET",
+                           params=params or None,
+                           timeout=pyngrok_config.request_timeout,
+                           retry_policy=pyngrok_config.retry_policy)["requests"]
+
+        new_requests = []
+        caught_up = False
+        for data in page:
+            if data.get("id") in seen_ids or _started_before(_parse_start(data.get("start")), last_start, seen_ids):
+                caught_up = True
+                break
+
+            new_requests.append(data)
+
+        if caught_up or page_size is None or len(page) < page_size or (limit is not None and page_size >= limit):
+            return new_requests
+
+        page_size = page_size * 2 if limit is None else min(page_size * 2, limit)
+
+
+def _started_before(start: Optional[datetime],
+                    last_start: Optional[datetime],
+                    seen_ids: Set[str]) -> bool:
+    if start is None or last_start is None:
+        return False
+
+    # A request that started at the same time as the last one yielded may be new, but one that started exactly
+    # at "since" is not
+    return start < last_start or (start == last_start and not seen_ids)
+
+
+def _decode_raw(message: Any) -> Optional[bytes]:
+    raw = message.get("raw") if isinstance(message, dict) else None
+
+    return base64.b64decode(raw) if raw else None
+
+
+def _body(raw: Optional[bytes]) -> Optional[memoryview]:
+    if raw is None:
+        return None
+
+    head_end = raw.find(b"\r\n\r\n")
+
+    return memoryview(raw)[head_end + 4:] if head_end >= 0 else memoryview(raw)[len(raw):]
+
+
+def _headers(message: Any,
+             raw: Optional[bytes]) -> Dict[str, List[str]]:
+    headers = message.get("headers") if isinstance(message, dict) else None
+    if headers is not None:
+        return dict(headers)
+
+    parsed: Dict[str, List[str]] = {}
+    if raw is None:
+        return parsed
+
+    # Skip the request or status line, then parse the header lines up to the blank line before the body
+    for line in raw.split(b"\r\n\r\n", 1)[0].split(b"\r\n")[1:]:
+        name, sep, value = line.decode("latin-1").partition(":")
+        if sep:
+            parsed.setdefault(name.strip(), []).append(value.strip())
+
+    return parsed
+
+
+def _json(body: Optional[memoryview]) -> Any:
+    return codec.loads(body) if body else None
+
+
+def _parse_start(start: Optional[str]) -> Optional[datetime]:
+    """
+    Parse the RFC 3339 start time of a captured request, which ``ngrok`` reports with up to nanosecond precision.
+    """
+    if not start:
+        return None
+
+    # datetime only supports microseconds, and Python < 3.11 only parses fractions of exactly 3 or 6 digits, or the
+    # "Z" suffix, but ngrok drops trailing zeros, so fractions are padded or truncated to 6 digits
+    normalized = re.sub(r"\.(\d+)", lambda m: f".{(m.group(1) + '000000')[:6]}", start.replace("Z", "+00:00"))
+    try:
+        parsed = datetime.fromisoformat(normalized)
+    except ValueError:
+        logger.debug(f"Unable to parse captured request start time: {start}")
+
+        return None
+
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
@@ -0,0 +1,268 @@
+__copyright__ = "Copyright (c) 2018-2025 Alex Laird"
+__license__ = "MIT"
+
+import importlib
+import logging
+import math
+from array import array
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
+from urllib.parse import urlparse
+
+from pyngrok import agent
+from pyngrok.agent import CapturedRequest
+from pyngrok.exception import PyngrokError
+
+try:
+    _numpy: Any = importlib.import_module("numpy")
+except ImportError:  # pragma: no cover
+    _numpy = None
+
+logger = logging.getLogger(__name__)
+
+#: The default percentiles computed for each group of requests.
+DEFAULT_PERCENTILES = (50.0, 90.0, 95.0, 99.0)
+#: The default width, in seconds, of the windows throughput is counted over.
+DEFAULT_WINDOW = 60.0
+
+K = TypeVar("K")
+
+
+class LatencySummary:
+    """
+    An object containing latency statistics for a group of captured requests. Latencies are in seconds.
+    """
+
+    def __init__(self,
+                 count: int,
+                 mean: float,
+                 min: float,
+                 max: float,
+                 percentiles: Dict[float, float],
+                 status_codes: Dict[int, int]) -> None:
+        #: The number of requests.
+        self.count: int = count
+        #: The mean latency.
+        self.mean: float = mean
+        #: The lowest latency.
+        self.min: float = min
+        #: The highest latency.
+        self.max: float = max
+        #: The latency at each percentile.
+        self.percentiles: Dict[float, float] = percentiles
+        #: The number of requests with each response status code.
+        self.status_codes: Dict[int, int] = status_codes
+
+    def __repr__(self) -> str:
+        return f"<LatencySummary: count={self.count} mean={self.mean:.6f}>"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"LatencySummary: count={self.count} mean={self.mean:.6f}"
+
+
+class LatencyReport:
+    """
+    An object containing latency statistics for captured requests, overall, per tunnel, and per route, along with
+    their throughput over time.
+    """
+
+    def __init__(self,
+                 total: Optional[LatencySummary],
+                 by_tunnel: Dict[str, LatencySummary],
+                 by_route: Dict[Tuple[str, str], LatencySummary],
+                 throughput: List[Tuple[datetime, int]],
+                 window: float) -> None:
+        #: The statistics across all requests, or ``None`` if there were none.
+        self.total: Optional[LatencySummary] = total
+        #: The statistics for each tunnel name.
+        self.by_tunnel: Dict[str, LatencySummary] = by_tunnel
+        #: The statistics for each route, keyed by its method and path.
+        self.by_route: Dict[Tuple[str, str], LatencySummary] = by_route
+        #: The number of requests started in each window, keyed by the window's start, including empty windows.
+        self.throughput: List[Tuple[datetime, int]] = throughput
+        #: The width, in seconds, of the throughput windows.
+        self.window: float = window
+
+    def __repr__(self) -> str:
+        return f"<LatencyReport: count={self.total.count if self.total else 0}>"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"LatencyReport: count={self.total.count if self.total else 0}"
+
+
+def analyze(captured_requests: Iterable[CapturedRequest],
+            window: float = DEFAULT_WINDOW,
+            percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+            use_numpy: Optional[bool] = None) -> LatencyReport:
+    """
+    Summarize the latency of the given captured requests, per tunnel and per route, along with their response
+    status codes and throughput over time. Requests are consumed as they are iterated and only their
+    measurements are kept, so a streaming iterator, like :func:`~pyngrok.agent.iter_requests`, can be analyzed
+    without holding on to every request. Requests without a duration are skipped.
+
+    When `NumPy <https://numpy.org/>`_ is installed, statistics are computed with it, otherwise a pure-Python
+    implementation, which gives the same results, is used.
+
+    .. code-block:: python
+
+        from pyngrok import agent, analytics
+
+        report = analytics.analyze(agent.get_requests())
+
+        for (method, path), summary in report.by_route.items():
+            print(f"{method} {path}: p99 {summary.percentiles[99.0]:.3f}s")
+
+    :param captured_requests: The captured requests.
+    :param window: The width, in seconds, of the windows throughput is counted over.
+    :param percentiles: The percentiles to compute, from 0 to 100.
+    :param use_numpy: Whether to use NumPy. If not set, it is used if it is installed.
+    :return: The report.
+    :raises: :class:`~pyngrok.exception.PyngrokError`: When ``use_numpy`` is set but NumPy is not installed.
+    """
+    if use_numpy is None:
+        use_numpy = _numpy is not None
+    elif use_numpy and _numpy is None:
+        raise PyngrokError("Analyzing with \"use_numpy\" requires the \"numpy\" package to be installed")
+    if window <= 0:
+        raise ValueError("\"window\" must be greater than 0.")
+
+    # Only compact columns of each request's measurements are kept, with tunnels and routes as integer codes
+    tunnel_codes: Dict[str, int] = {}
+    route_codes: Dict[Tuple[str, str], int] = {}
+    tunnels = array("q")
+    routes = array("q")
+    status_codes = array("q")
+    durations = array("d")
+    starts = array("d")
+    for captured_request in captured_requests:
+        if captured_request.duration is None:
+            continue
+
+        request = captured_request.request or {}
+        response = captured_request.response or {}
+        route = (str(request.get("method", "")), urlparse(request.get("uri") or "").path)
+        start = agent._parse_start(captured_request.start)
+
+        tunnels.append(tunnel_codes.setdefault(captured_request.tunnel_name or "", len(tunnel_codes)))
+        routes.append(route_codes.setdefault(route, len(route_codes)))
+        status_codes.append(int(response.get("status_code") or 0))
+        # ngrok reports durations in nanoseconds
+        durations.append(captured_request.duration / 1e9)
+        starts.append(start.timestamp() if start is not None else math.nan)
+
+    if use_numpy:
+        summarize = _summarize_numpy
+        throughput = _throughput_numpy(starts, window)
+    else:
+        summarize = _summarize_python
+        throughput = _throughput_python(starts, window)
+
+    total = summarize(array("q", [0]) * len(durations), [None], durations, status_codes, percentiles)
+
+    return LatencyReport(total.get(None),
+                         summarize(tunnels, list(tunnel_codes), durations, status_codes, percentiles),
+                         summarize(routes, list(route_codes), durations, status_codes, percentiles),
+                         throughput,
+                         window)
+
+
+def _summarize_python(codes: "array[int]",
+                      keys: List[K],
+                      durations: "array[float]",
+                      status_codes: "array[int]",
+                      percentiles: Sequence[float]) -> Dict[K, LatencySummary]:
+    grouped_durations: Dict[int, List[float]] = {}
+    grouped_status_codes: Dict[int, List[int]] = {}
+    for code, duration, status_code in zip(codes, durations, status_codes):
+        grouped_durations.setdefault(code, []).append(duration)
+        grouped_status_codes.setdefault(code, []).append(status_code)
+
+    summaries = {}
+    for code, group in grouped_durations.items():
+        group.sort()
+        summaries[keys[code]] = LatencySummary(len(group),
+                                               math.fsum(group) / len(group),
+                                               group[0],
+                                               group[-1],
+                                               {p: _percentile(group, p) for p in percentiles},
+                                               dict(sorted(Counter(grouped_status_codes[code]).items())))
+
+    return summaries
+
+
+def _summarize_numpy(codes: "array[int]",
+                     keys: List[K],
+                     durations: "array[float]",
+                     status_codes: "array[int]",
+                     percentiles: Sequence[float]) -> Dict[K, LatencySummary]:
+    np = _numpy
+
+    code_values = np.frombuffer(codes, dtype=np.int64)
+    duration_values = np.frombuffer(durations, dtype=np.float64)
+    status_code_values = np.frombuffer(status_codes, dtype=np.int64)
+
+    # Sort by group, then split in to one slice per group, rather than filtering once per group
+    order = np.argsort(code_values, kind="stable")
+    sorted_codes = code_values[order]
+    boundaries = np.flatnonzero(np.diff(sorted_codes)) + 1
+
+    summaries = {}
+    for group_codes, group_durations, group_status_codes in zip(np.split(sorted_codes, boundaries),
+                                                                np.split(duration_values[order], boundaries),
+                                                                np.split(status_code_values[order], boundaries)):
+        if not len(group_durations):
+            continue
+
+        values = np.percentile(group_durations, list(percentiles)) if len(percentiles) else []
+        unique_status_codes, counts = np.unique(group_status_codes, return_counts=True)
+        summaries[keys[int(group_codes[0])]] = LatencySummary(
+            int(len(group_durations)),
+            float(group_durations.mean()),
+            float(group_durations.min()),
+            float(group_durations.max()),
+            {p: float(v) for p, v in zip(percentiles, values)},
+            {int(s): int(c) for s, c in zip(unique_status_codes, counts)})
+
+    return summaries
+
+
+def _throughput_python(starts: "array[float]",
+                       window: float) -> List[Tuple[datetime, int]]:
+    known_starts = [start for start in starts if not math.isnan(start)]
+    if not known_starts:
+        return []
+
+    origin = math.floor(min(known_starts) / window) * window
+    counts = Counter(int((start - origin) // window) for start in known_starts)
+
+    return [(datetime.fromtimestamp(origin + i * window, tz=timezone.utc), counts.get(i, 0))
+            for i in range(max(counts) + 1)]
+
+
+def _throughput_numpy(starts: "array[float]",
+                      window: float) -> List[Tuple[datetime, int]]:
+    np = _numpy
+
+    values = np.frombuffer(starts, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return []
+
+    origin = math.floor(float(values.min()) / window) * window
+    counts = np.bincount(((values - origin) // window).astype(np.int64))
+
+    return [(datetime.fromtimestamp(origin + i * window, tz=timezone.utc), int(count))
+            for i, count in enumerate(counts)]
+
+
+def _percentile(sorted_values: List[float],
+                percentile: float) -> float:
+    """
+    Compute a percentile by linear interpolation between the closest ranks, as NumPy does by default.
+    """
+    position = (len(sorted_values) - 1) * percentile / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
@@ -0,0 +1,171 @@
+__copyright__ = "Copyright (c) 2018-2025 Alex Laird"
+__license__ = "MIT"
+
+import importlib
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from pyngrok.exception import PyngrokError
+
+logger = logging.getLogger(__name__)
+
+#: The order codecs are preferred in when :func:`~pyngrok.codec.set_codec` has not been called.
+PREFERRED_CODECS = ("orjson", "ujson", "json")
+
+Decodable = Union[str, bytes, bytearray, memoryview]
+
+
+class JSONCodec:
+    """
+    An object that encodes and decodes JSON, which ``pyngrok`` uses for all of its JSON, including ``ngrok`` API
+    requests and responses. Decoding is done directly from ``bytes``, so responses don't first need to be decoded
+    to ``str``.
+    """
+
+    def __init__(self,
+                 name: str,
+                 loads: Callable[[Decodable], Any],
+                 dumps: Callable[[Any], bytes]) -> None:
+        #: The name of the codec.
+        self.name: str = name
+
+        self._loads = loads
+        self._dumps = dumps
+
+    def loads(self,
+              data: Decodable) -> Any:
+        """
+        Decode the given JSON.
+
+        :param data: The JSON to decode, which is either ``str`` or UTF-8 encoded ``bytes``.
+        :return: The decoded object.
+        :raises: :py:class:`ValueError`: When the data is not valid JSON.
+        """
+        return self._loads(data)
+
+    def dumps(self,
+              obj: Any) -> bytes:
+        """
+        Encode the given object as JSON.
+
+        :param obj: The object to encode.
+        :return: The UTF-8 encoded JSON.
+        """
+        return self._dumps(obj)
+
+    def __repr__(self) -> str:
+        return f"<JSONCodec: \"{self.name}\">"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"JSONCodec: \"{self.name}\""
+
+
+def _stdlib_loads(data: Decodable) -> Any:
+    # The stdlib can decode bytes, detecting their encoding, but not views over them
+    return json.loads(data.tobytes() if isinstance(data, memoryview) else data)
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj).encode("utf-8")
+
+
+def _build_codec(name: str) -> Optional[JSONCodec]:
+    if name == "json":
+        return JSONCodec("json", _stdlib_loads, _stdlib_dumps)
+
+    try:
+        module: Any = importlib.import_module(name)
+    except ImportError:
+        return None
+
+    if name == "orjson":
+        return JSONCodec("orjson", module.loads, module.dumps)
+    elif name == "ujson":
+        def ujson_loads(data: Decodable) -> Any:
+            return module.loads(data.tobytes() if isinstance(data, memoryview) else data)
+
+        def ujson_dumps(obj: Any) -> bytes:
+            return module.dumps(obj, ensure_ascii=False).encode("utf-8")  # type: ignore[no-any-return]
+
+        return JSONCodec("ujson", ujson_loads, ujson_dumps)
+
+    return None
+
+
+def available_codecs() -> List[str]:
+    """
+    Get the names of the codecs that are installed, in order of preference.
+
+    :return: The names of the codecs.
+    """
+    return [name for name in PREFERRED_CODECS if _get_builtin_codec(name) is not None]
+
+
+def get_codec() -> JSONCodec:
+    """
+    Get the codec ``pyngrok`` currently uses. Unless :func:`~pyngrok.codec.set_codec` has been called, this is the
+    first of `orjson <https://github.com/ijl/orjson>`_, `ujson <https://github.com/ultrajson/ultrajson>`_, or the
+    stdlib's ``json`` that is installed.
+
+    :return: The codec.
+    """
+    global _codec
+
+    if _codec is None:
+        _codec = next(codec for codec in map(_get_builtin_codec, PREFERRED_CODECS) if codec is not None)
+
+        logger.debug(f"Using JSON codec: {_codec.name}")
+
+    return _codec
+
+
+def set_codec(codec: Optional[Union[str, JSONCodec]]) -> None:
+    """
+    Set the codec ``pyngrok`` uses, either by name, from :data:`~pyngrok.codec.PREFERRED_CODECS`, or as a custom
+    :class:`~pyngrok.codec.JSONCodec`. Pass ``None`` to go back to the preferred codec that is installed.
+
+    :param codec: The codec, or its name.
+    :raises: :class:`~pyngrok.exception.PyngrokError`: When the named codec is not installed.
+    """
+    global _codec
+
+    if isinstance(codec, str):
+        named_codec = _get_builtin_codec(codec)
+        if named_codec is None:
+            raise PyngrokError(f"The JSON codec \"{codec}\" requires the \"{codec}\" package to be installed")
+        codec = named_codec
+
+    _codec = codec
+
+
+def loads(data: Decodable) -> Any:
+    """
+    Decode the given JSON with the current codec.
+
+    :param data: The JSON to decode, which is either ``str`` or UTF-8 encoded ``bytes``.
+    :return: The decoded object.
+    :raises: :py:class:`ValueError`: When the data is not valid JSON.
+    """
+    return get_codec().loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Encode the given object as JSON with the current codec.
+
+    :param obj: The object to encode.
+    :return: The UTF-8 encoded JSON.
+    """
+    return get_codec().dumps(obj)
+
+
+def _get_builtin_codec(name: str) -> Optional[JSONCodec]:
+    if name not in _builtin_codecs:
+        _builtin_codecs[name] = _build_codec(name)
+
+    return _builtin_codecs[name]
+
+
+_builtin_codecs: Dict[str, Optional[JSONCodec]] = {}
+_codec: Optional[JSONCodec] = None
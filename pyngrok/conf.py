@@ -2,11 +2,16 @@ __copyright__ = "Copyright (c) 2018-2025 Alex Laird"
 __license__ = "MIT"
 
 import os
-from typing import Callable, Optional
+import random
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, FrozenSet, Iterable, Optional
 
 from pyngrok.installer import get_ngrok_bin, get_default_ngrok_dir
 from pyngrok.log import NgrokLog
 
+if TYPE_CHECKING:
+    from pyngrok.process import NgrokProcessEvent
+
 DEFAULT_CONFIG_PATH: Optional[str] = None
 
 DEFAULT_NGROK_DIR = get_default_ngrok_dir()
@@ -14,6 +19,77 @@ DEFAULT_NGROK_CONFIG_PATH = os.path.join(DEFAULT_NGROK_DIR, "ngrok.yml")
 DEFAULT_NGROK_PATH = os.path.join(DEFAULT_NGROK_DIR, get_ngrok_bin())
 
 
+class RetryPolicy:
+    """
+    An object containing the policy for retrying failed requests to ``ngrok``'s API, so brief hiccups, like the
+    ``ngrok`` agent restarting, don't fail every request in flight. Set it as
+    :class:`~pyngrok.conf.PyngrokConfig`'s ``retry_policy``.
+
+    A request is retried when its connection could not be established, since it was never sent. Otherwise, only
+    requests with a ``retry_methods`` method, which are safe to send more than once, are retried, either after a
+    timeout or dropped connection, or when ``ngrok`` responds with one of the ``retry_status_codes``. So, for
+    instance, a ``POST`` that may have been applied is never retried.
+
+    .. code-block:: python
+
+        from pyngrok import conf, ngrok
+
+        retry_policy = conf.RetryPolicy(max_attempts=5, total_timeout=30)
+        conf.get_default().retry_policy = retry_policy
+
+        ngrok.get_tunnels()
+
+        print(retry_policy.retry_counts)
+    """
+
+    def __init__(self,
+                 max_attempts: int = 3,
+                 backoff: float = 0.1,
+                 max_backoff: float = 2.0,
+                 total_timeout: float = 10.0,
+                 retry_methods: Iterable[str] = ("GET", "HEAD", "OPTIONS", "DELETE"),
+                 retry_status_codes: Iterable[int] = (502, 503, 504)) -> None:
+        #: The max number of attempts made for a request, including the first.
+        self.max_attempts: int = max_attempts
+        #: The delay, in seconds, before the first retry. The delay doubles for each retry after that, and a random
+        #: jitter of up to half the delay is subtracted from it, so clients retrying at once are spread out.
+        self.backoff: float = backoff
+        #: The max delay, in seconds, between retries.
+        self.max_backoff: float = max_backoff
+        #: The max time, in seconds, spent on a request, across all of its attempts and the delays between them.
+        self.total_timeout: float = total_timeout
+        #: The HTTP methods that are safe to retry after a request may have reached ``ngrok``.
+        self.retry_methods: FrozenSet[str] = frozenset(method.upper() for method in retry_methods)
+        #: The response status codes that requests with one of ``retry_methods`` are retried on.
+        self.retry_status_codes: FrozenSet[int] = frozenset(retry_status_codes)
+        #: The number of retries made, keyed by the method and route of the request, like ``GET /api/tunnels``.
+        self.retry_counts: Dict[str, int] = {}
+
+        self._lock = threading.Lock()
+
+    def get_delay(self,
+                  retry: int) -> float:
+        """
+        Get the delay before the given retry.
+
+        :param retry: The retry, starting at ``1``.
+        :return: The delay, in seconds.
+        """
+        delay = min(self.max_backoff, self.backoff * 2.0 ** (retry - 1))
+
+        return delay - random.uniform(0, delay / 2)
+
+    def record_retry(self,
+                     endpoint: str) -> None:
+        """
+        Count a retry of a request to the given endpoint.
+
+        :param endpoint: The method and route of the request.
+        """
+        with self._lock:
+            self.retry_counts[endpoint] = self.retry_counts.get(endpoint, 0) + 1
+
+
 class PyngrokConfig:
     """
     An object containing ``pyngrok``'s configuration for interacting with the ``ngrok`` binary. All values are
@@ -52,7 +128,16 @@ class PyngrokConfig:
                  start_new_session: bool = False,
                  ngrok_version: str = "3",
                  api_key: Optional[str] = None,
-                 config_version: str = "2") -> None:
+                 config_version: str = "2",
+                 supervise: bool = False,
+                 max_restart_attempts: int = 5,
+                 restart_backoff: float = 0.5,
+                 process_event_callback: Optional[Callable[["NgrokProcessEvent"], None]] = None,
+                 attach: bool = False,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 persist: bool = False,
+                 health_check_interval: Optional[float] = None,
+                 max_health_check_failures: Optional[int] = None) -> None:
         #: The path to the ``ngrok`` binary, defaults to being placed in the same directory as
         #: `ngrok's configs <https://ngrok.com/docs/agent/config/v2>`_.
         self.ngrok_path: str = DEFAULT_NGROK_PATH if ngrok_path is None else ngrok_path
@@ -83,6 +168,35 @@ class PyngrokConfig:
         self.api_key: Optional[str] = api_key or os.environ.get("NGROK_API_KEY")
         #: The ``ngrok`` config version.
         self.config_version = config_version
+        #: Whether ``ngrok`` should be restarted if it exits unexpectedly (for instance, if it crashes or is killed
+        #: externally), re-creating the tunnels that were opened with :func:`~pyngrok.ngrok.connect`.
+        #: ``monitor_thread`` must be set to ``True`` for exits to be detected.
+        self.supervise: bool = supervise
+        #: The max number of consecutive attempts a supervised ``ngrok`` process will make to restart before giving up.
+        self.max_restart_attempts: int = max_restart_attempts
+        #: The delay, in seconds, before the second restart attempt of a supervised ``ngrok`` process. The delay
+        #: doubles for each attempt after that. The first attempt is made immediately.
+        self.restart_backoff: float = restart_backoff
+        #: A callback that will be invoked with a :class:`~pyngrok.process.NgrokProcessEvent` each time a supervised
+        #: ``ngrok`` process exits, restarts, or fails to restart.
+        self.process_event_callback: Optional[Callable[["NgrokProcessEvent"], None]] = process_event_callback
+        #: Whether to attach to a ``ngrok`` process already started for the same ``config_path`` by another Python
+        #: process (for instance, another worker of a pre-fork server), rather than starting a new one. The process
+        #: is discovered by a state file written next to the config, or by the config's ``web_addr``. (POSIX only).
+        self.attach: bool = attach
+        #: The policy for retrying failed requests to ``ngrok``'s API. If not set, requests are not retried.
+        self.retry_policy: Optional[RetryPolicy] = retry_policy
+        #: Whether to leave the ``ngrok`` process and its tunnels running when this Python process exits, so a dev
+        #: server restarted by its reloader re-attaches to them, rather than starting ``ngrok`` over and getting new
+        #: public URLs. This implies ``attach``, and :func:`~pyngrok.ngrok.connect` returns an open tunnel with the
+        #: same definition, as with its ``reuse`` argument. (POSIX only).
+        self.persist: bool = persist
+        #: How often, in seconds, a background thread probes the ``ngrok`` process's API and caches the result in
+        #: its :attr:`~pyngrok.process.NgrokProcess.health`. If not set, the API is not probed in the background.
+        self.health_check_interval: Optional[float] = health_check_interval
+        #: The number of consecutive failed health checks after which the ``ngrok`` process is considered hung,
+        #: and is killed and restarted. If not set, failed health checks are only recorded.
+        self.max_health_check_failures: Optional[int] = max_health_check_failures
 
 
 _default_pyngrok_config: PyngrokConfig = PyngrokConfig()
@@ -0,0 +1,449 @@
+__copyright__ = "Copyright (c) 2018-2025 Alex Laird"
+__license__ = "MIT"
+
+import argparse
+import copy
+import logging
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from types import FrameType
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from pyngrok import codec, conf, ngrok, process
+from pyngrok.conf import PyngrokConfig
+from pyngrok.exception import PyngrokError, PyngrokNgrokHTTPError
+
+logger = logging.getLogger(__name__)
+
+#: The default timeout, in seconds, for a :class:`~pyngrok.daemon.DaemonClient`'s requests.
+DEFAULT_CLIENT_TIMEOUT = 30.0
+
+
+def get_socket_path(pyngrok_config: Optional[PyngrokConfig] = None) -> str:
+    """
+    Get the default path of the daemon's socket for the given config, which is next to its ``config_path``.
+
+    :param pyngrok_config: A ``pyngrok`` configuration, overriding :func:`~pyngrok.conf.get_default()`.
+    :return: The socket path.
+    """
+    if pyngrok_config is None:
+        pyngrok_config = conf.get_default()
+
+    return f"{conf.get_config_path(pyngrok_config)}.pyngrok-daemon.sock"
+
+
+class PyngrokDaemon:
+    """
+    A long-running server that keeps one supervised ``ngrok`` process, and the tunnels opened on it, resident, and
+    exposes them to other processes, including non-Python ones, over a Unix-domain socket. Each operation is then a
+    single local round trip, rather than a new Python interpreter, install check, and often a new ``ngrok``
+    process.
+
+    The protocol is newline-delimited JSON. Each request is an object with an ``op`` and its params, and each
+    response is an object with ``ok`` and either a ``result`` or an ``error``. A connection may send any number of
+    requests, which are answered in order.
+
+    .. code-block:: sh
+
+        $ echo '{"op": "connect", "addr": "8000"}' | nc -U ~/.config/ngrok/ngrok.yml.pyngrok-daemon.sock
+        {"ok": true, "result": {"name": "...", "public_url": "https://...", ...}}
+
+    The supported ops are ``connect`` (with ``addr``, ``proto``, and ``name``, and the rest of
+    :func:`~pyngrok.ngrok.connect`'s ``kwargs`` in an ``options`` object), ``disconnect``
+    (with a ``public_url``), ``list``, ``metrics``, ``ping``, and ``stop``. Tunnels are returned as the data
+    ``ngrok``'s API returned for them.
+    """
+
+    def __init__(self,
+                 pyngrok_config: Optional[PyngrokConfig] = None,
+                 socket_path: Optional[str] = None) -> None:
+        if pyngrok_config is None:
+            pyngrok_config = conf.get_default()
+
+        #: The ``pyngrok`` configuration for the daemon's ``ngrok`` process, which is always supervised.
+        self.pyngrok_config: PyngrokConfig = copy.copy(pyngrok_config)
+        self.pyngrok_config.supervise = True
+        #: The path of the daemon's socket.
+        self.socket_path: str = socket_path or get_socket_path(pyngrok_config)
+        #: The number of requests the daemon has handled.
+        self.request_count: int = 0
+
+        self._started_at: Optional[float] = None
+        self._server: Optional[socketserver.BaseServer] = None
+        self._lock = threading.Lock()
+        self._ops: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "connect": self._connect,
+            "disconnect": self._disconnect,
+            "list": self._list,
+            "metrics": self._metrics,
+            "ping": lambda params: "pong",
+            "stop": self._stop,
+        }
+
+    def start(self) -> None:
+        """
+        Start ``ngrok``, if it isn't already running, and bind the daemon's socket, without yet serving requests.
+
+        :raises: :class:`~pyngrok.exception.PyngrokError`: When Unix-domain sockets are not supported, or another
+            daemon is already serving on the socket.
+        """
+        if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+            raise PyngrokError("The daemon requires Unix-domain sockets")
+
+        if os.path.exists(self.socket_path):
+            if _is_serving(self.socket_path):
+                raise PyngrokError(f"A daemon is already serving on {self.socket_path}")
+
+            logger.debug(f"Removing stale daemon socket: {self.socket_path}")
+
+            os.remove(self.socket_path)
+
+        ngrok.get_ngrok_process(self.pyngrok_config)
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                for line in self.rfile:
+                    if line.strip():
+                        self.wfile.write(codec.dumps(daemon.handle(line)) + b"\n")
+                        self.wfile.flush()
+
+        server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        server.daemon_threads = True
+        os.chmod(self.socket_path, int("600", 8))
+
+        self._server = server
+        self._started_at = time.monotonic()
+
+        logger.info(f"pyngrok daemon listening on {self.socket_path}")
+
+    def serve_forever(self) -> None:
+        """
+        Start the daemon, if it hasn't been, and serve requests until :func:`~pyngrok.daemon.PyngrokDaemon.shutdown`
+        is called or a ``stop`` request is received. ``ngrok`` is then killed and the socket removed.
+        """
+        if self._server is None:
+            self.start()
+
+        server = self._server
+        if server is None:  # pragma: no cover
+            return
+
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            self._server = None
+
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+            ngrok.kill(self.pyngrok_config)
+
+            logger.info("pyngrok daemon stopped")
+
+    def shutdown(self) -> None:
+        """
+        Stop serving requests. This blocks until :func:`~pyngrok.daemon.PyngrokDaemon.serve_forever` stops, so it
+        must be called from another thread.
+        """
+        server = self._server
+        if server is not None:
+            server.shutdown()
+
+    def handle(self,
+               request: Union[str, bytes]) -> Dict[str, Any]:
+        """
+        Handle a single request.
+
+        :param request: The request, as JSON.
+        :return: The response.
+        """
+        with self._lock:
+            self.request_count += 1
+
+        try:
+            params = codec.loads(request)
+            if not isinstance(params, dict):
+                raise ValueError("Request must be a JSON object")
+            op = params.pop("op", None)
+            if op not in self._ops:
+                raise ValueError(f"Unsupported op: {op}")
+
+            return {"ok": True, "result": self._ops[op](params)}
+        except (PyngrokError, ValueError, TypeError) as e:
+            logger.debug(f"Error handling daemon request: {e}")
+
+            return self._error_response(e)
+        except Exception as e:
+            # Anything else is a bug, but the client should still get a response, rather than a dropped connection
+            logger.exception(f"Unexpected error handling daemon request: {e}")
+
+            return self._error_response(e)
+
+    @staticmethod
+    def _error_response(error: Exception) -> Dict[str, Any]:
+        response: Dict[str, Any] = {"ok": False, "error": str(error), "error_type": type(error).__name__}
+        if isinstance(error, PyngrokNgrokHTTPError):
+            response["status_code"] = error.status_code
+
+        return response
+
+    def _connect(self,
+                 params: Dict[str, Any]) -> Dict[str, Any]:
+        options = params.pop("options", None) or {}
+        if not isinstance(options, dict):
+            raise ValueError("\"options\" must be a JSON object")
+
+        tunnel = ngrok.connect(pyngrok_config=self.pyngrok_config, **options, **params)
+
+        return tunnel.data
+
+    def _disconnect(self,
+                    params: Dict[str, Any]) -> None:
+        if not params.get("public_url"):
+            raise ValueError("\"public_url\" is required")
+
+        ngrok.disconnect(str(params["public_url"]), self.pyngrok_config)
+
+    def _list(self,
+              params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [tunnel.data for tunnel in ngrok.get_tunnels(self.pyngrok_config)]
+
+    def _metrics(self,
+                 params: Dict[str, Any]) -> Dict[str, Any]:
+        tunnels = ngrok.get_tunnels(self.pyngrok_config)
+        retry_policy = self.pyngrok_config.retry_policy
+
+        return {
+            "uptime": time.monotonic() - self._started_at if self._started_at is not None else 0.0,
+            "requests": self.request_count,
+            "process_starts": process._start_counts.get(self.pyngrok_config.ngrok_path, 0),
+            "api_retries": dict(retry_policy.retry_counts) if retry_policy is not None else {},
+            "tunnels": {str(tunnel.public_url): tunnel.metrics for tunnel in tunnels},
+        }
+
+    def _stop(self,
+              params: Dict[str, Any]) -> None:
+        # Shut down from another thread, since shutting down waits for this request's thread to finish
+        threading.Thread(target=self.shutdown, daemon=True).start()
+
+
+class DaemonClient:
+    """
+    A client for a :class:`~pyngrok.daemon.PyngrokDaemon`. Each call is one round trip over the daemon's socket.
+
+    .. code-block:: python
+
+        from pyngrok.daemon import DaemonClient
+
+        client = DaemonClient()
+        tunnel = client.connect("8000")
+        print(tunnel["public_url"])
+    """
+
+    def __init__(self,
+                 socket_path: Optional[str] = None,
+                 timeout: float = DEFAULT_CLIENT_TIMEOUT) -> None:
+        #: The path of the daemon's socket.
+        self.socket_path: str = socket_path or get_socket_path()
+        #: The timeout, in seconds, for each request.
+        self.timeout: float = timeout
+
+    def request(self,
+                op: str,
+                **params: Any) -> Any:
+        """
+        Send a request to the daemon.
+
+        :param op: The op.
+        :param params: The op's params.
+        :return: The result.
+        :raises: :class:`~pyngrok.exception.PyngrokError`: When the daemon can't be reached, or the request
+            failed.
+        """
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.timeout)
+                sock.connect(self.socket_path)
+                sock.sendall(codec.dumps(dict(params, op=op)) + b"\n")
+
+                with sock.makefile("rb") as response_file:
+                    line = response_file.readline()
+        except OSError as e:
+            raise PyngrokError(f"Unable to reach the pyngrok daemon at {self.socket_path}: {e}")
+
+        if not line:
+            raise PyngrokError(f"The pyngrok daemon at {self.socket_path} closed the connection")
+
+        try:
+            response = codec.loads(line)
+        except ValueError as e:
+            raise PyngrokError(f"The pyngrok daemon at {self.socket_path} sent an invalid response: {e}")
+        if not isinstance(response, dict):
+            raise PyngrokError(f"The pyngrok daemon at {self.socket_path} sent an invalid response: {line!r}")
+
+        if not response.get("ok"):
+            raise PyngrokError(response.get("error"))
+
+        return response.get("result")
+
+    def connect(self,
+                addr: Optional[str] = None,
+                proto: Optional[Union[str, int]] = None,
+                name: Optional[str] = None,
+                **options: Any) -> Dict[str, Any]:
+        """
+        Open a tunnel on the daemon's ``ngrok`` process, with the same arguments as :func:`~pyngrok.ngrok.connect`.
+        The ``kwargs`` are sent as the request's ``options``, so ``options`` itself is reserved by the protocol, and
+        can't be passed as one of them.
+
+        :return: The tunnel's data.
+        :raises: :py:class:`ValueError`: When ``options`` is passed as a ``kwarg``.
+        """
+        if "options" in options:
+            raise ValueError("\"options\" is reserved by the daemon's protocol, pass its keys as kwargs instead.")
+
+        params = {k: v for k, v in {"addr": addr, "proto": proto, "name": name}.items() if v is not None}
+        tunnel: Dict[str, Any] = self.request("connect", options=options, **params)
+
+        return tunnel
+
+    def disconnect(self,
+                   public_url: str) -> None:
+        """
+        Close the tunnel with the given public URL, if open.
+
+        :param public_url: The public URL of the tunnel.
+        """
+        self.request("disconnect", public_url=public_url)
+
+    def get_tunnels(self) -> List[Dict[str, Any]]:
+        """
+        Get the tunnels open on the daemon's ``ngrok`` process.
+
+        :return: The tunnels' data.
+        """
+        tunnels: List[Dict[str, Any]] = self.request("list")
+
+        return tunnels
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get the daemon's metrics: its ``uptime``, the number of ``requests`` it has handled, the number of times its
+        ``ngrok`` process has started, the count of ``api_retries`` by endpoint, and each tunnel's metrics, by
+        public URL.
+
+        :return: The metrics.
+        """
+        metrics: Dict[str, Any] = self.request("metrics")
+
+        return metrics
+
+    def stop(self) -> None:
+        """
+        Stop the daemon, which also kills its ``ngrok`` process.
+        """
+        self.request("stop")
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    """
+    Entry point for ``pyngrok daemon``. ``pyngrok daemon serve`` runs the daemon in the foreground, and the other
+    subcommands are its client, printing each result as JSON.
+
+    :param args: The command line arguments, defaults to ``sys.argv[1:]``.
+    :return: The exit code.
+    """
+    parser = argparse.ArgumentParser(prog="pyngrok daemon",
+                                     description="Keep ngrok and its tunnels resident, controlled over a socket.")
+    parser.add_argument("--socket", help="The daemon's socket, defaults to next to the ngrok config file.")
+    parser.add_argument("--config", help="The ngrok config file, defaults to ngrok's default.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="Run the daemon in the foreground.")
+    serve_parser.add_argument("--ngrok-path", help="The ngrok binary, defaults to pyngrok's default.")
+    connect_parser = subparsers.add_parser("connect", help="Open a tunnel.")
+    connect_parser.add_argument("addr", nargs="?")
+    connect_parser.add_argument("--proto")
+    connect_parser.add_argument("--name")
+    connect_parser.add_argument("--options", type=codec.loads, default={},
+                                help="Additional tunnel config, as a JSON object.")
+    disconnect_parser = subparsers.add_parser("disconnect", help="Close a tunnel.")
+    disconnect_parser.add_argument("public_url")
+    subparsers.add_parser("list", help="List the open tunnels.")
+    subparsers.add_parser("metrics", help="Get the daemon's metrics.")
+    subparsers.add_parser("stop", help="Stop the daemon.")
+
+    parsed = parser.parse_args(args)
+
+    pyngrok_config = copy.copy(conf.get_default())
+    if parsed.config:
+        pyngrok_config.config_path = parsed.config
+    socket_path = parsed.socket or get_socket_path(pyngrok_config)
+
+    if parsed.command == "serve":
+        if parsed.ngrok_path:
+            pyngrok_config.ngrok_path = parsed.ngrok_path
+
+        return _serve(PyngrokDaemon(pyngrok_config, socket_path))
+
+    client = DaemonClient(socket_path)
+    result: Any = None
+    try:
+        if parsed.command == "connect":
+            result = client.connect(parsed.addr, parsed.proto, parsed.name, **parsed.options)
+        elif parsed.command == "disconnect":
+            client.disconnect(parsed.public_url)
+        elif parsed.command == "list":
+            result = client.get_tunnels()
+        elif parsed.command == "metrics":
+            result = client.get_metrics()
+        else:
+            client.stop()
+    except (PyngrokError, ValueError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+
+        return 1
+
+    if result is not None:
+        print(codec.dumps(result).decode("utf-8"))
+
+    return 0
+
+
+def _serve(daemon: PyngrokDaemon) -> int:
+    try:
+        daemon.start()
+    except PyngrokError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+
+        return 1
+
+    def handle_signal(signum: int, frame: Optional[FrameType]) -> None:
+        threading.Thread(target=daemon.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    print(f"pyngrok daemon listening on {daemon.socket_path}", flush=True)
+
+    daemon.serve_forever()
+
+    return 0
+
+
+def _is_serving(socket_path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            return False
+
+    return True
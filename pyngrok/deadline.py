@@ -0,0 +1,103 @@
+__copyright__ = "Copyright (c) 2018-2025 Alex Laird"
+__license__ = "MIT"
+
+import time
+from typing import Optional, Union
+
+from pyngrok.exception import PyngrokDeadlineError
+
+#: The smallest timeout, in seconds, given to a blocking call, since a timeout of ``0`` would make it non-blocking.
+MIN_TIMEOUT = 0.001
+
+
+class Deadline:
+    """
+    An overall time budget, in seconds, shared by every stage of a call, for instance installing ``ngrok``,
+    starting its process, and making API requests. Each stage's own timeout is capped to what is left of the
+    budget, and once it is exhausted, the next stage raises :class:`~pyngrok.exception.PyngrokDeadlineError`
+    rather than starting.
+
+    Methods that accept a ``deadline`` take either a number of seconds, which starts a new budget for that call,
+    or a :class:`~pyngrok.deadline.Deadline`, so one budget can be shared across several calls.
+
+    .. code-block:: python
+
+        from pyngrok import ngrok
+        from pyngrok.deadline import Deadline
+
+        deadline = Deadline(5)
+
+        tunnel = ngrok.connect(8000, deadline=deadline)
+        tunnels = ngrok.get_tunnels(deadline=deadline)
+    """
+
+    def __init__(self,
+                 timeout: float) -> None:
+        if timeout < 0:
+            raise ValueError("\"timeout\" must be greater than or equal to 0.")
+
+        #: The total budget, in seconds.
+        self.timeout: float = timeout
+        #: When the budget is exhausted, in :py:func:`time.monotonic` seconds.
+        self.expires_at: float = time.monotonic() + timeout
+
+    @property
+    def expired(self) -> bool:
+        """
+        Whether the budget has been exhausted.
+        """
+        return time.monotonic() >= self.expires_at
+
+    def remaining(self) -> float:
+        """
+        Get what is left of the budget.
+
+        :return: The remaining seconds, or ``0`` if the budget has been exhausted.
+        """
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    def check(self,
+              stage: str) -> None:
+        """
+        Check that the budget has not been exhausted before starting the given stage.
+
+        :param stage: A description of the stage that is about to start.
+        :raises: :class:`~pyngrok.exception.PyngrokDeadlineError`: When the budget has been exhausted.
+        """
+        if self.expired:
+            raise PyngrokDeadlineError(f"The deadline of {self.timeout} seconds was exceeded before {stage}.", stage)
+
+    def cap(self,
+            timeout: float,
+            stage: str) -> float:
+        """
+        Cap the given stage's timeout to what is left of the budget.
+
+        :param timeout: The stage's own timeout, in seconds.
+        :param stage: A description of the stage that is about to start.
+        :return: The capped timeout.
+        :raises: :class:`~pyngrok.exception.PyngrokDeadlineError`: When the budget has been exhausted.
+        """
+        self.check(stage)
+
+        return max(min(timeout, self.remaining()), MIN_TIMEOUT)
+
+    def __repr__(self) -> str:
+        return f"<Deadline: timeout={self.timeout} remaining={self.remaining():.3f}>"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"Deadline: timeout={self.timeout} remaining={self.remaining():.3f}"
+
+
+def resolve_deadline(deadline: Optional[Union[float, Deadline]]) -> Optional[Deadline]:
+    """
+    Get a :class:`~pyngrok.deadline.Deadline` for the given value, starting a new budget if it is a number of
+    seconds.
+
+    :param deadline: The deadline, or its budget in seconds.
+    :return: The deadline, or ``None`` if none was given.
+    """
+    if deadline is None or isinstance(deadline, Deadline):
+        return deadline
+
+    return Deadline(deadline)
@@ -89,3 +89,17 @@ class PyngrokNgrokURLError(PyngrokNgrokError):
 
         #: The reason for the URL error.
         self.reason: Any = reason
+
+
+class PyngrokDeadlineError(PyngrokError):
+    """
+    Raised when the overall deadline given to a ``pyngrok`` method is exhausted before it could finish.
+    """
+
+    def __init__(self,
+                 error: Union[str, BaseException],
+                 stage: str) -> None:
+        super(PyngrokDeadlineError, self).__init__(error)
+
+        #: The stage that was about to start, or was in progress, when the deadline was exhausted.
+        self.stage: str = stage
@@ -0,0 +1,450 @@
+__copyright__ = "Copyright (c) 2018-2025 Alex Laird"
+__license__ = "MIT"
+
+import logging
+import math
+import os
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from pyngrok import conf, instrumentation, ngrok, process
+from pyngrok.agent import NgrokAgent
+from pyngrok.conf import PyngrokConfig
+from pyngrok.ngrok import NgrokTunnel
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+DEFAULT_REFRESH_INTERVAL = 15.0
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# ngrok reports connection and request duration percentiles in nanoseconds
+_NGROK_PERCENTILES = (("p50", "0.5"), ("p90", "0.9"), ("p95", "0.95"), ("p99", "0.99"))
+_NGROK_RATES = ("rate1", "rate5", "rate15")
+
+_Labels = Tuple[Tuple[str, str], ...]
+_Sample = Tuple[str, _Labels, float]
+
+
+class LatencyHistogram:
+    """
+    A thread-safe histogram of request latencies, bucketed by ``method``, ``route``, and ``code`` labels.
+    """
+
+    def __init__(self,
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        #: The upper bounds of the histogram's buckets, in seconds.
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+
+        self._lock = threading.Lock()
+        self._series: Dict[_Labels, List[float]] = {}
+
+    def observe(self,
+                method: str,
+                url: str,
+                status_code: Optional[int],
+                duration: float) -> None:
+        """
+        Record a completed request.
+
+        :param method: The HTTP method of the request.
+        :param url: The request URL.
+        :param status_code: The response status code, or ``None`` if no response was received.
+        :param duration: The duration of the request, in seconds.
+        """
+        labels = (("method", method),
+                  ("route", ngrok._api_route(url)),
+                  ("code", str(status_code) if status_code is not None else "none"))
+
+        with self._lock:
+            # Each series is a list of per-bucket counts, followed by the total count and sum
+            series = self._series.get(labels)
+            if series is None:
+                series = [0.0] * (len(self.buckets) + 2)
+                self._series[labels] = series
+
+            for i, bound in enumerate(self.buckets):
+                if duration <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += duration
+
+    def samples(self) -> List[_Sample]:
+        """
+        Get the histogram's samples as ``(suffix, labels, value)`` tuples.
+
+        :return: The histogram samples.
+        """
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+
+        samples: List[_Sample] = []
+        for labels, series in sorted(snapshot.items()):
+            for bound, count in zip(self.buckets, series):
+                samples.append(("_bucket", labels + (("le", repr(float(bound))),), count))
+            samples.append(("_bucket", labels + (("le", "+Inf"),), series[-2]))
+            samples.append(("_count", labels, series[-2]))
+            samples.append(("_sum", labels, series[-1]))
+
+        return samples
+
+    def clear(self) -> None:
+        """
+        Reset all recorded observations.
+        """
+        with self._lock:
+            self._series.clear()
+
+
+class _ApiRequestLatencyHook(instrumentation.InstrumentationHook):
+    """
+    Records the latency of ``api_request`` spans in a :class:`~pyngrok.exporter.LatencyHistogram`.
+    """
+
+    def __init__(self,
+                 histogram: LatencyHistogram) -> None:
+        self.histogram = histogram
+
+    def on_end(self,
+               span: instrumentation.Span) -> None:
+        if span.name == "api_request":
+            self.histogram.observe(span.attributes["method"], span.attributes["url"],
+                                   span.attributes.get("status_code"), span.duration)  # type: ignore
+
+
+#: The histogram of :func:`~pyngrok.ngrok.api_request` latencies, populated once
+#: :func:`~pyngrok.exporter.enable_api_request_metrics` has been called.
+api_request_latency = LatencyHistogram()
+
+_api_request_latency_hook = _ApiRequestLatencyHook(api_request_latency)
+
+
+def _reinitialize_after_fork() -> None:
+    # Latencies observed by the parent are its own to report, and its lock may have been held when it forked
+    api_request_latency._lock = threading.Lock()
+    api_request_latency.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinitialize_after_fork)
+
+
+def enable_api_request_metrics() -> None:
+    """
+    Start recording the latency of every :func:`~pyngrok.ngrok.api_request` call in
+    :data:`~pyngrok.exporter.api_request_latency`, by registering an
+    :class:`~pyngrok.instrumentation.InstrumentationHook`. Calling this more than once has no additional effect.
+    """
+    instrumentation.add_hook(_api_request_latency_hook)
+
+
+def disable_api_request_metrics() -> None:
+    """
+    Stop recording the latency of :func:`~pyngrok.ngrok.api_request` calls.
+    """
+    instrumentation.remove_hook(_api_request_latency_hook)
+
+
+class MetricsCollector:
+    """
+    Collects ``ngrok`` and ``pyngrok`` metrics in to a cached snapshot rendered in the
+    `OpenMetrics <https://prometheus.io/docs/specs/om/open_metrics_spec/>`_ text format.
+
+    Scrapes are served from the last snapshot, so they never block on the ``ngrok`` agent. Snapshots are
+    refreshed on an interval once :func:`~pyngrok.exporter.MetricsCollector.start` has been called, or on demand
+    with :func:`~pyngrok.exporter.MetricsCollector.collect`. Collecting will never start the ``ngrok`` process.
+
+    .. code-block:: python
+
+        from pyngrok import exporter, ngrok
+
+        ngrok.connect(8000)
+
+        collector = exporter.MetricsCollector()
+        collector.start()
+        exporter.start_http_server(9464, collector=collector)
+    """
+
+    def __init__(self,
+                 pyngrok_config: Optional[PyngrokConfig] = None,
+                 refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+                 histogram: Optional[LatencyHistogram] = None) -> None:
+        #: The ``pyngrok`` configuration of the ``ngrok`` process to collect metrics from. If not set,
+        #: :func:`~pyngrok.conf.get_default()` is used at collection time.
+        self.pyngrok_config: Optional[PyngrokConfig] = pyngrok_config
+        #: How often, in seconds, the snapshot is refreshed by the background thread.
+        self.refresh_interval: float = refresh_interval
+        #: The histogram of API request latencies to render. Defaults to
+        #: :data:`~pyngrok.exporter.api_request_latency`, in which case recording is enabled.
+        self.histogram: LatencyHistogram = histogram if histogram is not None else api_request_latency
+        #: The number of snapshot refreshes that failed to reach the ``ngrok`` agent.
+        self.refresh_errors: int = 0
+        #: The Unix time of the last snapshot refresh.
+        self.last_refresh: Optional[float] = None
+
+        self._snapshot: Optional[str] = None
+        self._stop_event = threading.Event()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+        if histogram is None:
+            enable_api_request_metrics()
+
+    def render(self) -> str:
+        """
+        Get the most recently collected snapshot. If no snapshot has been collected yet, one is rendered
+        that contains only ``pyngrok``'s own metrics, without contacting the ``ngrok`` agent.
+
+        :return: The metrics, in OpenMetrics text format.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return self._render(None, [], [])
+
+        return snapshot
+
+    def collect(self) -> str:
+        """
+        Refresh the snapshot from the ``ngrok`` agent, if it is running.
+
+        :return: The metrics, in OpenMetrics text format.
+        """
+        pyngrok_config = self.pyngrok_config if self.pyngrok_config is not None else conf.get_default()
+
+        agent: Optional[NgrokAgent] = None
+        tunnels: List[NgrokTunnel] = []
+        if process.is_process_running(pyngrok_config.ngrok_path):
+            api_url = process._current_processes[pyngrok_config.ngrok_path].api_url
+            try:
+                tunnels = ngrok._fetch_tunnels(pyngrok_config, api_url)
+                agent = NgrokAgent(ngrok.api_request(f"{api_url}/api/status", method="GET",
+                                                     timeout=pyngrok_config.request_timeout,
+                                                     retry_policy=pyngrok_config.retry_policy))
+            except Exception as e:
+                logger.debug(f"Unable to collect metrics from ngrok: {e}")
+
+                self.refresh_errors += 1
+
+        self.last_refresh = time.time()
+        self._snapshot = self._render(agent, tunnels, [pyngrok_config.ngrok_path])
+
+        return self._snapshot
+
+    def start(self) -> None:
+        """
+        Start a thread that refreshes the snapshot every ``refresh_interval`` seconds. If the thread is already
+        running, nothing will be done.
+        """
+        if self._refresh_thread is None:
+            self._stop_event.clear()
+            self._refresh_thread = threading.Thread(target=self._refresh_loop, daemon=True)
+            self._refresh_thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the refresh thread, if running.
+        """
+        if self._refresh_thread is not None:
+            self._stop_event.set()
+            self._refresh_thread.join()
+            self._refresh_thread = None
+
+    def _refresh_loop(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.collect()
+            except Exception as e:  # pragma: no cover
+                logger.warning(f"Error refreshing metrics snapshot: {e}")
+
+            self._stop_event.wait(self.refresh_interval)
+
+    def _render(self,
+                agent: Optional[NgrokAgent],
+                tunnels: List[NgrokTunnel],
+                ngrok_paths: List[str]) -> str:
+        lines: List[str] = []
+
+        up = [(("ngrok_path", path),) for path in ngrok_paths]
+        _render_family(lines, "pyngrok_agent_up", "gauge",
+                       "Whether the ngrok agent API responded during the last refresh.",
+                       [("", labels, 1.0 if agent is not None else 0.0) for labels in up])
+        if agent is not None:
+            _render_family(lines, "pyngrok_agent", "info", "Information about the ngrok agent.",
+                           [("_info", (("status", agent.status or ""),
+                                       ("agent_version", agent.agent_version or "")), 1.0)])
+
+        _render_family(lines, "pyngrok_process_starts", "counter",
+                       "The number of times pyngrok started ngrok, including starts that failed.",
+                       [("_total", (("ngrok_path", path),), float(count))
+                        for path, count in sorted(process._start_counts.items())])
+        _render_family(lines, "pyngrok_process_restarts", "counter",
+                       "The number of times pyngrok restarted a running ngrok process after it exited or became "
+                       "unresponsive.",
+                       [("_total", (("ngrok_path", path),), float(ngrok_process.restart_count))
+                        for path, ngrok_process in sorted(process._current_processes.items())])
+
+        for kind, description in (("conns", "connections"), ("http", "HTTP requests")):
+            _render_tunnel_metrics(lines, tunnels, kind, description)
+
+        _render_family(lines, "pyngrok_api_request_duration_seconds", "histogram",
+                       "The latency of requests made by pyngrok.ngrok.api_request().",
+                       self.histogram.samples())
+
+        _render_family(lines, "pyngrok_exporter_refresh_errors", "counter",
+                       "The number of snapshot refreshes that failed to reach the ngrok agent.",
+                       [("_total", (), float(self.refresh_errors))])
+        if self.last_refresh is not None:
+            _render_family(lines, "pyngrok_exporter_last_refresh_timestamp_seconds", "gauge",
+                           "The Unix time of the last snapshot refresh.",
+                           [("", (), self.last_refresh)])
+
+        lines.append("# EOF")
+
+        return "\n".join(lines) + "\n"
+
+
+class MetricsHTTPServer:
+    """
+    A minimal HTTP server, running in a daemon thread, that serves a
+    :class:`~pyngrok.exporter.MetricsCollector`'s snapshot at ``/metrics``.
+    """
+
+    def __init__(self,
+                 server: ThreadingHTTPServer) -> None:
+        self._server = server
+        self._thread = threading.Thread(target=server.serve_forever, daemon=True)
+
+        #: The ``(host, port)`` the server is bound to.
+        self.server_address: Tuple[str, int] = server.server_address[:2]  # type: ignore
+
+    def __repr__(self) -> str:
+        return f"<MetricsHTTPServer: \"{self.server_address[0]}:{self.server_address[1]}\">"
+
+    def shutdown(self) -> None:
+        """
+        Stop serving and release the port.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+def start_http_server(port: int,
+                      addr: str = "127.0.0.1",
+                      collector: Optional[MetricsCollector] = None) -> MetricsHTTPServer:
+    """
+    Start serving metrics at ``http://<addr>:<port>/metrics`` from a daemon thread.
+
+    :param port: The port to listen on, or ``0`` to pick a free port.
+    :param addr: The address to bind to.
+    :param collector: The collector whose snapshot is served. If not given, a new
+        :class:`~pyngrok.exporter.MetricsCollector` is created and started.
+    :return: The running server.
+    """
+    if collector is None:
+        collector = MetricsCollector()
+        collector.start()
+
+    handler = type("MetricsRequestHandler", (_MetricsRequestHandler,), {"collector": collector})
+    metrics_server = MetricsHTTPServer(ThreadingHTTPServer((addr, port), handler))
+    metrics_server._thread.start()
+
+    logger.info(f"Serving metrics on http://{addr}:{metrics_server.server_address[1]}/metrics")
+
+    return metrics_server
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    collector: MetricsCollector
+
+    def do_GET(self) -> None:  # noqa: N802
+        if urlparse(self.path).path != "/metrics":
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        body = self.collector.render().encode("utf-8")
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(format % args)
+
+
+def _render_tunnel_metrics(lines: List[str],
+                           tunnels: List[NgrokTunnel],
+                           kind: str,
+                           description: str) -> None:
+    prefix = "pyngrok_tunnel_connections" if kind == "conns" else "pyngrok_tunnel_http_requests"
+
+    counts: List[_Sample] = []
+    gauges: List[_Sample] = []
+    rates: List[_Sample] = []
+    quantiles: List[_Sample] = []
+    for tunnel in tunnels:
+        metrics = tunnel.metrics.get(kind)
+        if not metrics:
+            continue
+
+        labels = (("tunnel", tunnel.name or ""),
+                  ("public_url", tunnel.public_url or ""),
+                  ("proto", tunnel.proto or ""))
+
+        if "count" in metrics:
+            counts.append(("_total", labels, float(metrics["count"])))
+        if "gauge" in metrics:
+            gauges.append(("", labels, float(metrics["gauge"])))
+        for rate in _NGROK_RATES:
+            if rate in metrics:
+                rates.append(("", labels + (("window", rate.removeprefix("rate") + "m"),), float(metrics[rate])))
+        for key, quantile in _NGROK_PERCENTILES:
+            if key in metrics:
+                quantiles.append(("", labels + (("quantile", quantile),), float(metrics[key]) / 1e9))
+
+    _render_family(lines, prefix, "counter", f"The number of tunnel {description}.", counts)
+    if kind == "conns":
+        _render_family(lines, "pyngrok_tunnel_open_connections", "gauge",
+                       "The number of currently open tunnel connections.", gauges)
+    _render_family(lines, f"{prefix}_rate", "gauge",
+                   f"The moving average rate of tunnel {description} per second.", rates)
+    _render_family(lines, f"{prefix}_duration_seconds", "summary",
+                   f"Percentiles of tunnel {description} duration, as reported by ngrok.", quantiles)
+
+
+def _render_family(lines: List[str],
+                   name: str,
+                   metric_type: str,
+                   description: str,
+                   samples: List[_Sample]) -> None:
+    if not samples:
+        return
+
+    lines.append(f"# TYPE {name} {metric_type}")
+    lines.append(f"# HELP {name} {description}")
+    for suffix, labels, value in samples:
+        if labels:
+            label_str = ",".join(f"{key}=\"{_escape(value)}\"" for key, value in labels)
+            lines.append(f"{name}{suffix}{{{label_str}}} {_format_value(value)}")
+        else:
+            lines.append(f"{name}{suffix} {_format_value(value)}")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    elif math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    elif value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+
+    return repr(value)
@@ -0,0 +1,562 @@
+#!/usr/bin/env python
+
+__copyright__ = "Copyright (c) 2018-2025 Alex Laird"
+__license__ = "MIT"
+
+import base64
+import errno
+import logging
+import os
+import random
+import secrets
+import stat
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import yaml
+
+from pyngrok import codec, installer
+from pyngrok.exception import PyngrokError
+
+logger = logging.getLogger(__name__)
+
+FAKE_AGENT_VERSION = "3.22.1"
+DEFAULT_WEB_ADDR_HOST = "127.0.0.1"
+DEFAULT_WEB_ADDR_PORT = 4040
+DEFAULT_MAX_REQUESTS = 500
+
+#: Seconds of latency added to every API response.
+LATENCY_ENV = "PYNGROK_FAKE_LATENCY"
+#: The fraction (``0`` to ``1``) of API requests that will be answered with a ``502``.
+FAILURE_RATE_ENV = "PYNGROK_FAKE_FAILURE_RATE"
+#: Seconds to wait before emitting the startup logs.
+STARTUP_DELAY_ENV = "PYNGROK_FAKE_STARTUP_DELAY"
+#: If set, the agent logs this as a startup error and exits instead of starting.
+STARTUP_ERROR_ENV = "PYNGROK_FAKE_STARTUP_ERROR"
+#: The number of captured requests the agent retains, oldest are dropped first.
+MAX_REQUESTS_ENV = "PYNGROK_FAKE_MAX_REQUESTS"
+
+_EMPTY_CONNS_METRICS = {"count": 0, "gauge": 0, "rate1": 0, "rate5": 0, "rate15": 0,
+                        "p50": 0, "p90": 0, "p95": 0, "p99": 0}
+_EMPTY_HTTP_METRICS = {"count": 0, "rate1": 0, "rate5": 0, "rate15": 0,
+                       "p50": 0, "p90": 0, "p95": 0, "p99": 0}
+
+
+class FakeAgentState:
+    """
+    The tunnels, endpoints, and captured requests held by a running fake agent, along with its failure injection
+    settings. All access is synchronized, as the agent's web service handles requests concurrently.
+    """
+
+    def __init__(self,
+                 latency: float = 0,
+                 failure_rate: float = 0,
+                 max_requests: int = DEFAULT_MAX_REQUESTS) -> None:
+        #: Seconds of latency added to every API response.
+        self.latency: float = latency
+        #: The fraction (``0`` to ``1``) of API requests that will be answered with a ``502``.
+        self.failure_rate: float = failure_rate
+        #: The number of captured requests retained.
+        self.max_requests: int = max_requests
+
+        self.lock = threading.RLock()
+        self.tunnels: Dict[str, Dict[str, Any]] = {}
+        self.endpoints: Dict[str, Dict[str, Any]] = {}
+        self.requests: List[Dict[str, Any]] = []
+
+    def create_tunnel(self,
+                      options: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        name = options.get("name") or f"tunnel-{secrets.token_hex(4)}"
+        proto = str(options.get("proto", "http"))
+        addr = _normalize_addr(str(options.get("addr", "80")), proto)
+
+        with self.lock:
+            if name in self.tunnels:
+                return _error(HTTPStatus.BAD_REQUEST, 102, "invalid tunnel configuration",
+                              f"a tunnel with the name '{name}' already exists")
+
+            public_url = _public_url(proto, options.get("domain") or options.get("hostname"), options.get("schemes"))
+            tunnel = {
+                "ID": secrets.token_hex(16),
+                "name": name,
+                "uri": f"/api/tunnels/{name}",
+                "public_url": public_url,
+                "proto": urlparse(public_url).scheme,
+                "config": {"addr": addr, "inspect": proto == "http"},
+                "metrics": {"conns": dict(_EMPTY_CONNS_METRICS), "http": dict(_EMPTY_HTTP_METRICS)},
+            }
+            self.tunnels[name] = tunnel
+
+        _log("info", "started tunnel", obj="tunnels", name=name, addr=addr, url=public_url)
+
+        return HTTPStatus.CREATED, tunnel
+
+    def create_endpoint(self,
+                        options: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        name = options.get("name") or f"endpoint-{secrets.token_hex(4)}"
+        upstream = dict(options.get("upstream") or {"url": "http://localhost:80"})
+        scheme = urlparse(str(upstream.get("url"))).scheme
+
+        with self.lock:
+            if name in self.endpoints:
+                return _error(HTTPStatus.BAD_REQUEST, 102, "invalid endpoint configuration",
+                              f"an endpoint with the name '{name}' already exists")
+
+            url = options.get("url") or _public_url("tcp" if scheme == "tcp" else "http", None)
+            endpoint = {
+                "id": secrets.token_hex(16),
+                "name": name,
+                "uri": f"/api/endpoints/{name}",
+                "url": url,
+                "upstream": upstream,
+                "metrics": {"conns": dict(_EMPTY_CONNS_METRICS), "http": dict(_EMPTY_HTTP_METRICS)},
+            }
+            self.endpoints[name] = endpoint
+
+        _log("info", "started endpoint", obj="endpoints", name=name, url=url)
+
+        return HTTPStatus.CREATED, endpoint
+
+    def capture_request(self,
+                        options: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Record a captured request, as if it had been made through a tunnel.
+
+        :param options: Overrides for ``tunnel_name``, ``method``, ``uri``, ``status_code``, ``body``,
+            ``response_body``, ``remote_addr``, ``start``, and ``duration``.
+        :return: The captured request.
+        """
+        method = str(options.get("method", "GET")).upper()
+        uri = str(options.get("uri", "/"))
+        status_code = int(options.get("status_code", 200))
+        body = str(options.get("body", "")).encode("utf-8")
+        response_body = str(options.get("response_body", "")).encode("utf-8")
+        request_headers = {"Content-Length": [str(len(body))], "User-Agent": ["fake-agent"]}
+        response_headers = {"Content-Length": [str(len(response_body))], "Content-Type": ["text/plain"]}
+        request_id = f"airt_{secrets.token_hex(12)}"
+
+        captured = {
+            "uri": f"/api/requests/http/{request_id}",
+            "id": request_id,
+            "tunnel_name": options.get("tunnel_name", ""),
+            "remote_addr": options.get("remote_addr", "127.0.0.1"),
+            "start": options.get("start") or datetime.now(timezone.utc).isoformat(timespec="microseconds"),
+            "duration": int(options.get("duration", random.randint(100000, 10000000))),
+            "request": {
+                "method": method,
+                "proto": "HTTP/1.1",
+                "headers": request_headers,
+                "uri": uri,
+                "raw": _raw_message(f"{method} {uri} HTTP/1.1", request_headers, body),
+            },
+            "response": {
+                "status": f"{status_code} {_reason(status_code)}",
+                "status_code": status_code,
+                "proto": "HTTP/1.1",
+                "headers": response_headers,
+                "raw": _raw_message(f"HTTP/1.1 {status_code} {_reason(status_code)}", response_headers,
+                                    response_body),
+            },
+        }
+
+        with self.lock:
+            self.requests.append(captured)
+            del self.requests[:-self.max_requests]
+
+            tunnel = self.tunnels.get(captured["tunnel_name"]) or self.endpoints.get(captured["tunnel_name"])
+            if tunnel is not None:
+                tunnel["metrics"]["http"]["count"] += 1
+                tunnel["metrics"]["conns"]["count"] += 1
+
+        return captured
+
+    def list_requests(self,
+                      tunnel_name: Optional[str],
+                      limit: Optional[int]) -> List[Dict[str, Any]]:
+        with self.lock:
+            requests = [r for r in reversed(self.requests) if not tunnel_name or r["tunnel_name"] == tunnel_name]
+
+        return requests[:limit] if limit else requests
+
+    def get_request(self,
+                    request_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            return next((r for r in self.requests if r["id"] == request_id), None)
+
+
+class _FakeAgentHTTPServer(ThreadingHTTPServer):
+    # A deep listen backlog, like ngrok's, so bursts of concurrent clients aren't stalled by SYN retries
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class FakeAgentRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves the subset of the `ngrok agent API <https://ngrok.com/docs/agent/api/>`_ used by ``pyngrok``, along
+    with ``/_fake`` routes to control the fake agent.
+    """
+
+    state: FakeAgentState
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:  # noqa: N802
+        self._dispatch("POST")
+
+    def do_DELETE(self) -> None:  # noqa: N802
+        self._dispatch("DELETE")
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _dispatch(self,
+                  method: str) -> None:
+        parsed = urlparse(self.path)
+        path = parsed.path.rstrip("/")
+        query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        body = self._read_body()
+
+        if not path.startswith("/_fake"):
+            if self.state.latency:
+                time.sleep(self.state.latency)
+            if self.state.failure_rate and random.random() < self.state.failure_rate:
+                self._respond(*_error(HTTPStatus.BAD_GATEWAY, 0, "injected failure",
+                                      "failure injected by the fake agent"))
+                return
+
+        self._respond(*self._route(method, path, query, body))
+
+    def _route(self,
+               method: str,
+               path: str,
+               query: Dict[str, str],
+               body: Dict[str, Any]) -> Tuple[int, Optional[Dict[str, Any]]]:
+        state = self.state
+
+        if path == "/api/status" and method == "GET":
+            return HTTPStatus.OK, {"status": "online", "agent_version": FAKE_AGENT_VERSION,
+                                   "session": {"leg": 0, "region": "us"}, "uri": "/api/status"}
+        elif path in ["/api/tunnels", "/api/endpoints"]:
+            collection_name = path.rsplit("/", 1)[1]
+            collection = state.tunnels if collection_name == "tunnels" else state.endpoints
+            if method == "GET":
+                with state.lock:
+                    items = [dict(item) for item in collection.values()]
+                return HTTPStatus.OK, {collection_name: items, "uri": path}
+            elif method == "POST":
+                return state.create_tunnel(body) if collection_name == "tunnels" else state.create_endpoint(body)
+        elif path.startswith("/api/tunnels/") or path.startswith("/api/endpoints/"):
+            collection = state.tunnels if path.startswith("/api/tunnels/") else state.endpoints
+            name = path.rsplit("/", 1)[1]
+            with state.lock:
+                item = collection.get(name)
+                if item is None:
+                    return _error(HTTPStatus.NOT_FOUND, 100, "not found", f"tunnel '{name}' not found")
+                elif method == "GET":
+                    return HTTPStatus.OK, dict(item)
+                elif method == "DELETE":
+                    collection.pop(name)
+                    _log("info", "stopped tunnel", obj="tunnels", name=name)
+                    return HTTPStatus.NO_CONTENT, None
+        elif path == "/api/requests/http":
+            if method == "GET":
+                limit = int(query["limit"]) if query.get("limit") else None
+                return HTTPStatus.OK, {"uri": path,
+                                       "requests": state.list_requests(query.get("tunnel_name"), limit)}
+            elif method == "POST":
+                original = state.get_request(str(body.get("id")))
+                if original is None:
+                    return _error(HTTPStatus.NOT_FOUND, 100, "not found", f"request '{body.get('id')}' not found")
+                state.capture_request({"tunnel_name": body.get("tunnel_name") or original["tunnel_name"],
+                                       "method": original["request"]["method"],
+                                       "uri": original["request"]["uri"],
+                                       "status_code": original["response"]["status_code"],
+                                       "remote_addr": original["remote_addr"]})
+                return HTTPStatus.NO_CONTENT, None
+            elif method == "DELETE":
+                with state.lock:
+                    state.requests.clear()
+                return HTTPStatus.NO_CONTENT, None
+        elif path.startswith("/api/requests/http/") and method == "GET":
+            captured = state.get_request(path.rsplit("/", 1)[1])
+            if captured is None:
+                return _error(HTTPStatus.NOT_FOUND, 100, "not found", "request not found")
+            return HTTPStatus.OK, captured
+        elif path == "/_fake/config" and method == "POST":
+            state.latency = float(body.get("latency", state.latency))
+            state.failure_rate = float(body.get("failure_rate", state.failure_rate))
+            return HTTPStatus.OK, {"latency": state.latency, "failure_rate": state.failure_rate}
+        elif path == "/_fake/requests" and method == "POST":
+            count = int(body.pop("count", 1))
+            return HTTPStatus.CREATED, {"requests": [state.capture_request(body) for _ in range(count)]}
+        else:
+            return _error(HTTPStatus.NOT_FOUND, 100, "not found", f"{method} {path} is not a supported route")
+
+        return _error(HTTPStatus.METHOD_NOT_ALLOWED, 101, "method not allowed", f"{method} {path}")
+
+    def _read_body(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+
+        data = codec.loads(self.rfile.read(length))
+
+        return data if isinstance(data, dict) else {}
+
+    def _respond(self,
+                 status_code: int,
+                 data: Optional[Dict[str, Any]]) -> None:
+        body = codec.dumps(data) if data is not None else b""
+
+        self.send_response(status_code)
+        if data is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def install_fake_agent(ngrok_path: str) -> None:
+    """
+    Install an executable at the given path that launches the fake agent, so it can be used as a
+    :class:`~pyngrok.conf.PyngrokConfig`'s ``ngrok_path``. The launcher uses the current Python interpreter.
+
+    :param ngrok_path: The path to where the launcher will be installed.
+    :raises: :class:`~pyngrok.exception.PyngrokError`: When the current system is Windows, which is not supported.
+    """
+    if installer.get_system() == "windows":
+        raise PyngrokError("The fake agent is not supported on Windows")
+
+    ngrok_dir = os.path.dirname(ngrok_path)
+    if ngrok_dir and not os.path.exists(ngrok_dir):
+        os.makedirs(ngrok_dir)
+
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with open(ngrok_path, "w") as f:
+        f.write(f"#!{sys.executable}\n"
+                f"import sys\n"
+                f"sys.path.insert(0, {package_dir!r})\n"
+                f"from pyngrok.fake_agent import main\n"
+                f"sys.exit(main())\n")
+
+    os.chmod(ngrok_path, os.stat(ngrok_path).st_mode | stat.S_IXUSR)
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    """
+    Entry point for the fake agent, accepting the subset of ``ngrok``'s command line used by ``pyngrok``.
+
+    :param args: The command line arguments, defaults to ``sys.argv[1:]``.
+    :return: The exit code.
+    """
+    if args is None:
+        args = sys.argv[1:]
+
+    flags, positional = _parse_args(args)
+
+    if "version" in flags or positional[:1] == ["version"]:
+        print(f"ngrok version {FAKE_AGENT_VERSION}")
+    elif positional[:1] == ["update"]:
+        print("No update available, this is the latest version.")
+    elif positional[:2] in [["config", "add-authtoken"], ["config", "add-api-key"]] and len(positional) > 2:
+        key, label = ("authtoken", "Authtoken") if positional[1] == "add-authtoken" else ("api_key", "API key")
+        config_path = flags.get("config") or os.path.join(installer.get_default_ngrok_dir(), "ngrok.yml")
+        _save_config_value(config_path, key, positional[2])
+        print(f"{label} saved to configuration file: {config_path}")
+    elif positional[:1] == ["start"]:
+        return _start(flags)
+    elif positional[:1] == ["api"]:
+        print("ERROR:  The fake agent does not support the \"api\" command", file=sys.stderr)
+        return 1
+    else:
+        print(f"NAME:\n  ngrok - fake agent for pyngrok\n\nVERSION:\n  {FAKE_AGENT_VERSION}")
+
+    return 0
+
+
+def _start(flags: Dict[str, str]) -> int:
+    log = flags.get("log", "stdout")
+    if log == "stderr":
+        sys.stdout = sys.stderr
+    elif log == "false":
+        sys.stdout = open(os.devnull, "w")
+    elif log != "stdout":
+        # Like ngrok, any other value is a path to a log file
+        sys.stdout = open(log, "a", buffering=1)
+
+    startup_delay = float(os.environ.get(STARTUP_DELAY_ENV, 0))
+    if startup_delay:
+        time.sleep(startup_delay)
+
+    config_path = flags.get("config")
+    config = _load_config(config_path)
+    if config_path:
+        _log("info", "open config file", path=config_path, err="nil")
+
+    startup_error = os.environ.get(STARTUP_ERROR_ENV)
+    if startup_error:
+        _log("eror", "session closing", obj="tunnels.session", err=startup_error)
+        return 1
+
+    web_addr = config.get("web_addr") if str(config.get("version")) != "3" else \
+        (config.get("agent") or {}).get("web_addr")
+    try:
+        server = _bind_web_service(web_addr)
+    except OSError as e:
+        _log("eror", "failed to start web service", obj="web", err=str(e))
+        return 1
+
+    handler = type("StatefulFakeAgentRequestHandler", (FakeAgentRequestHandler,),
+                   {"state": FakeAgentState(latency=float(os.environ.get(LATENCY_ENV, 0)),
+                                            failure_rate=float(os.environ.get(FAILURE_RATE_ENV, 0)),
+                                            max_requests=int(os.environ.get(MAX_REQUESTS_ENV,
+                                                                            DEFAULT_MAX_REQUESTS)))})
+    server.RequestHandlerClass = handler
+    host, port = server.server_address[:2]
+
+    _log("info", "starting web service", obj="web", addr=f"{host!s}:{port}", allow_hosts="[]")
+    _log("info", "client session established", obj="csess", id=secrets.token_hex(6))
+    _log("info", "tunnel session started", obj="tunnels.session")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:  # pragma: no cover
+        pass
+
+    return 0
+
+
+def _bind_web_service(web_addr: Optional[str]) -> _FakeAgentHTTPServer:
+    if web_addr:
+        host, _, web_port = str(web_addr).rpartition(":")
+        return _FakeAgentHTTPServer((host or DEFAULT_WEB_ADDR_HOST, int(web_port)), FakeAgentRequestHandler)
+
+    # Like ngrok, when no web_addr is configured, try successive ports from the default before giving up
+    for port in range(DEFAULT_WEB_ADDR_PORT, DEFAULT_WEB_ADDR_PORT + 100):
+        try:
+            return _FakeAgentHTTPServer((DEFAULT_WEB_ADDR_HOST, port), FakeAgentRequestHandler)
+        except OSError as e:
+            if e.errno != errno.EADDRINUSE:
+                raise
+
+    return _FakeAgentHTTPServer((DEFAULT_WEB_ADDR_HOST, 0), FakeAgentRequestHandler)
+
+
+def _parse_args(args: List[str]) -> Tuple[Dict[str, str], List[str]]:
+    flags: Dict[str, str] = {}
+    positional: List[str] = []
+
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in ["--version", "-v"]:
+            flags["version"] = "true"
+        elif arg == "--none":
+            flags["none"] = "true"
+        elif arg.startswith("--"):
+            key, _, value = arg[2:].partition("=")
+            if not value and i + 1 < len(args):
+                i += 1
+                value = args[i]
+            flags[key] = value
+        else:
+            positional.append(arg)
+        i += 1
+
+    return flags, positional
+
+
+def _load_config(config_path: Optional[str]) -> Dict[str, Any]:
+    if not config_path or not os.path.exists(config_path):
+        return {}
+
+    with open(config_path, "r") as config_file:
+        return yaml.safe_load(config_file) or {}
+
+
+def _save_config_value(config_path: str,
+                       key: str,
+                       value: str) -> None:
+    config = _load_config(config_path)
+    if str(config.get("version")) == "3":
+        config.setdefault("agent", {})[key] = value
+    else:
+        config[key] = value
+
+    config_dir = os.path.dirname(config_path)
+    if config_dir and not os.path.exists(config_dir):
+        os.makedirs(config_dir)
+    with open(config_path, "w") as config_file:
+        yaml.dump(config, config_file)
+
+
+def _log(lvl: str,
+         msg: str,
+         **fields: Any) -> None:
+    t = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S%z")
+    extra = "".join(f" {key}={_logfmt_value(value)}" for key, value in fields.items())
+
+    print(f"t={t} lvl={lvl} msg=\"{msg}\"{extra}", flush=True)
+
+
+def _logfmt_value(value: Any) -> str:
+    value = str(value)
+
+    return f"\"{value}\"" if " " in value or "=" in value else value
+
+
+def _error(status_code: int,
+           error_code: int,
+           msg: str,
+           err: str) -> Tuple[int, Dict[str, Any]]:
+    return status_code, {"error_code": error_code, "status_code": status_code, "msg": msg,
+                         "details": {"err": err}}
+
+
+def _normalize_addr(addr: str,
+                    proto: str) -> str:
+    if "://" in addr or proto != "http" and ":" in addr:
+        return addr
+    elif ":" not in addr:
+        addr = f"localhost:{addr}"
+
+    return f"http://{addr}" if proto == "http" else addr
+
+
+def _public_url(proto: str,
+                domain: Optional[str],
+                schemes: Optional[List[str]] = None) -> str:
+    if proto in ["tcp", "tls"]:
+        return f"{proto}://0.{proto}.ngrok.io:{random.randint(10000, 20000)}"
+
+    scheme = "http" if schemes and "https" not in schemes else "https"
+
+    return f"{scheme}://{domain or secrets.token_hex(6) + '.ngrok-free.app'}"
+
+
+def _raw_message(start_line: str,
+                 headers: Dict[str, List[str]],
+                 body: bytes) -> str:
+    header_lines = "".join(f"{key}: {value}\r\n" for key, values in headers.items() for value in values)
+    message = f"{start_line}\r\n{header_lines}\r\n".encode("utf-8") + body
+
+    return base64.b64encode(message).decode("ascii")
+
+
+def _reason(status_code: int) -> str:
+    try:
+        return HTTPStatus(status_code).phrase
+    except ValueError:
+        return ""
+
+
+if __name__ == "__main__":
+    sys.exit(main())
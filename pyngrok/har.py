@@ -0,0 +1,364 @@
+__copyright__ = "Copyright (c) 2018-2025 Alex Laird"
+__license__ = "MIT"
+
+import base64
+import json
+import logging
+import re
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import IO, Any, Deque, Dict, Iterable, Iterator, List, Optional, Union
+from urllib.error import HTTPError
+from urllib.parse import parse_qsl, urlparse
+from urllib.request import Request, urlopen
+
+from pyngrok import __version__, agent, codec, conf
+from pyngrok.agent import CapturedRequest
+from pyngrok.conf import PyngrokConfig
+from pyngrok.exception import PyngrokSecurityError
+from pyngrok.ratelimit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+HAR_VERSION = "1.2"
+#: The default number of entries :func:`~pyngrok.har.replay_har` replays at once.
+DEFAULT_REPLAY_CONCURRENCY = 8
+
+# How much of a HAR file is read at a time when importing
+_READ_CHUNK_SIZE = 64 * 1024
+_ENTRIES_PATTERN = re.compile(r"\"entries\"\s*:\s*\[")
+# Headers describing the original connection or body, rather than the request itself, which are not replayed
+_SKIPPED_HEADERS = {"connection", "content-length", "host", "keep-alive", "proxy-connection", "te", "trailer",
+                    "transfer-encoding", "upgrade"}
+
+
+class HarReplayResult:
+    """
+    An object containing the outcome of a HAR entry replayed by :func:`~pyngrok.har.replay_har`.
+    """
+
+    def __init__(self,
+                 index: int,
+                 url: str,
+                 latency: float,
+                 status_code: Optional[int] = None,
+                 error: Optional[Exception] = None) -> None:
+        #: The index of the entry in the HAR file.
+        self.index: int = index
+        #: The URL the entry was replayed to.
+        self.url: str = url
+        #: How long, in seconds, the upstream took to respond.
+        self.latency: float = latency
+        #: The status code the upstream responded with.
+        self.status_code: Optional[int] = status_code
+        #: The error, if the upstream could not be reached.
+        self.error: Optional[Exception] = error
+
+    @property
+    def ok(self) -> bool:
+        """
+        Whether the upstream responded, regardless of its status code.
+        """
+        return self.error is None
+
+    def __repr__(self) -> str:
+        return f"<HarReplayResult: {self.index} \"{self.url}\" status_code={self.status_code}>"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"HarReplayResult: {self.index} \"{self.url}\" status_code={self.status_code}"
+
+
+def to_har_entry(captured_request: CapturedRequest,
+                 base_url: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Convert a captured request to a `HAR 1.2 <http://www.softwareishard.com/blog/har-12-spec/>`_ entry.
+
+    :param captured_request: The captured request.
+    :param base_url: The scheme and host to build the entry's URL from. If not set, the request's ``Host`` header
+        is used.
+    :return: The HAR entry.
+    """
+    request = captured_request.request or {}
+    response = captured_request.response or {}
+    request_headers = captured_request.request_headers
+    response_headers = captured_request.response_headers
+    request_body = captured_request.request_body
+    response_body = captured_request.response_body
+
+    uri = request.get("uri") or "/"
+    if base_url is None:
+        host = _header(request_headers, "Host")
+        base_url = f"http://{host}" if host else "http://localhost"
+    wait = (captured_request.duration or 0) / 1000000
+
+    har_request: Dict[str, Any] = {
+        "method": request.get("method", "GET"),
+        "url": f"{base_url.rstrip('/')}{uri}",
+        "httpVersion": request.get("proto", "HTTP/1.1"),
+        "cookies": [],
+        "headers": _har_headers(request_headers),
+        "queryString": [{"name": name, "value": value}
+                        for name, value in parse_qsl(urlparse(uri).query, keep_blank_values=True)],
+        "headersSize": -1,
+        "bodySize": len(request_body) if request_body is not None else -1,
+    }
+    if request_body:
+        post_data = _har_text(request_body)
+        # HAR only defines an encoding for response content, so a binary request body's is a custom field
+        if "encoding" in post_data:
+            post_data["_encoding"] = post_data.pop("encoding")
+        har_request["postData"] = dict(post_data, mimeType=_header(request_headers, "Content-Type") or "")
+
+    status = str(response.get("status") or "")
+    content: Dict[str, Any] = {
+        "size": len(response_body) if response_body is not None else 0,
+        "mimeType": _header(response_headers, "Content-Type") or "",
+    }
+    if response_body:
+        content.update(_har_text(response_body))
+
+    return {
+        "startedDateTime": captured_request.start,
+        "time": wait,
+        "request": har_request,
+        "response": {
+            "status": response.get("status_code", 0),
+            "statusText": status.split(" ", 1)[1] if " " in status else "",
+            "httpVersion": response.get("proto", "HTTP/1.1"),
+            "cookies": [],
+            "headers": _har_headers(response_headers),
+            "content": content,
+            "redirectURL": _header(response_headers, "Location") or "",
+            "headersSize": -1,
+            "bodySize": len(response_body) if response_body is not None else -1,
+        },
+        "cache": {},
+        "timings": {"send": 0, "wait": wait, "receive": 0},
+        "_id": captured_request.id,
+        "_tunnel_name": captured_request.tunnel_name,
+        "_remote_addr": captured_request.remote_addr,
+    }
+
+
+def write_har(captured_requests: Iterable[CapturedRequest],
+              fp: IO[str],
+              base_url: Optional[str] = None) -> int:
+    """
+    Write the given captured requests to a HAR file. Entries are written as they are iterated, so when given an
+    iterator, such as :func:`~pyngrok.agent.iter_requests`, the whole document is never held in memory.
+
+    :param captured_requests: The captured requests.
+    :param fp: The file to write to.
+    :param base_url: The scheme and host to build each entry's URL from. If not set, each request's ``Host``
+        header is used.
+    :return: The number of entries written.
+    """
+    creator = codec.dumps({"name": "pyngrok", "version": __version__}).decode("utf-8")
+    fp.write(f"{{\"log\": {{\"version\": \"{HAR_VERSION}\", \"creator\": {creator}, \"entries\": [")
+
+    count = 0
+    for captured_request in captured_requests:
+        fp.write(",\n" if count else "\n")
+        fp.write(codec.dumps(to_har_entry(captured_request, base_url)).decode("utf-8"))
+        count += 1
+
+    fp.write("\n]}}\n")
+
+    return count
+
+
+def export_har(path: str,
+               tunnel_name: Optional[str] = None,
+               base_url: Optional[str] = None,
+               pyngrok_config: Optional[PyngrokConfig] = None) -> int:
+    """
+    Export the requests captured by the ``ngrok`` agent, oldest first, to a HAR file.
+
+    If ``ngrok`` is not installed at :class:`~pyngrok.conf.PyngrokConfig`'s ``ngrok_path``, calling this method
+    will first download and install ``ngrok``.
+
+    If ``ngrok`` is not running, calling this method will first start a process with
+    :class:`~pyngrok.conf.PyngrokConfig`.
+
+    :param path: The path of the HAR file to write.
+    :param tunnel_name: The tunnel name to filter by.
+    :param base_url: The scheme and host to build each entry's URL from. If not set, each request's ``Host``
+        header is used.
+    :param pyngrok_config: A ``pyngrok`` configuration to use when interacting with the ``ngrok`` binary,
+        overriding :func:`~pyngrok.conf.get_default()`.
+    :return: The number of entries written.
+    """
+    if pyngrok_config is None:
+        pyngrok_config = conf.get_default()
+
+    with open(path, "w", encoding="utf-8") as fp:
+        return write_har(agent.iter_requests(tunnel_name, follow=False, pyngrok_config=pyngrok_config), fp,
+                         base_url)
+
+
+def iter_har_entries(fp: IO[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the entries in a HAR file, parsing them incrementally, so the whole document is never held in
+    memory.
+
+    :param fp: The HAR file to read.
+    :return: The HAR entries.
+    :raises: :py:class:`ValueError`: When the file is not a valid HAR file.
+    """
+    # Entries are found one at a time in a partially read document, which only the stdlib's decoder supports
+    decoder = json.JSONDecoder()
+
+    buffer = ""
+    while True:
+        match = _ENTRIES_PATTERN.search(buffer)
+        if match:
+            buffer = buffer[match.end():]
+            break
+
+        chunk = fp.read(_READ_CHUNK_SIZE)
+        if not chunk:
+            raise ValueError("The file is not a HAR file, it has no \"entries\".")
+        # Only keep enough of what was read to match the "entries" key if it was split across chunks
+        buffer = buffer[-64:] + chunk
+
+    read_size = _READ_CHUNK_SIZE
+    while True:
+        buffer = buffer.lstrip()
+        if buffer.startswith(","):
+            buffer = buffer[1:].lstrip()
+        if buffer.startswith("]"):
+            return
+
+        try:
+            if not buffer:
+                raise json.JSONDecodeError("Expecting value", buffer, 0)
+
+            entry, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError as e:
+            # The entry may just be split across chunks. Each retry decodes from the start of the entry, so the
+            # read size is doubled each time, to keep a large entry from being re-scanned once per chunk
+            chunk = fp.read(read_size)
+            if not chunk:
+                raise ValueError(f"The HAR file's entries are invalid or truncated: {e}")
+            buffer += chunk
+            read_size *= 2
+            continue
+
+        yield entry
+        buffer = buffer[end:]
+        read_size = _READ_CHUNK_SIZE
+
+
+def replay_har(source: Union[str, IO[str]],
+               upstream_url: str,
+               concurrency: int = DEFAULT_REPLAY_CONCURRENCY,
+               rate: Optional[float] = None,
+               timeout: Optional[float] = None) -> List[HarReplayResult]:
+    """
+    Replay the requests in a HAR file to a local upstream, such as the server a tunnel normally forwards to,
+    preserving each request's method, path, query string, headers, and body. The file is read incrementally, and
+    only a bounded number of entries are in flight at once, so it can be of any size.
+
+    .. code-block:: python
+
+        from pyngrok import har
+
+        results = har.replay_har("webhooks.har", "http://localhost:8000", rate=50)
+
+        server_errors = [r for r in results if r.status_code and r.status_code >= 500]
+
+    :param source: The path of the HAR file, or the HAR file itself.
+    :param upstream_url: The scheme and host to replay requests to.
+    :param concurrency: The max number of replays in flight at once.
+    :param rate: The max number of replays started per second.
+    :param timeout: The timeout, in seconds, for each replay.
+    :return: The outcome of each replay, in the same order as the HAR file's entries.
+    :raises: :class:`~pyngrok.exception.PyngrokSecurityError`: When the ``upstream_url`` is not supported.
+    """
+    if not upstream_url.lower().startswith("http"):
+        raise PyngrokSecurityError(f"URL must start with \"http\": {upstream_url}")
+    if concurrency < 1:
+        raise ValueError("\"concurrency\" must be at least 1.")
+    if rate is not None and rate <= 0:
+        raise ValueError("\"rate\" must be greater than 0.")
+
+    if isinstance(source, str):
+        with open(source, "r", encoding="utf-8") as fp:
+            return replay_har(fp, upstream_url, concurrency, rate, timeout)
+
+    bucket = TokenBucket(rate) if rate is not None else None
+
+    def replay(index: int,
+               entry: Dict[str, Any]) -> HarReplayResult:
+        if bucket is not None:
+            bucket.acquire()
+
+        return _replay_entry(index, entry, upstream_url, timeout)
+
+    results = []
+    pending: Deque[Future[HarReplayResult]] = deque()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="pyngrok-har-replay") as executor:
+        for index, entry in enumerate(iter_har_entries(source)):
+            # Bound the entries held in memory to those in flight, rather than the whole file
+            if len(pending) >= 2 * concurrency:
+                results.append(pending.popleft().result())
+
+            pending.append(executor.submit(replay, index, entry))
+
+        results.extend(future.result() for future in pending)
+
+    return results
+
+
+def _replay_entry(index: int,
+                  entry: Dict[str, Any],
+                  upstream_url: str,
+                  timeout: Optional[float]) -> HarReplayResult:
+    har_request = entry.get("request", {})
+    parsed = urlparse(har_request.get("url", "/"))
+    url = f"{upstream_url.rstrip('/')}{parsed.path or '/'}{f'?{parsed.query}' if parsed.query else ''}"
+
+    headers = {header["name"]: header["value"] for header in har_request.get("headers", [])
+               if header.get("name", "").lower() not in _SKIPPED_HEADERS}
+    post_data = har_request.get("postData")
+    data = None
+    if post_data:
+        text = post_data.get("text", "")
+        data = base64.b64decode(text) if post_data.get("_encoding") == "base64" else text.encode("utf-8")
+
+    request = Request(url, data=data, headers=headers, method=har_request.get("method", "GET"))
+
+    start = time.perf_counter()
+    try:
+        with urlopen(request, timeout=timeout) as response:
+            response.read()
+            status_code = response.status
+    except HTTPError as e:
+        status_code = e.code
+    except Exception as e:
+        logger.debug(f"Error replaying HAR entry {index} to {url}: {e}")
+
+        return HarReplayResult(index, url, time.perf_counter() - start, error=e)
+
+    return HarReplayResult(index, url, time.perf_counter() - start, status_code)
+
+
+def _har_headers(headers: Dict[str, List[str]]) -> List[Dict[str, str]]:
+    return [{"name": name, "value": value} for name, values in headers.items() for value in values]
+
+
+def _har_text(body: memoryview) -> Dict[str, str]:
+    try:
+        return {"text": str(body, "utf-8")}
+    except UnicodeDecodeError:
+        return {"text": base64.b64encode(body).decode("ascii"), "encoding": "base64"}
+
+
+def _header(headers: Dict[str, List[str]],
+            name: str) -> Optional[str]:
+    for header_name, values in headers.items():
+        if header_name.lower() == name.lower() and values:
+            return values[0]
+
+    return None
@@ -19,7 +19,8 @@ from urllib.request import urlopen
 
 import yaml
 
-from pyngrok.exception import PyngrokError, PyngrokNgrokInstallError, PyngrokSecurityError
+from pyngrok.deadline import Deadline
+from pyngrok.exception import PyngrokDeadlineError, PyngrokError, PyngrokNgrokInstallError, PyngrokSecurityError
 
 logger = logging.getLogger(__name__)
 
@@ -157,9 +158,10 @@ def install_ngrok(ngrok_path: str,
 
     :param ngrok_path: The path to where the ``ngrok`` binary will be downloaded.
     :param ngrok_version: The major version of ``ngrok`` to be installed.
-    :param kwargs: Remaining ``kwargs`` will be passed to :func:`_download_file`.
+    :param kwargs: Remaining ``kwargs`` will be passed to :func:`_download_file`, including a ``deadline``.
     :raises: :class:`~pyngrok.exception.PyngrokError`: When the ``ngrok_version`` is not supported.
     :raises: :class:`~pyngrok.exception.PyngrokNgrokInstallError`: When an error occurs installing ``ngrok``.
+    :raises: :class:`~pyngrok.exception.PyngrokDeadlineError`: When the ``deadline`` is exhausted.
     """
     if ngrok_version:
         ngrok_version = ngrok_version.removeprefix("v")
@@ -182,6 +184,8 @@ def install_ngrok(ngrok_path: str,
         download_path = _download_file(url, **kwargs)
 
         _install_ngrok_archive(ngrok_path, download_path)
+    except PyngrokDeadlineError:
+        raise
     except Exception as e:
         raise PyngrokNgrokInstallError(f"An error occurred while downloading ngrok from {url}: {e}")
 
@@ -334,16 +338,19 @@ def _validate_config_values(values: Dict[str, Any]) -> None:
 
 def _download_file(url: str,
                    retries: int = 0,
+                   deadline: Optional[Deadline] = None,
                    **kwargs: Any) -> str:
     """
     Download a file to a temporary path and emit a status to stdout (if possible) as the download progresses.
 
     :param url: The URL to download.
     :param retries: The retry attempt index, if download fails.
+    :param deadline: The overall deadline, which caps the download's timeout, and is checked between chunks.
     :param kwargs: Remaining ``kwargs`` will be passed to :py:func:`urllib.request.urlopen`.
     :return: The path to the downloaded temporary file.
     :raises: :class:`~pyngrok.exception.PyngrokSecurityError`: When the ``url`` is not supported.
     :raises: :class:`~pyngrok.exception.PyngrokNgrokInstallError`: When an error occurs downloading ``ngrok``.
+    :raises: :class:`~pyngrok.exception.PyngrokDeadlineError`: When the ``deadline`` is exhausted.
     """
     kwargs["timeout"] = kwargs.get("timeout", DEFAULT_DOWNLOAD_TIMEOUT)
 
@@ -356,7 +363,8 @@ def _download_file(url: str,
         logger.debug(f"Download ngrok from {url} ...")
 
         local_filename = url.split("/")[-1]
-        response = urlopen(url, **kwargs)
+        timeout = deadline.cap(kwargs["timeout"], "downloading ngrok") if deadline else kwargs["timeout"]
+        response = urlopen(url, **dict(kwargs, timeout=timeout))
 
         status_code = response.getcode()
 
@@ -380,6 +388,8 @@ def _download_file(url: str,
 
                 if not buffer:
                     break
+                if deadline:
+                    deadline.check("downloading the rest of ngrok")
 
                 f.write(buffer)
                 size += len(buffer)
@@ -392,11 +402,14 @@ def _download_file(url: str,
 
         return download_path
     except (socket.timeout, URLError) as e:
-        if retries < DEFAULT_RETRY_COUNT:
+        if deadline and deadline.remaining() <= 0.5:
+            raise PyngrokDeadlineError(f"The deadline of {deadline.timeout} seconds was exceeded "
+                                       f"downloading ngrok: {e}", "downloading ngrok")
+        elif retries < DEFAULT_RETRY_COUNT:
             logger.warning("ngrok download failed, retrying in 0.5 seconds ...")
             time.sleep(0.5)
 
-            return _download_file(url, retries + 1, **kwargs)
+            return _download_file(url, retries + 1, deadline, **kwargs)
         else:
             raise e
 
@@ -411,3 +424,14 @@ def _clear_progress(spaces: int = 100) -> None:
     if _print_progress_enabled:
         sys.stdout.write((" " * spaces) + "\r")
         sys.stdout.flush()
+
+
+def _reinitialize_after_fork() -> None:
+    global config_file_lock
+
+    # Another thread may have held the lock when the process forked, and that thread doesn't exist in the child
+    config_file_lock = threading.RLock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinitialize_after_fork)
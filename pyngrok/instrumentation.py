@@ -0,0 +1,250 @@
+__copyright__ = "Copyright (c) 2018-2025 Alex Laird"
+__license__ = "MIT"
+
+import logging
+import time
+from types import TracebackType
+from typing import Any, Dict, List, Optional, Type, Union
+
+from pyngrok.exception import PyngrokError
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """
+    An object describing a single instrumented ``pyngrok`` operation, passed to each registered
+    :class:`~pyngrok.instrumentation.InstrumentationHook` when the operation starts and ends.
+
+    The operations currently instrumented, by ``name``, are:
+
+    - ``api_request``: with ``method``, ``url``, ``path``, ``status_code``, ``request_bytes``, and
+      ``response_bytes`` attributes.
+    - ``start_process``: with ``ngrok_path``, ``pid``, and ``api_url`` attributes.
+    - ``install_ngrok``: with ``ngrok_path`` and ``downloaded`` attributes.
+    - ``capture_run_process``: with ``ngrok_path``, ``command``, ``returncode``, and ``output_bytes`` attributes.
+    - ``interpolate_tunnel_definition``: with ``config_version`` and ``tunnel_name`` attributes.
+    """
+
+    def __init__(self,
+                 name: str,
+                 attributes: Dict[str, Any]) -> None:
+        #: The name of the operation.
+        self.name: str = name
+        #: Details about the operation. Some are known when it starts, others are added as it runs.
+        self.attributes: Dict[str, Any] = attributes
+        #: The :py:func:`time.monotonic` time when the operation started.
+        self.start: Optional[float] = None
+        #: The duration of the operation, in seconds, once it has ended.
+        self.duration: Optional[float] = None
+        #: The exception raised by the operation, if it failed.
+        self.error: Optional[BaseException] = None
+        #: Storage for hooks to associate their own state with this span.
+        self.context: Dict[str, Any] = {}
+
+    def __repr__(self) -> str:
+        return f"<Span: \"{self.name}\">"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"Span: \"{self.name}\""
+
+    def set_attribute(self,
+                      key: str,
+                      value: Any) -> None:
+        """
+        Add or update an attribute on the span.
+
+        :param key: The attribute name.
+        :param value: The attribute value.
+        """
+        self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        self.start = time.monotonic()
+
+        for hook in list(_hooks):
+            try:
+                hook.on_start(self)
+            except Exception as e:
+                logger.warning(f"Instrumentation hook {hook} failed on start of \"{self.name}\": {e}")
+
+        return self
+
+    def __exit__(self,
+                 exc_type: Optional[Type[BaseException]],
+                 exc_value: Optional[BaseException],
+                 traceback: Optional[TracebackType]) -> None:
+        self.duration = time.monotonic() - self.start  # type: ignore
+        self.error = exc_value
+
+        for hook in list(_hooks):
+            try:
+                hook.on_end(self)
+            except Exception as e:
+                logger.warning(f"Instrumentation hook {hook} failed on end of \"{self.name}\": {e}")
+
+
+class _NoopSpan:
+    """
+    Returned by :func:`~pyngrok.instrumentation.span` when no hooks are registered, so instrumented code pays only
+    for a function call.
+    """
+
+    def set_attribute(self,
+                      key: str,
+                      value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self,
+                 exc_type: Optional[Type[BaseException]],
+                 exc_value: Optional[BaseException],
+                 traceback: Optional[TracebackType]) -> None:
+        pass
+
+
+class InstrumentationHook:
+    """
+    The base class for instrumentation hooks. Subclass it and override ``on_start`` and/or ``on_end``, then register
+    it with :func:`~pyngrok.instrumentation.add_hook`.
+
+    Hooks are called synchronously on the thread performing the operation, so they should be fast. An exception
+    raised by a hook is logged and otherwise ignored.
+
+    .. code-block:: python
+
+        from pyngrok import instrumentation
+
+        class PrintHook(instrumentation.InstrumentationHook):
+            def on_end(self, span):
+                print(f"{span.name} took {span.duration:.3f}s: {span.attributes}")
+
+        instrumentation.add_hook(PrintHook())
+    """
+
+    def on_start(self,
+                 span: Span) -> None:
+        """
+        Called when an instrumented operation starts.
+
+        :param span: The span of the operation.
+        """
+        pass
+
+    def on_end(self,
+               span: Span) -> None:
+        """
+        Called when an instrumented operation ends, whether it succeeded or raised.
+
+        :param span: The span of the operation, with ``duration`` and ``error`` populated.
+        """
+        pass
+
+
+class OpenTelemetryHook(InstrumentationHook):
+    """
+    An adapter that records each ``pyngrok`` span as an `OpenTelemetry <https://opentelemetry.io/>`_ span. Requires
+    the ``opentelemetry-api`` package, otherwise :class:`~pyngrok.exception.PyngrokError` is raised when it is
+    instantiated. If no ``tracer`` is given, one named ``pyngrok`` is used.
+
+    .. code-block:: python
+
+        from pyngrok import instrumentation
+
+        instrumentation.add_hook(instrumentation.OpenTelemetryHook())
+    """
+
+    def __init__(self,
+                 tracer: Any = None) -> None:
+        try:
+            from opentelemetry import trace  # type: ignore
+        except ImportError:
+            raise PyngrokError("OpenTelemetryHook requires the \"opentelemetry-api\" package to be installed")
+
+        self._trace = trace
+        #: The OpenTelemetry tracer spans are recorded with.
+        self.tracer: Any = tracer if tracer is not None else trace.get_tracer("pyngrok")
+
+    def on_start(self,
+                 span: Span) -> None:
+        span.context["opentelemetry_span"] = self.tracer.start_span(f"pyngrok.{span.name}",
+                                                                    attributes=_otel_attributes(span))
+
+    def on_end(self,
+               span: Span) -> None:
+        otel_span = span.context.pop("opentelemetry_span", None)
+        if otel_span is None:
+            return
+
+        otel_span.set_attributes(_otel_attributes(span))
+        if span.error is not None:
+            otel_span.record_exception(span.error)
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, str(span.error)))
+        otel_span.end()
+
+
+_hooks: List[InstrumentationHook] = []
+
+_OTEL_ATTRIBUTE_NAMES = {
+    "method": "http.request.method",
+    "url": "url.full",
+    "path": "url.path",
+    "status_code": "http.response.status_code",
+    "request_bytes": "http.request.body.size",
+    "response_bytes": "http.response.body.size",
+}
+
+
+def add_hook(hook: InstrumentationHook) -> None:
+    """
+    Register a hook to be called as instrumented operations start and end. Registering the same hook more than once
+    has no additional effect.
+
+    :param hook: The hook to register.
+    """
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+
+def remove_hook(hook: InstrumentationHook) -> None:
+    """
+    Unregister a previously registered hook, if registered.
+
+    :param hook: The hook to unregister.
+    """
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def span(name: str,
+         **attributes: Any) -> Union[Span, _NoopSpan]:
+    """
+    Create a span for an operation, to be used as a context manager around it. When no hooks are registered, a
+    shared no-op span is returned instead.
+
+    :param name: The name of the operation.
+    :param attributes: Details about the operation known when it starts.
+    :return: The span.
+    """
+    if not _hooks:
+        return _NOOP_SPAN
+
+    return Span(name, attributes)
+
+
+def _otel_attributes(span: Span) -> Dict[str, Any]:
+    attributes = {}
+    for key, value in span.attributes.items():
+        if value is None:
+            continue
+        elif not isinstance(value, (str, bool, int, float)):
+            value = str(value)
+
+        attributes[_OTEL_ATTRIBUTE_NAMES.get(key, f"pyngrok.{key}")] = value
+
+    return attributes
+
+
+_NOOP_SPAN = _NoopSpan()
@@ -3,21 +3,28 @@
 __copyright__ = "Copyright (c) 2018-2025 Alex Laird"
 __license__ = "MIT"
 
+import hashlib
 import json
 import logging
 import os
 import socket
 import sys
+import threading
+import time
 import uuid
+import weakref
+from concurrent.futures import Future
 from http import HTTPStatus
 from typing import Any, Dict, List, Optional, Tuple, Union
 from urllib.error import HTTPError, URLError
-from urllib.parse import urlencode
+from urllib.parse import urlencode, urlparse
 from urllib.request import Request, urlopen
 
-from pyngrok import __version__, conf, installer, process
-from pyngrok.conf import PyngrokConfig
-from pyngrok.exception import PyngrokError, PyngrokNgrokHTTPError, PyngrokNgrokURLError, PyngrokSecurityError
+from pyngrok import __version__, codec, conf, installer, instrumentation, process
+from pyngrok.conf import PyngrokConfig, RetryPolicy
+from pyngrok.deadline import Deadline, resolve_deadline
+from pyngrok.exception import PyngrokDeadlineError, PyngrokError, PyngrokNgrokError, PyngrokNgrokHTTPError, \
+    PyngrokNgrokURLError, PyngrokSecurityError
 from pyngrok.installer import get_default_config
 from pyngrok.process import NgrokProcess
 
@@ -87,7 +94,8 @@ class NgrokTunnel:
         logger.info(f"Refreshing metrics for tunnel: {self.public_url}")
 
         data = api_request(f"{self.api_url}{self.uri}", method="GET",
-                           timeout=self.pyngrok_config.request_timeout)
+                           timeout=self.pyngrok_config.request_timeout,
+                           retry_policy=self.pyngrok_config.retry_policy)
 
         if "metrics" not in data:
             raise PyngrokError("The ngrok API did not return \"metrics\" in the response")
@@ -110,44 +118,86 @@ class NgrokApiResponse:
         self.data: Optional[Dict[str, Any]] = data
 
     @staticmethod
-    def from_body(body: str) -> "NgrokApiResponse":
+    def from_body(body: Union[str, bytes]) -> "NgrokApiResponse":
         """
         Construct an object from a response body.
 
         :param body: The response body to be parsed.
         :return: The constructed object.
         """
+        if isinstance(body, bytes):
+            json_starts = body.find(b"{")
+
+            if json_starts < 0:
+                return NgrokApiResponse(body.decode("utf-8"), None)
+            else:
+                # Parse the JSON through a view, rather than copying it out of the body
+                return NgrokApiResponse(body[:json_starts].decode("utf-8"),
+                                        codec.loads(memoryview(body)[json_starts:]))
+
         json_starts = body.find("{")
 
         if json_starts < 0:
             return NgrokApiResponse(body, None)
         else:
-            return NgrokApiResponse(body[:json_starts], json.loads(body[json_starts:]))
+            return NgrokApiResponse(body[:json_starts], codec.loads(body[json_starts:]))
 
 
 _current_tunnels: Dict[str, NgrokTunnel] = {}
+# Every tunnel object handed to a caller, so those still held can be updated when a restart changes their URL
+_issued_tunnels: "weakref.WeakSet[NgrokTunnel]" = weakref.WeakSet()
+
+_API_COLLECTIONS = ("/api/tunnels", "/api/endpoints", "/api/requests/http")
+
+# Held while looking up, then creating, a reusable tunnel, so identical concurrent connect()'s share one tunnel. There
+# is one per ngrok_path and definition hash, so different tunnels are still created concurrently.
+_reuse_locks: Dict[Tuple[str, str], threading.Lock] = {}
+# Guards _reuse_locks, and is only held to look up a lock, never across a request
+_reuse_locks_lock = threading.Lock()
+
+
+def _reinitialize_after_fork() -> None:
+    global _reuse_locks_lock
+
+    # A forked child rebuilds its own view of the tunnels from ngrok's API
+    _current_tunnels.clear()
+    _issued_tunnels.clear()
+    _reuse_locks.clear()
+    _reuse_locks_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinitialize_after_fork)
 
 
-def install_ngrok(pyngrok_config: Optional[PyngrokConfig] = None) -> None:
+def install_ngrok(pyngrok_config: Optional[PyngrokConfig] = None,
+                  deadline: Optional[Union[float, Deadline]] = None) -> None:
     """
     Download, install, and initialize ``ngrok`` for the given config. If ``ngrok`` and its default
     config is already installed, calling this method will do nothing.
 
     :param pyngrok_config: A ``pyngrok`` configuration to use when interacting with the ``ngrok`` binary,
         overriding :func:`~pyngrok.conf.get_default()`.
+    :param deadline: The overall deadline, or its budget in seconds, to download ``ngrok`` within.
+    :raises: :class:`~pyngrok.exception.PyngrokDeadlineError`: When the ``deadline`` is exhausted.
     """
     if pyngrok_config is None:
         pyngrok_config = conf.get_default()
+    deadline = resolve_deadline(deadline)
 
-    if not os.path.exists(pyngrok_config.ngrok_path):
-        installer.install_ngrok(pyngrok_config.ngrok_path, ngrok_version=pyngrok_config.ngrok_version)
+    with instrumentation.span("install_ngrok", ngrok_path=pyngrok_config.ngrok_path) as span:
+        downloaded = not os.path.exists(pyngrok_config.ngrok_path)
+        span.set_attribute("downloaded", downloaded)
+        if downloaded:
+            installer.install_ngrok(pyngrok_config.ngrok_path, ngrok_version=pyngrok_config.ngrok_version,
+                                    deadline=deadline)
 
-    config_path = conf.get_config_path(pyngrok_config)
+        config_path = conf.get_config_path(pyngrok_config)
 
-    # Install the config to the requested path
-    with installer.config_file_lock:
-        if not os.path.exists(config_path):
-            installer.install_default_config(config_path, ngrok_version=pyngrok_config.ngrok_version)
+        # Install the config to the requested path
+        with installer.config_file_lock:
+            if not os.path.exists(config_path):
+                installer.install_default_config(config_path, ngrok_version=pyngrok_config.ngrok_version)
 
 
 def set_auth_token(token: str,
@@ -192,7 +242,8 @@ def set_api_key(key: str,
     process.set_api_key(pyngrok_config, key)
 
 
-def get_ngrok_process(pyngrok_config: Optional[PyngrokConfig] = None) -> NgrokProcess:
+def get_ngrok_process(pyngrok_config: Optional[PyngrokConfig] = None,
+                      deadline: Optional[Union[float, Deadline]] = None) -> NgrokProcess:
     """
     Get the current ``ngrok`` process for the given config's ``ngrok_path``.
 
@@ -207,21 +258,67 @@ def get_ngrok_process(pyngrok_config: Optional[PyngrokConfig] = None) -> NgrokPr
 
     :param pyngrok_config: A ``pyngrok`` configuration to use when interacting with the ``ngrok`` binary,
         overriding :func:`~pyngrok.conf.get_default()`.
+    :param deadline: The overall deadline, or its budget in seconds, shared by installing and starting ``ngrok``.
     :return: The ``ngrok`` process.
+    :raises: :class:`~pyngrok.exception.PyngrokDeadlineError`: When the ``deadline`` is exhausted.
+    """
+    if pyngrok_config is None:
+        pyngrok_config = conf.get_default()
+
+    deadline = resolve_deadline(deadline)
+
+    install_ngrok(pyngrok_config, deadline)
+
+    return process.get_process(pyngrok_config, deadline)
+
+
+def prewarm(pyngrok_config: Optional[PyngrokConfig] = None) -> "Future[NgrokProcess]":
+    """
+    Start the ``ngrok`` process for the given config's ``ngrok_path`` in the background, so the first
+    :func:`~pyngrok.ngrok.connect` (or any other method that needs the process) does not have to wait for it to
+    start. Call this as early as possible, for instance at import or when an app boots. Methods that need the process
+    while it is still starting will wait for the in-flight startup rather than starting a second process.
+
+    If ``ngrok`` is not installed at :class:`~pyngrok.conf.PyngrokConfig`'s ``ngrok_path``, calling this method
+    will first download and install ``ngrok``. This happens before returning.
+
+    :param pyngrok_config: A ``pyngrok`` configuration to use when interacting with the ``ngrok`` binary,
+        overriding :func:`~pyngrok.conf.get_default()`.
+    :return: A future that resolves to the ``ngrok`` process, or to the error raised if it could not start.
     """
     if pyngrok_config is None:
         pyngrok_config = conf.get_default()
 
     install_ngrok(pyngrok_config)
 
-    return process.get_process(pyngrok_config)
+    return process.prewarm(pyngrok_config)
 
 
 def _interpolate_tunnel_definition(pyngrok_config: PyngrokConfig,
                                    options: Dict[str, Any],
                                    addr: Optional[str] = None,
                                    proto: Optional[Union[str, int]] = None,
-                                   name: Optional[str] = None) -> None:
+                                   name: Optional[str] = None) -> bool:
+    with instrumentation.span("interpolate_tunnel_definition",
+                              config_version=pyngrok_config.config_version) as span:
+        generated_name = _interpolate_tunnel_definition_options(pyngrok_config, options, addr, proto, name)
+
+        span.set_attribute("tunnel_name", options.get("name"))
+
+    return generated_name
+
+
+def _interpolate_tunnel_definition_options(pyngrok_config: PyngrokConfig,
+                                           options: Dict[str, Any],
+                                           addr: Optional[str] = None,
+                                           proto: Optional[Union[str, int]] = None,
+                                           name: Optional[str] = None) -> bool:
+    """
+    Merge the matching definition from ``ngrok``'s config file, if any, in to the given options, and fill in the
+    tunnel's name, address, and protocol (or upstream, for v3).
+
+    :return: Whether the tunnel's name was generated, rather than given or taken from a definition.
+    """
     addr_provided = addr is not None
     proto_provided = proto is not None
     user_upstream_provided = "upstream" in options
@@ -278,6 +375,7 @@ def _interpolate_tunnel_definition(pyngrok_config: PyngrokConfig,
     if not proto:
         proto = "http"
 
+    generated_name = not name
     if not name:
         if not addr.startswith("file://"):
             name = f"{proto}-{addr}-{uuid.uuid4()}"
@@ -299,6 +397,26 @@ def _interpolate_tunnel_definition(pyngrok_config: PyngrokConfig,
         options["addr"] = addr
         options["proto"] = proto
 
+    return generated_name
+
+
+def _tunnel_spec_hash(options: Dict[str, Any],
+                      generated_name: bool) -> str:
+    """
+    Hash the given normalized tunnel options, so identical definitions can be recognized. A generated name is
+    unique to each call, so it is left out.
+
+    :param options: The normalized tunnel options.
+    :param generated_name: Whether the tunnel's name was generated.
+    :return: The hash.
+    """
+    hashed = {k: v for k, v in options.items() if not (generated_name and k == "name")}
+
+    # The stdlib's json, rather than pyngrok.codec, on purpose: hashes are saved in a persistent process's state
+    # file and compared across Python processes, so the encoding must not change with the codec in use, and not
+    # every codec can sort keys or encode arbitrary values as str
+    return hashlib.sha256(json.dumps(hashed, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
 
 def _upgrade_legacy_params(pyngrok_config: PyngrokConfig,
                            options: Dict[str, Any]) -> None:
@@ -327,6 +445,8 @@ def connect(addr: Optional[str] = None,
             proto: Optional[Union[str, int]] = None,
             name: Optional[str] = None,
             pyngrok_config: Optional[PyngrokConfig] = None,
+            deadline: Optional[Union[float, Deadline]] = None,
+            reuse: bool = False,
             **options: Any) -> NgrokTunnel:
     """
     Establish a new ``ngrok`` tunnel for the given protocol to the given port, returning an object representing
@@ -351,6 +471,15 @@ def connect(addr: Optional[str] = None,
     If ``ngrok`` is not running, calling this method will first start a process with
     :class:`~pyngrok.conf.PyngrokConfig`.
 
+    With a ``deadline``, installing ``ngrok``, starting its process, and creating the tunnel all share its one
+    budget, rather than each being bounded only by its own timeout.
+
+    With ``reuse``, calling this method again with the same arguments, for instance from a re-run notebook cell,
+    returns the tunnel the first call created, if it is still open, rather than creating another. Tunnels are
+    matched on their definition after it is normalized, ignoring the name generated when no ``name`` is given.
+    This is always the case when ``persist`` is set in :class:`~pyngrok.conf.PyngrokConfig`, so a dev server that
+    calls this method on boot gets the same tunnel back after each reload.
+
     :param addr: The local port to which the tunnel will forward traffic, or a
         `local directory or network address <https://ngrok.com/docs/http/#file-serving>`_,
         defaults to "80".
@@ -358,6 +487,8 @@ def connect(addr: Optional[str] = None,
     :param name: A friendly name for the tunnel, or the name of a definition in ``ngrok``'s config file.
     :param pyngrok_config: A ``pyngrok`` configuration to use when interacting with the ``ngrok`` binary,
         overriding :func:`~pyngrok.conf.get_default()`.
+    :param deadline: The overall deadline, or its budget in seconds, to connect within.
+    :param reuse: Return an open tunnel previously created with the same definition, if there is one.
     :param options: Remaining ``kwargs`` are passed as configuration for the ``ngrok`` agent
         (see the `v2 <https://ngrok.com/docs/agent/config/v2/>`_ or
         `v3 <https://ngrok.com/docs/agent/config/v3/>`_ schema).
@@ -365,9 +496,11 @@ def connect(addr: Optional[str] = None,
     :raises: :class:`~pyngrok.exception.PyngrokError`: When the tunnel definition is invalid, the requested
         options are incompatible with the configured ``config_version``, or the response does not contain
         ``public_url``.
+    :raises: :class:`~pyngrok.exception.PyngrokDeadlineError`: When the ``deadline`` is exhausted.
     """
     if pyngrok_config is None:
         pyngrok_config = conf.get_default()
+    deadline = resolve_deadline(deadline)
 
     if pyngrok_config.config_version != "3":
         v3_only = sorted(k for k in ("upstream", "bindings") if k in options)
@@ -376,33 +509,170 @@ def connect(addr: Optional[str] = None,
                 f"Options {v3_only} require config_version=\"3\". Set "
                 f"PyngrokConfig.config_version=\"3\" to use these.")
 
-    _interpolate_tunnel_definition(pyngrok_config, options, addr, proto, name)
-
-    name = options.get("name")
+    generated_name = _interpolate_tunnel_definition(pyngrok_config, options, addr, proto, name)
 
     _upgrade_legacy_params(pyngrok_config, options)
 
+    if not reuse and not pyngrok_config.persist:
+        return _create_tunnel(pyngrok_config, get_ngrok_process(pyngrok_config, deadline), options, deadline)
+
+    spec_hash = _tunnel_spec_hash(options, generated_name)
+    ngrok_process = get_ngrok_process(pyngrok_config, deadline)
+    with _get_reuse_lock(pyngrok_config.ngrok_path, spec_hash):
+        reused_tunnel = _get_reusable_tunnel(pyngrok_config, ngrok_process, spec_hash, deadline)
+        if reused_tunnel is not None:
+            return reused_tunnel
+
+        tunnel = _create_tunnel(pyngrok_config, ngrok_process, options, deadline)
+        if tunnel.name is not None:
+            ngrok_process._tunnel_spec_hashes[spec_hash] = tunnel.name
+            process._save_tunnel_state(ngrok_process)
+
+        return tunnel
+
+
+def _get_reuse_lock(ngrok_path: str,
+                    spec_hash: str) -> threading.Lock:
+    with _reuse_locks_lock:
+        return _reuse_locks.setdefault((ngrok_path, spec_hash), threading.Lock())
+
+
+def _create_tunnel(pyngrok_config: PyngrokConfig,
+                   ngrok_process: NgrokProcess,
+                   options: Dict[str, Any],
+                   deadline: Optional[Deadline]) -> NgrokTunnel:
+    name = options.get("name")
     api_path = "/api/endpoints" if pyngrok_config.config_version == "3" else "/api/tunnels"
 
     logger.info(f"Opening tunnel named: {name}")
 
-    api_url = get_ngrok_process(pyngrok_config).api_url
+    api_url = ngrok_process.api_url
 
     logger.debug(f"Creating tunnel with options: {options}")
 
     tunnel = NgrokTunnel(api_request(f"{api_url}{api_path}", method="POST", data=options,
-                                     timeout=pyngrok_config.request_timeout),
+                                     timeout=pyngrok_config.request_timeout,
+                                     retry_policy=pyngrok_config.retry_policy,
+                                     deadline=deadline),
                          pyngrok_config, api_url)
 
     if tunnel.public_url is None:
         raise PyngrokError(
             f"\"public_url\" was not populated for tunnel {tunnel}, but is required for pyngrok to function.")
 
-    _current_tunnels[tunnel.public_url] = tunnel
+    _track_tunnel(tunnel)
+    if tunnel.name is not None:
+        ngrok_process._tunnel_definitions[tunnel.name] = dict(options, name=tunnel.name)
 
     return tunnel
 
 
+def _get_reusable_tunnel(pyngrok_config: PyngrokConfig,
+                         ngrok_process: NgrokProcess,
+                         spec_hash: str,
+                         deadline: Optional[Deadline]) -> Optional[NgrokTunnel]:
+    """
+    Get the open tunnel that was created with the given hash, checking with ``ngrok`` that it is still open, which
+    is a ``GET`` of only that tunnel.
+
+    :param pyngrok_config: The ``pyngrok`` configuration to use when interacting with the ``ngrok`` binary.
+    :param ngrok_process: The ``ngrok`` process the tunnel was created on.
+    :param spec_hash: The hash of the tunnel's definition.
+    :param deadline: The overall deadline for the request.
+    :return: The tunnel, or ``None`` if there isn't one open.
+    """
+    name = ngrok_process._tunnel_spec_hashes.get(spec_hash)
+    if name is None:
+        return None
+
+    api_url = ngrok_process.api_url
+    uri = NgrokTunnel({"name": name}, pyngrok_config, api_url).uri
+    try:
+        tunnel = NgrokTunnel(api_request(f"{api_url}{uri}", method="GET",
+                                         timeout=pyngrok_config.request_timeout,
+                                         retry_policy=pyngrok_config.retry_policy,
+                                         deadline=deadline),
+                             pyngrok_config, api_url)
+    except PyngrokNgrokHTTPError as e:
+        if e.status_code != HTTPStatus.NOT_FOUND:
+            raise
+
+        tunnel = NgrokTunnel({}, pyngrok_config, api_url)
+
+    if tunnel.public_url is None:
+        logger.debug(f"Tunnel named {name} is no longer open, it will be re-created")
+
+        ngrok_process._tunnel_spec_hashes.pop(spec_hash, None)
+
+        return None
+
+    logger.info(f"Reusing tunnel named: {name}")
+
+    _track_tunnel(tunnel)
+
+    return tunnel
+
+
+def _track_tunnel(tunnel: NgrokTunnel) -> None:
+    _current_tunnels[str(tunnel.public_url)] = tunnel
+    _issued_tunnels.add(tunnel)
+
+
+def _restore_tunnels(ngrok_process: NgrokProcess) -> Dict[str, str]:
+    """
+    Re-create the tunnels opened with :func:`~pyngrok.ngrok.connect` on the given supervised ``ngrok`` process
+    after it was restarted. They come back with new public URLs, so ``pyngrok``'s registry of active tunnels is
+    rebuilt from the responses, and the :class:`~pyngrok.ngrok.NgrokTunnel` objects callers still hold are
+    updated in place.
+
+    :param ngrok_process: The restarted ``ngrok`` process.
+    :return: The new public URLs of the re-created tunnels, by their public URL before the restart.
+    """
+    pyngrok_config = ngrok_process.pyngrok_config
+    ngrok_path = pyngrok_config.ngrok_path
+    api_url = ngrok_process.api_url
+    api_path = "/api/endpoints" if pyngrok_config.config_version == "3" else "/api/tunnels"
+
+    # None of the process's tunnels survived the restart
+    stale_tunnels = [t for t in _issued_tunnels if t.pyngrok_config.ngrok_path == ngrok_path]
+    for public_url, tunnel in list(_current_tunnels.items()):
+        if tunnel.pyngrok_config.ngrok_path == ngrok_path:
+            _current_tunnels.pop(public_url, None)
+
+    public_urls = {}
+    for name, options in list(ngrok_process._tunnel_definitions.items()):
+        logger.debug(f"Re-creating tunnel named: {name}")
+
+        try:
+            tunnel = NgrokTunnel(api_request(f"{api_url}{api_path}", method="POST", data=options,
+                                             timeout=pyngrok_config.request_timeout,
+                                             retry_policy=pyngrok_config.retry_policy),
+                                 pyngrok_config, api_url)
+        except PyngrokError as e:
+            logger.warning(f"Tunnel named {name} could not be re-created: {e}")
+
+            continue
+
+        if tunnel.public_url is None:
+            logger.warning(f"Tunnel named {name} was re-created without a \"public_url\"")
+
+            continue
+
+        _track_tunnel(tunnel)
+
+        for stale_tunnel in stale_tunnels:
+            if stale_tunnel.name == name and stale_tunnel.public_url != tunnel.public_url:
+                logger.info(f"Tunnel named {name} moved from {stale_tunnel.public_url} to {tunnel.public_url}")
+
+                public_urls[str(stale_tunnel.public_url)] = tunnel.public_url
+                vars(stale_tunnel).update(vars(tunnel))
+
+    return public_urls
+
+
+process._tunnel_restorer = _restore_tunnels
+
+
 def disconnect(public_url: str,
                pyngrok_config: Optional[PyngrokConfig] = None) -> None:
     """
@@ -424,7 +694,8 @@ def disconnect(public_url: str,
 
         return
 
-    api_url = get_ngrok_process(pyngrok_config).api_url
+    ngrok_process = get_ngrok_process(pyngrok_config)
+    api_url = ngrok_process.api_url
 
     if public_url not in _current_tunnels:
         get_tunnels(pyngrok_config)
@@ -438,12 +709,20 @@ def disconnect(public_url: str,
     logger.info(f"Disconnecting tunnel: {tunnel.public_url}")
 
     api_request(f"{api_url}{tunnel.uri}", method="DELETE",
-                timeout=pyngrok_config.request_timeout)
+                timeout=pyngrok_config.request_timeout,
+                retry_policy=pyngrok_config.retry_policy)
 
     _current_tunnels.pop(public_url, None)
+    if tunnel.name is not None:
+        ngrok_process._tunnel_definitions.pop(tunnel.name, None)
+        for spec_hash, name in list(ngrok_process._tunnel_spec_hashes.items()):
+            if name == tunnel.name:
+                ngrok_process._tunnel_spec_hashes.pop(spec_hash, None)
+        process._save_tunnel_state(ngrok_process)
 
 
-def get_tunnels(pyngrok_config: Optional[PyngrokConfig] = None) -> List[NgrokTunnel]:
+def get_tunnels(pyngrok_config: Optional[PyngrokConfig] = None,
+                deadline: Optional[Union[float, Deadline]] = None) -> List[NgrokTunnel]:
     """
     Get a list of active ``ngrok`` tunnels for the given config's ``ngrok_path``.
 
@@ -455,15 +734,42 @@ def get_tunnels(pyngrok_config: Optional[PyngrokConfig] = None) -> List[NgrokTun
 
     :param pyngrok_config: A ``pyngrok`` configuration to use when interacting with the ``ngrok`` binary,
         overriding :func:`~pyngrok.conf.get_default()`.
+    :param deadline: The overall deadline, or its budget in seconds, shared by installing and starting ``ngrok``
+        and listing its tunnels.
     :return: The active ``ngrok`` tunnels.
     :raises: :class:`~pyngrok.exception.PyngrokError`: When the response was invalid or does not
         contain ``public_url``.
+    :raises: :class:`~pyngrok.exception.PyngrokDeadlineError`: When the ``deadline`` is exhausted.
     """
     if pyngrok_config is None:
         pyngrok_config = conf.get_default()
+    deadline = resolve_deadline(deadline)
+
+    api_url = get_ngrok_process(pyngrok_config, deadline).api_url
+
+    tunnels = _fetch_tunnels(pyngrok_config, api_url, deadline)
+
+    _current_tunnels.clear()
+    for ngrok_tunnel in tunnels:
+        _track_tunnel(ngrok_tunnel)
+
+    return list(_current_tunnels.values())
 
-    api_url = get_ngrok_process(pyngrok_config).api_url
 
+def _fetch_tunnels(pyngrok_config: PyngrokConfig,
+                   api_url: Optional[str],
+                   deadline: Optional[Deadline] = None) -> List[NgrokTunnel]:
+    """
+    List the tunnels from the ``ngrok`` web interface at the given API URL, without updating ``pyngrok``'s
+    registry of active tunnels.
+
+    :param pyngrok_config: The ``pyngrok`` configuration to use when interacting with the ``ngrok`` binary.
+    :param api_url: The API URL for the ``ngrok`` web interface.
+    :param deadline: The overall deadline for the request.
+    :return: The active ``ngrok`` tunnels.
+    :raises: :class:`~pyngrok.exception.PyngrokError`: When the response was invalid or does not
+        contain ``public_url``.
+    """
     list_keys: Tuple[str, ...]
     if pyngrok_config.config_version == "3":
         api_path = "/api/endpoints"
@@ -473,10 +779,12 @@ def get_tunnels(pyngrok_config: Optional[PyngrokConfig] = None) -> List[NgrokTun
         list_keys = ("tunnels",)
 
     response = api_request(f"{api_url}{api_path}", method="GET",
-                           timeout=pyngrok_config.request_timeout)
+                           timeout=pyngrok_config.request_timeout,
+                           retry_policy=pyngrok_config.retry_policy,
+                           deadline=deadline)
     items: List[Dict[str, Any]] = next((response[k] for k in list_keys if response.get(k) is not None), [])
 
-    _current_tunnels.clear()
+    tunnels = []
     for tunnel in items:
         ngrok_tunnel = NgrokTunnel(tunnel, pyngrok_config, api_url)
 
@@ -485,9 +793,9 @@ def get_tunnels(pyngrok_config: Optional[PyngrokConfig] = None) -> List[NgrokTun
                 f"\"public_url\" was not populated for tunnel {ngrok_tunnel}, "
                 f"but is required for pyngrok to function.")
 
-        _current_tunnels[ngrok_tunnel.public_url] = ngrok_tunnel
+        tunnels.append(ngrok_tunnel)
 
-    return list(_current_tunnels.values())
+    return tunnels
 
 
 def kill(pyngrok_config: Optional[PyngrokConfig] = None) -> None:
@@ -574,10 +882,16 @@ def api_request(url: str,
                 data: Optional[Dict[str, Any]] = None,
                 params: Optional[Dict[str, Any]] = None,
                 timeout: float = 4,
-                auth: Optional[str] = None) -> Dict[str, Any]:
+                auth: Optional[str] = None,
+                retry_policy: Optional[RetryPolicy] = None,
+                deadline: Optional[Union[float, Deadline]] = None) -> Dict[str, Any]:
     """
     Invoke an API request to the given URL, returning JSON data from the response.
 
+    With a ``retry_policy``, failed requests that are safe to retry are retried, as described by
+    :class:`~pyngrok.conf.RetryPolicy`, until the policy's ``max_attempts`` or ``total_timeout`` is reached.
+    With a ``deadline``, each attempt's ``timeout``, and any retries, are also capped to what is left of it.
+
     One use for this method is making requests to ``ngrok`` tunnels:
 
     .. code-block:: python
@@ -604,10 +918,13 @@ def api_request(url: str,
     :param params: The URL parameters.
     :param timeout: The request timeout, in seconds.
     :param auth: Set as Bearer for an Authorization header.
+    :param retry_policy: The policy for retrying the request if it fails.
+    :param deadline: The overall deadline, or its budget in seconds, to make the request within.
     :return: The response from the request.
     :raises: :class:`~pyngrok.exception.PyngrokSecurityError`: When the ``url`` is not supported.
     :raises: :class:`~pyngrok.exception.PyngrokNgrokHTTPError`: When the request returns an error response.
     :raises: :class:`~pyngrok.exception.PyngrokNgrokURLError`: When the request times out.
+    :raises: :class:`~pyngrok.exception.PyngrokDeadlineError`: When the ``deadline`` is exhausted.
     """
     if params is None:
         params = {}
@@ -615,7 +932,7 @@ def api_request(url: str,
     if not url.lower().startswith("http"):
         raise PyngrokSecurityError(f"URL must start with \"http\": {url}")
 
-    encoded_data = json.dumps(data).encode("utf-8") if data else None
+    encoded_data = codec.dumps(data) if data else None
 
     if params:
         url += f"?{urlencode([(x, params[x]) for x in params])}"
@@ -628,33 +945,127 @@ def api_request(url: str,
 
     logger.debug(f"Making {method} request to {url} with data: {data}")
 
+    deadline = resolve_deadline(deadline)
+    if retry_policy is None:
+        return _send_api_request(request, encoded_data, timeout, deadline)
+
+    endpoint = f"{request.get_method()} {_api_route(url)}"
+    retry_until = time.monotonic() + retry_policy.total_timeout
+    if deadline is not None:
+        retry_until = min(retry_until, deadline.expires_at)
+    attempt = 1
+    while True:
+        try:
+            # Don't let an attempt run past the policy's budget for the whole request
+            return _send_api_request(request, encoded_data,
+                                     min(timeout, max(retry_until - time.monotonic(), 0.01)), deadline)
+        except (PyngrokNgrokHTTPError, PyngrokNgrokURLError) as e:
+            delay = retry_policy.get_delay(attempt)
+            if attempt >= retry_policy.max_attempts or \
+                    not _is_retryable(e, request.get_method(), retry_policy) or \
+                    time.monotonic() + delay >= retry_until:
+                raise
+
+            logger.debug(f"Retrying {endpoint} in {delay:.3f} seconds, attempt {attempt} failed: {e}")
+
+            retry_policy.record_retry(endpoint)
+            time.sleep(delay)
+            attempt += 1
+
+
+def _send_api_request(request: Request,
+                      encoded_data: Optional[bytes],
+                      timeout: float,
+                      deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+    if deadline is None:
+        return _send_api_request_once(request, encoded_data, timeout)
+
+    stage = f"{request.get_method()} {_api_route(request.full_url)}"
     try:
-        response = urlopen(request, encoded_data, timeout)
-        response_data = response.read().decode("utf-8")
-
-        status_code = response.getcode()
-        logger.debug(f"Response {status_code}: {response_data.strip()}")
-
-        if str(status_code)[0] != "2":
-            raise PyngrokNgrokHTTPError(f"ngrok client API returned {status_code}: {response_data}", url,
-                                        status_code, None, request.headers, response_data)
-        elif status_code == HTTPStatus.NO_CONTENT:
-            return {}
+        return _send_api_request_once(request, encoded_data, deadline.cap(timeout, stage))
+    except PyngrokNgrokURLError as e:
+        if deadline.expired:
+            raise PyngrokDeadlineError(f"The deadline of {deadline.timeout} seconds was exceeded during "
+                                       f"{stage}: {e}", stage)
+        raise
+
+
+def _send_api_request_once(request: Request,
+                           encoded_data: Optional[bytes],
+                           timeout: float) -> Dict[str, Any]:
+    url = request.full_url
+    method = request.get_method()
+
+    with instrumentation.span("api_request", method=method, url=url, path=urlparse(url).path,
+                              request_bytes=len(encoded_data) if encoded_data else 0) as span:
+        try:
+            response = urlopen(request, encoded_data, timeout)
+            raw_response = response.read()
+
+            status_code = response.getcode()
+            span.set_attribute("status_code", status_code)
+            span.set_attribute("response_bytes", len(raw_response))
+            # Large responses are parsed straight from bytes, so only decode them to log when debugging
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Response {status_code}: {raw_response.decode('utf-8').strip()}")
+
+            if str(status_code)[0] != "2":
+                response_data = raw_response.decode("utf-8")
+                raise PyngrokNgrokHTTPError(f"ngrok client API returned {status_code}: {response_data}", url,
+                                            status_code, None, request.headers, response_data)
+            elif status_code == HTTPStatus.NO_CONTENT:
+                return {}
+
+            return codec.loads(raw_response)  # type: ignore
+        except socket.timeout:
+            raise PyngrokNgrokURLError("ngrok client exception, URLError: timed out", "timed out")
+        except HTTPError as e:
+            raw_response = e.read()
+            response_data = raw_response.decode("utf-8")
+
+            status_code = e.code
+            span.set_attribute("status_code", status_code)
+            span.set_attribute("response_bytes", len(raw_response))
+            logger.debug(f"Response {status_code}: {response_data.strip()}")
+
+            raise PyngrokNgrokHTTPError(f"ngrok client exception, API returned {status_code}: {response_data}",
+                                        e.url,
+                                        status_code, e.reason, e.headers, response_data)
+        except URLError as e:
+            raise PyngrokNgrokURLError(f"ngrok client exception, URLError: {e.reason}", e.reason)
+
+
+def _is_retryable(error: PyngrokNgrokError,
+                  method: str,
+                  retry_policy: RetryPolicy) -> bool:
+    # The connection was never established, so the request was never sent, and is safe to retry regardless of method
+    if isinstance(error, PyngrokNgrokURLError) and isinstance(error.reason, (ConnectionRefusedError, socket.gaierror)):
+        return True
+    elif method not in retry_policy.retry_methods:
+        return False
+    elif isinstance(error, PyngrokNgrokHTTPError):
+        return error.status_code in retry_policy.retry_status_codes
+
+    return True
+
+
+def _api_route(url: str) -> str:
+    """
+    Reduce the given URL to a low-cardinality route, so that, for instance, every tunnel's ``uri`` is recorded as
+    ``/api/tunnels/{name}``.
 
-        return json.loads(response_data)  # type: ignore
-    except socket.timeout:
-        raise PyngrokNgrokURLError("ngrok client exception, URLError: timed out", "timed out")
-    except HTTPError as e:
-        response_data = e.read().decode("utf-8")
+    :param url: The request URL.
+    :return: The route.
+    """
+    path = urlparse(url).path.rstrip("/")
 
-        status_code = e.code
-        logger.debug(f"Response {status_code}: {response_data.strip()}")
+    for collection in _API_COLLECTIONS:
+        if path == collection:
+            return path
+        elif path.startswith(f"{collection}/"):
+            return f"{collection}/{{id}}"
 
-        raise PyngrokNgrokHTTPError(f"ngrok client exception, API returned {status_code}: {response_data}",
-                                    e.url,
-                                    status_code, e.reason, e.headers, response_data)
-    except URLError as e:
-        raise PyngrokNgrokURLError(f"ngrok client exception, URLError: {e.reason}", e.reason)
+    return path if path == "/api/status" else "other"
 
 
 def run(args: Optional[List[str]] = None,
@@ -688,7 +1099,14 @@ def main() -> None:
     This method is meant for interacting with ``ngrok`` from the command line and is not necessarily
     compatible with non-blocking API methods. For that, use :mod:`~pyngrok.ngrok`'s interface methods (like
     :func:`~pyngrok.ngrok.connect`), or use :func:`~pyngrok.process.get_process`.
+
+    ``pyngrok daemon`` is handled by :func:`~pyngrok.daemon.main` instead of being passed to ``ngrok``.
     """
+    if sys.argv[1:2] == ["daemon"]:
+        from pyngrok import daemon
+
+        sys.exit(daemon.main(sys.argv[2:]))
+
     run(sys.argv[1:])
 
     if len(sys.argv) == 1 or len(sys.argv) == 2 and sys.argv[1].lstrip("-").lstrip("-") == "help":
@@ -0,0 +1,361 @@
+__copyright__ = "Copyright (c) 2018-2025 Alex Laird"
+__license__ = "MIT"
+
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, Optional, Union
+
+from pyngrok import conf, ngrok
+from pyngrok.conf import PyngrokConfig
+from pyngrok.exception import PyngrokError
+from pyngrok.ngrok import NgrokTunnel
+
+logger = logging.getLogger(__name__)
+
+#: The default max number of tunnels a :class:`~pyngrok.pool.TunnelPool` creates at once.
+DEFAULT_MAX_CONCURRENT_CREATES = 2
+
+
+class PoolStats:
+    """
+    An object containing a snapshot of a :class:`~pyngrok.pool.TunnelPool`'s usage. Times are in seconds.
+    """
+
+    def __init__(self,
+                 size: int,
+                 in_use: int,
+                 leases: int,
+                 total_wait_time: float,
+                 max_wait_time: float,
+                 utilization: float,
+                 creates: int,
+                 repoints: int,
+                 recycles: int) -> None:
+        #: The number of tunnels in the pool.
+        self.size: int = size
+        #: The number of tunnels currently leased.
+        self.in_use: int = in_use
+        #: The number of leases made.
+        self.leases: int = leases
+        #: The total time callers waited for a tunnel, including any time spent repointing it.
+        self.total_wait_time: float = total_wait_time
+        #: The longest time a caller waited for a tunnel.
+        self.max_wait_time: float = max_wait_time
+        #: The fraction, from 0 to 1, of the pool's tunnel time that was leased out since the pool started.
+        self.utilization: float = utilization
+        #: The number of tunnels created, including when they were repointed or recycled.
+        self.creates: int = creates
+        #: The number of times a tunnel was re-created to point at a different ``addr``.
+        self.repoints: int = repoints
+        #: The number of times a tunnel was re-created on release.
+        self.recycles: int = recycles
+
+    @property
+    def mean_wait_time(self) -> float:
+        """
+        The mean time callers waited for a tunnel.
+        """
+        return self.total_wait_time / self.leases if self.leases else 0.0
+
+    def __repr__(self) -> str:
+        return f"<PoolStats: in_use={self.in_use}/{self.size} utilization={self.utilization:.3f}>"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"PoolStats: in_use={self.in_use}/{self.size} utilization={self.utilization:.3f}"
+
+
+class _PoolSlot:
+    def __init__(self,
+                 name: str) -> None:
+        self.name = name
+        self.addr: Optional[str] = None
+        self.tunnel: Optional[NgrokTunnel] = None
+        self.leased_at: Optional[float] = None
+
+
+class TunnelPool:
+    """
+    A pool of ``ngrok`` tunnels that are created up front and leased to callers, so that, for instance, the tests
+    in an end-to-end suite each get a tunnel without waiting on ``ngrok`` to create and delete one.
+
+    Tunnels are leased with :func:`~pyngrok.pool.TunnelPool.lease`. A lease for a different ``addr`` than its
+    tunnel currently points at repoints the tunnel, by re-creating it, so leases for the pool's own ``addr`` are the
+    cheapest. Every tunnel the pool creates, whether up front or when one is repointed or recycled, is created
+    by a worker pool of at most ``max_concurrent_creates`` threads.
+
+    .. code-block:: python
+
+        from pyngrok.pool import TunnelPool
+
+        pool = TunnelPool(4, "5000")
+
+        with pool.lease() as tunnel:
+            print(f"Testing against {tunnel.public_url}")
+
+        print(pool.stats())
+        pool.close()
+    """
+
+    def __init__(self,
+                 size: int,
+                 addr: Optional[str] = None,
+                 proto: Optional[Union[str, int]] = None,
+                 pyngrok_config: Optional[PyngrokConfig] = None,
+                 max_concurrent_creates: int = DEFAULT_MAX_CONCURRENT_CREATES,
+                 name_prefix: Optional[str] = None,
+                 **options: Any) -> None:
+        if size < 1:
+            raise ValueError("\"size\" must be at least 1.")
+        if max_concurrent_creates < 1:
+            raise ValueError("\"max_concurrent_creates\" must be at least 1.")
+
+        #: The number of tunnels in the pool.
+        self.size: int = size
+        #: The local port or address the pool's tunnels forward to, unless a lease repoints one.
+        self.addr: Optional[str] = addr
+        #: The tunnel protocol.
+        self.proto: Optional[Union[str, int]] = proto
+        #: The ``pyngrok`` configuration to use when interacting with the ``ngrok`` binary.
+        self.pyngrok_config: PyngrokConfig = pyngrok_config if pyngrok_config is not None else conf.get_default()
+        #: The max number of tunnels created at once.
+        self.max_concurrent_creates: int = max_concurrent_creates
+        #: The remaining configuration for the ``ngrok`` agent, passed to :func:`~pyngrok.ngrok.connect`.
+        self.options: Dict[str, Any] = options
+
+        prefix = name_prefix or f"pyngrok-pool-{uuid.uuid4().hex[:8]}"
+        self._slots = [_PoolSlot(f"{prefix}-{i}") for i in range(size)]
+        self._idle: Deque[_PoolSlot] = deque()
+        self._condition = threading.Condition()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._started_at: Optional[float] = None
+        self._closed = False
+
+        self._leases = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._busy_time = 0.0
+        self._creates = 0
+        self._repoints = 0
+        self._recycles = 0
+
+    def start(self) -> None:
+        """
+        Create the pool's tunnels, waiting for all of them. If the pool is already started, nothing will be done.
+
+        :raises: :class:`~pyngrok.exception.PyngrokError`: When a tunnel could not be created.
+        """
+        with self._condition:
+            if self._closed:
+                raise PyngrokError("The tunnel pool is closed.")
+            if self._executor is not None:
+                return
+
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent_creates,
+                                                thread_name_prefix="pyngrok-pool")
+            self._started_at = time.monotonic()
+
+        futures = [self._submit_create(slot, self.addr) for slot in self._slots]
+        errors = [future.exception() for future in futures]
+
+        # A tunnel that could not be created is retried when it is next leased
+        with self._condition:
+            self._idle.extend(self._slots)
+            self._condition.notify_all()
+
+        error = next((e for e in errors if e is not None), None)
+        if error is not None:
+            raise error
+
+    @contextmanager
+    def lease(self,
+              addr: Optional[str] = None,
+              timeout: Optional[float] = None,
+              recycle: bool = False) -> Iterator[NgrokTunnel]:
+        """
+        Lease a tunnel from the pool for the duration of the ``with`` block, starting the pool if needed.
+
+        :param addr: The local port or address the tunnel should forward to, if not the pool's ``addr``.
+        :param timeout: How long, in seconds, to wait for a tunnel to be free, or ``None`` to wait indefinitely.
+        :param recycle: Re-create the tunnel when it is released, for instance if the caller changed its state.
+        :return: The leased tunnel.
+        :raises: :class:`~pyngrok.exception.PyngrokError`: When no tunnel was free within the ``timeout``.
+        """
+        tunnel = self.acquire(addr, timeout)
+        try:
+            yield tunnel
+        finally:
+            self.release(tunnel, recycle)
+
+    def acquire(self,
+                addr: Optional[str] = None,
+                timeout: Optional[float] = None) -> NgrokTunnel:
+        """
+        Lease a tunnel from the pool, starting the pool if needed. It must be given back with
+        :func:`~pyngrok.pool.TunnelPool.release`. Prefer :func:`~pyngrok.pool.TunnelPool.lease`, which always does.
+
+        :param addr: The local port or address the tunnel should forward to, if not the pool's ``addr``.
+        :param timeout: How long, in seconds, to wait for a tunnel to be free, or ``None`` to wait indefinitely.
+        :return: The leased tunnel.
+        :raises: :class:`~pyngrok.exception.PyngrokError`: When no tunnel was free within the ``timeout``.
+        """
+        self.start()
+
+        addr = addr if addr is not None else self.addr
+        start = time.monotonic()
+
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._idle or self._closed, timeout):
+                raise PyngrokError(f"No tunnel in the pool was free within {timeout} seconds.")
+            if self._closed:
+                raise PyngrokError("The tunnel pool is closed.")
+
+            # Prefer a tunnel that already points at the requested addr, so it doesn't need repointing
+            slot = next((s for s in self._idle if s.addr == addr), self._idle[0])
+            self._idle.remove(slot)
+            slot.leased_at = time.monotonic()
+
+        if slot.tunnel is None or slot.addr != addr:
+            repointed = slot.tunnel is not None
+            if repointed:
+                logger.debug(f"Repointing pooled tunnel \"{slot.name}\" from {slot.addr} to {addr}")
+
+            try:
+                self._submit_create(slot, addr).result()
+            except BaseException:
+                slot.leased_at = None
+                self._return_slot(slot)
+                raise
+
+            if repointed:
+                with self._condition:
+                    self._repoints += 1
+
+        wait_time = time.monotonic() - start
+        with self._condition:
+            self._leases += 1
+            self._total_wait_time += wait_time
+            self._max_wait_time = max(self._max_wait_time, wait_time)
+
+        return slot.tunnel  # type: ignore
+
+    def release(self,
+                tunnel: NgrokTunnel,
+                recycle: bool = False) -> None:
+        """
+        Give a leased tunnel back to the pool.
+
+        :param tunnel: The tunnel.
+        :param recycle: Re-create the tunnel before it is leased again. This is done in the background.
+        """
+        slot = next((s for s in self._slots if s.tunnel is tunnel), None)
+        if slot is None or slot.leased_at is None:
+            raise ValueError(f"Tunnel {tunnel} is not leased from this pool.")
+
+        with self._condition:
+            self._busy_time += time.monotonic() - slot.leased_at
+            slot.leased_at = None
+
+        if not recycle or self._closed:
+            self._return_slot(slot)
+            return
+
+        logger.debug(f"Recycling pooled tunnel \"{slot.name}\"")
+
+        def recycled(future: "Future[None]") -> None:
+            if future.exception() is not None:
+                logger.warning(f"Pooled tunnel \"{slot.name}\" could not be recycled: {future.exception()}")
+            else:
+                with self._condition:
+                    self._recycles += 1
+            self._return_slot(slot)
+
+        self._submit_create(slot, slot.addr).add_done_callback(recycled)
+
+    def stats(self) -> PoolStats:
+        """
+        Get a snapshot of the pool's usage.
+
+        :return: The stats.
+        """
+        with self._condition:
+            now = time.monotonic()
+            busy_time = self._busy_time + sum(now - s.leased_at for s in self._slots if s.leased_at is not None)
+            elapsed = (now - self._started_at) * self.size if self._started_at is not None else 0.0
+
+            return PoolStats(self.size,
+                             sum(1 for s in self._slots if s.leased_at is not None),
+                             self._leases,
+                             self._total_wait_time,
+                             self._max_wait_time,
+                             busy_time / elapsed if elapsed else 0.0,
+                             self._creates,
+                             self._repoints,
+                             self._recycles)
+
+    def close(self) -> None:
+        """
+        Close the pool and disconnect its tunnels. Callers waiting for a tunnel will raise
+        :class:`~pyngrok.exception.PyngrokError`.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            executor = self._executor
+
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+        for slot in self._slots:
+            self._disconnect(slot)
+
+    def __enter__(self) -> "TunnelPool":
+        self.start()
+
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"<TunnelPool: size={self.size} addr={self.addr}>"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"TunnelPool: size={self.size} addr={self.addr}"
+
+    def _submit_create(self,
+                       slot: _PoolSlot,
+                       addr: Optional[str]) -> "Future[None]":
+        if self._executor is None:
+            raise PyngrokError("The tunnel pool is not started.")
+
+        return self._executor.submit(self._create, slot, addr)
+
+    def _create(self,
+                slot: _PoolSlot,
+                addr: Optional[str]) -> None:
+        # A tunnel's upstream can't be changed in place, so the old one is deleted to free up its name
+        self._disconnect(slot)
+        slot.addr = None
+
+        slot.tunnel = ngrok.connect(addr, self.proto, slot.name, self.pyngrok_config, **self.options)
+        slot.addr = addr
+
+        with self._condition:
+            self._creates += 1
+
+    def _disconnect(self,
+                    slot: _PoolSlot) -> None:
+        if slot.tunnel is not None and slot.tunnel.public_url is not None:
+            ngrok.disconnect(slot.tunnel.public_url, self.pyngrok_config)
+        slot.tunnel = None
+
+    def _return_slot(self,
+                     slot: _PoolSlot) -> None:
+        with self._condition:
+            self._idle.append(slot)
+            self._condition.notify()
@@ -4,25 +4,72 @@ __license__ = "MIT"
 import atexit
 import logging
 import os
+import signal
 import subprocess
 import threading
 import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
 from http import HTTPStatus
-from typing import Any, Dict, List, Optional
+from http.client import HTTPException
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
 from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
 
 import yaml
 
-from pyngrok import conf, installer
+from pyngrok import codec, conf, installer, instrumentation
 from pyngrok.conf import PyngrokConfig
-from pyngrok.exception import PyngrokError, PyngrokNgrokError, PyngrokSecurityError
+from pyngrok.deadline import Deadline, resolve_deadline
+from pyngrok.exception import PyngrokDeadlineError, PyngrokError, PyngrokNgrokError, PyngrokSecurityError
 from pyngrok.installer import SUPPORTED_NGROK_VERSIONS
 from pyngrok.log import NgrokLog
 
+if os.name == "posix":
+    import fcntl
+
 logger = logging.getLogger(__name__)
 ngrok_logger = logging.getLogger(f"{__name__}.ngrok")
 
+#: The max delay, in seconds, between restart attempts of a supervised ``ngrok`` process.
+MAX_RESTART_BACKOFF = 30
+
+# How long to wait for more output when reading ``ngrok``'s logs from a file, rather than a pipe
+_LOG_FILE_POLL_INTERVAL = 0.05
+
+
+class NgrokProcessHealth:
+    """
+    An object containing the result of the most recent health check of a ``ngrok`` process's API. Times are
+    :py:func:`time.time` seconds.
+    """
+
+    def __init__(self,
+                 healthy: Optional[bool] = None,
+                 checked_at: Optional[float] = None,
+                 last_success_at: Optional[float] = None,
+                 latency: Optional[float] = None,
+                 consecutive_failures: int = 0,
+                 error: Optional[str] = None) -> None:
+        #: Whether the API responded to the most recent check, or ``None`` if it has not been checked yet.
+        self.healthy: Optional[bool] = healthy
+        #: When the most recent check was made.
+        self.checked_at: Optional[float] = checked_at
+        #: When the API last responded to a check.
+        self.last_success_at: Optional[float] = last_success_at
+        #: How long, in seconds, the most recent check took.
+        self.latency: Optional[float] = latency
+        #: The number of checks in a row that have failed.
+        self.consecutive_failures: int = consecutive_failures
+        #: A description of why the most recent check failed, if it did.
+        self.error: Optional[str] = error
+
+    def __repr__(self) -> str:
+        return f"<NgrokProcessHealth: healthy={self.healthy} consecutive_failures={self.consecutive_failures}>"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"NgrokProcessHealth: healthy={self.healthy} consecutive_failures={self.consecutive_failures}"
+
 
 class NgrokProcess:
     """
@@ -43,11 +90,27 @@ class NgrokProcess:
         self.logs: List[NgrokLog] = []
         #: If ``ngrok`` startup fails, this will be the log of the failure.
         self.startup_error: Optional[str] = None
+        #: The number of times a supervised ``ngrok`` process has been restarted after exiting unexpectedly.
+        self.restart_count: int = 0
+        #: Whether this Python process owns the ``ngrok`` process, and so is responsible for terminating it. This is
+        #: ``False`` when it was attached to with ``attach`` in :class:`~pyngrok.conf.PyngrokConfig`.
+        self.owned: bool = True
+        #: The result of the most recent health check, which is cached, so reading it never blocks. Checks are made
+        #: in the background when ``health_check_interval`` is set in :class:`~pyngrok.conf.PyngrokConfig`, or
+        #: on demand with :func:`~pyngrok.process.NgrokProcess.check_health`.
+        self.health: NgrokProcessHealth = NgrokProcessHealth()
 
         self._tunnel_started = False
         self._client_connected = False
         self._monitor_thread: Optional[threading.Thread] = None
         self._monitor_thread_alive = False
+        self._health_check_thread: Optional[threading.Thread] = None
+        self._health_check_stop = threading.Event()
+        self._stopping = False
+        # Creation options for tunnels opened with ngrok.connect(), by name, so they can be re-created on restart
+        self._tunnel_definitions: Dict[str, Dict[str, Any]] = {}
+        # Names of tunnels opened with ngrok.connect(reuse=True), by the hash of their definition
+        self._tunnel_spec_hashes: Dict[str, str] = {}
 
     def __repr__(self) -> str:
         return f"<NgrokProcess: \"{self.api_url}\">"
@@ -130,6 +193,43 @@ class NgrokProcess:
 
         return self.proc.poll() is None
 
+    def check_health(self) -> NgrokProcessHealth:
+        """
+        Probe the ``ngrok`` process's API, bounded by ``request_timeout``, and update
+        :attr:`~pyngrok.process.NgrokProcess.health` with the result. Unlike
+        :func:`~pyngrok.process.NgrokProcess.healthy`, this also catches a process that is still running but
+        whose API has stopped responding.
+
+        :return: The updated health.
+        """
+        api_url = self.api_url
+        checked_at = time.time()
+        started_at = time.monotonic()
+
+        error = None
+        if api_url is None or self.proc.poll() is not None:
+            error = "The ngrok process is not running"
+        elif not api_url.lower().startswith("http"):
+            error = f"URL must start with \"http\": {api_url}"
+        else:
+            api_path = "/api/endpoints" if self.pyngrok_config.config_version == "3" else "/api/tunnels"
+            try:
+                urlopen(Request(f"{api_url}{api_path}"), timeout=self.pyngrok_config.request_timeout).read()
+            except (HTTPError, URLError, OSError, HTTPException) as e:
+                error = str(e)
+        latency = time.monotonic() - started_at
+
+        previous = self.health
+        if error is None:
+            health = NgrokProcessHealth(True, checked_at, checked_at, latency)
+        else:
+            health = NgrokProcessHealth(False, checked_at, previous.last_success_at, latency,
+                                        previous.consecutive_failures + 1, error)
+        # Replaced rather than updated in place, so readers always see a consistent snapshot
+        self.health = health
+
+        return health
+
     def _probe_api_path(self, path: str) -> bool:
         try:
             response = urlopen(Request(f"{self.api_url}{path}"))
@@ -145,10 +245,134 @@ class NgrokProcess:
 
                 continue
 
-            self._log_line(self.proc.stdout.readline())
+            line = self.proc.stdout.readline()
+            if not line:
+                # When logs are read from a file, wait for ngrok to write more
+                time.sleep(_LOG_FILE_POLL_INTERVAL)
+
+                continue
+
+            self._log_line(line)
 
         self._monitor_thread = None
 
+        if self._monitor_thread_alive and self.proc.poll() is not None and \
+                self.pyngrok_config.supervise and self.owned and not self._stopping:
+            _restart_process(self)
+
+    def _check_health_loop(self) -> None:
+        ngrok_path = self.pyngrok_config.ngrok_path
+
+        while not self._stopping:
+            interval = self.pyngrok_config.health_check_interval
+            if interval is None:
+                break
+
+            if ngrok_path in _restarting_processes:
+                # A restart is in progress, and will be checked once it's done
+                pass
+            elif _current_processes.get(ngrok_path) is not self:
+                break
+            else:
+                health = self.check_health()
+
+                max_failures = self.pyngrok_config.max_health_check_failures
+                if not health.healthy:
+                    logger.warning(f"ngrok health check failed, {health.consecutive_failures} in a row: "
+                                   f"{health.error}")
+
+                    if max_failures is not None and health.consecutive_failures >= max_failures and self.owned:
+                        self._restart_unresponsive(health)
+
+            if self._health_check_stop.wait(interval):
+                break
+
+        if self._health_check_thread is threading.current_thread():
+            self._health_check_thread = None
+
+    def _restart_unresponsive(self, health: NgrokProcessHealth) -> None:
+        logger.error(f"ngrok process {self.proc.pid} failed {health.consecutive_failures} health checks in a row, "
+                     f"restarting it")
+        _emit_process_event(NgrokProcessEvent("unresponsive", self, error=health.error))
+
+        self.health = NgrokProcessHealth(False, health.checked_at, health.last_success_at, health.latency, 0,
+                                         health.error)
+
+        # A supervised process's monitor thread restarts it once it exits
+        restarted_by_monitor = self.pyngrok_config.supervise and self._monitor_thread is not None
+
+        try:
+            self.proc.kill()
+            self.proc.wait(timeout=self.pyngrok_config.startup_timeout)
+        except (OSError, subprocess.TimeoutExpired) as e:  # pragma: no cover
+            logger.warning(f"ngrok process {self.proc.pid} could not be killed: {e}")
+
+        if not restarted_by_monitor:
+            # The monitor thread would otherwise read the restarted process's startup logs
+            monitor_thread = self._monitor_thread
+            if monitor_thread is not None:
+                monitor_thread.join(timeout=self.pyngrok_config.startup_timeout)
+
+            _restart_process(self)
+
+    def start_health_check_thread(self) -> None:
+        """
+        Start a thread that checks the ``ngrok`` process's health every ``health_check_interval`` seconds, until
+        the process is killed. If ``max_health_check_failures`` is set, a process that fails that many checks in
+        a row is killed and restarted, unless this Python process doesn't own it.
+
+        If a health check thread is already running, nothing will be done.
+        """
+        if self._health_check_thread is None or not self._health_check_thread.is_alive():
+            logger.debug("Health check thread will be started")
+
+            self._health_check_stop.clear()
+            self._health_check_thread = threading.Thread(target=self._check_health_loop, daemon=True)
+            self._health_check_thread.start()
+
+    def stop_health_check_thread(self) -> None:
+        """
+        Stop the health check thread, if running. The cached :attr:`~pyngrok.process.NgrokProcess.health` is left
+        as it was.
+        """
+        if self._health_check_thread is not None:
+            logger.debug("Health check thread will be stopped")
+
+            self._health_check_stop.set()
+
+    def _reset(self, proc: subprocess.Popen) -> None:  # type: ignore
+        # The previous process has exited, so release what this Python process still holds of it
+        self._close_output()
+        _spawned_procs.discard(self.proc)
+
+        self.proc = proc
+        self.api_url = None
+        self.startup_error = None
+        self._tunnel_started = False
+        self._client_connected = False
+
+    def _close_output(self) -> None:
+        stdout = self.proc.stdout
+        if stdout is None or stdout.closed:
+            return
+
+        # Let the monitor thread finish its read, so the handle isn't closed out from under it
+        monitor_thread = self._monitor_thread
+        if monitor_thread is not None and monitor_thread is not threading.current_thread():
+            monitor_thread.join(timeout=self.pyngrok_config.startup_timeout)
+            if monitor_thread.is_alive():  # pragma: no cover
+                logger.debug("Monitor thread is still reading the ngrok process's logs, leaving them open")
+
+                return
+
+        stdout.close()
+
+    def _terminate(self) -> None:
+        _terminate_process(self.proc)
+
+    def _stop_supervising(self) -> None:
+        self._stopping = True
+
     def start_monitor_thread(self) -> None:
         """
         Start a thread that will monitor the ``ngrok`` process and its logs until it completes.
@@ -177,6 +401,106 @@ class NgrokProcess:
             self._monitor_thread_alive = False
 
 
+class _AttachedProc:
+    """
+    A stand-in for :py:class:`subprocess.Popen` for a ``ngrok`` process that was started by another Python process.
+    When the PID is not known, the process is considered running for as long as its API responds.
+    """
+
+    def __init__(self,
+                 pid: Optional[int],
+                 api_url: str,
+                 log_path: Optional[str] = None) -> None:
+        self.pid = pid
+        self.api_url = api_url
+        self.returncode: Optional[int] = None
+        self.stdout = None
+
+        if log_path is not None and os.path.exists(log_path):
+            # Only follow new logs, not those already seen by the process that started ngrok
+            self.stdout = open(log_path, "r")
+            self.stdout.seek(0, os.SEEK_END)
+
+    def poll(self) -> Optional[int]:
+        if self.returncode is None:
+            if self.pid is not None:
+                running = _pid_alive(self.pid)
+            else:
+                try:
+                    running = urlopen(Request(f"{self.api_url}/api/status"), timeout=1).getcode() == HTTPStatus.OK
+                except (HTTPError, URLError, OSError):
+                    running = False
+
+            if not running:
+                self.returncode = 0
+
+        return self.returncode
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        timeout_at = None if timeout is None else time.time() + timeout
+        while self.poll() is None:
+            if timeout_at is not None and time.time() > timeout_at:
+                raise subprocess.TimeoutExpired(str(self.pid), timeout or 0)
+
+            time.sleep(_LOG_FILE_POLL_INTERVAL)
+
+        return self.returncode or 0
+
+    def terminate(self) -> None:
+        self._signal(signal.SIGTERM)
+
+    def kill(self) -> None:
+        self._signal(signal.SIGKILL)
+
+    def _signal(self, signum: int) -> None:
+        if self.pid is None:
+            logger.debug(f"PID of ngrok process at {self.api_url} is not known, it cannot be signaled")
+
+            return
+
+        try:
+            os.kill(self.pid, signum)
+        except ProcessLookupError:
+            logger.debug(f"ngrok process already terminated: {self.pid}")
+
+
+class NgrokProcessEvent:
+    """
+    An object containing information about a lifecycle event of a supervised ``ngrok`` process, passed to
+    ``process_event_callback`` in :class:`~pyngrok.conf.PyngrokConfig`.
+    """
+
+    def __init__(self,
+                 event: str,
+                 ngrok_process: NgrokProcess,
+                 attempt: Optional[int] = None,
+                 returncode: Optional[int] = None,
+                 error: Optional[str] = None,
+                 public_urls: Optional[Dict[str, str]] = None) -> None:
+        #: The type of event, one of ``exited``, ``unresponsive``, ``restarting``, ``restarted``, or
+        #: ``restart_failed``.
+        self.event: str = event
+        #: The ``ngrok`` process the event is for.
+        self.ngrok_process: NgrokProcess = ngrok_process
+        #: The ``ngrok`` process's restart count at the time of the event.
+        self.restart_count: int = ngrok_process.restart_count
+        #: The restart attempt the event is for, if any.
+        self.attempt: Optional[int] = attempt
+        #: The exit code of the ``ngrok`` process, for ``exited`` events.
+        self.returncode: Optional[int] = returncode
+        #: A description of the error, if the event is for a failure.
+        self.error: Optional[str] = error
+        #: For ``restarted`` events, the new public URLs of the tunnels that were re-created, by their public URL
+        #: before the restart.
+        self.public_urls: Dict[str, str] = public_urls or {}
+
+    def __repr__(self) -> str:
+        return f"<NgrokProcessEvent: \"{self.event}\" restart_count={self.restart_count}>"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"NgrokProcessEvent: \"{self.event}\" restart_count={self.restart_count}"
+
+
 def set_auth_token(pyngrok_config: PyngrokConfig,
                    token: str) -> None:
     """
@@ -257,20 +581,115 @@ def is_process_running(ngrok_path: str) -> bool:
     return False
 
 
-def get_process(pyngrok_config: PyngrokConfig) -> NgrokProcess:
+def get_process(pyngrok_config: PyngrokConfig,
+                deadline: Optional[Union[float, Deadline]] = None) -> NgrokProcess:
     """
     Get the current ``ngrok`` process for the given config's ``ngrok_path``.
 
     If ``ngrok`` is not running, calling this method will first start a process with
     :class:`~pyngrok.conf.PyngrokConfig`.
 
+    Startup is single-flight per ``ngrok_path``: if a process is already being started, whether by another thread
+    or in the background by :func:`~pyngrok.process.prewarm`, this method will wait for that startup to finish and
+    return the same process, rather than starting a second one.
+
+    With a ``deadline``, this method stops waiting once it is exhausted, but the startup itself carries on in the
+    background, bounded by ``startup_timeout``, so a later call can still use the process.
+
     :param pyngrok_config: The ``pyngrok`` configuration to use when interacting with the ``ngrok`` binary.
+    :param deadline: The overall deadline, or its budget in seconds, to wait for the process within.
     :return: The ``ngrok`` process.
+    :raises: :class:`~pyngrok.exception.PyngrokDeadlineError`: When the ``deadline`` is exhausted.
+    """
+    deadline = resolve_deadline(deadline)
+    if deadline is not None:
+        deadline.check("starting ngrok")
+
+    pending_start, started_here = _claim_pending_start(pyngrok_config)
+
+    if started_here:
+        if deadline is None:
+            _run_pending_start(pyngrok_config, pending_start)
+        else:
+            # Start in the background, so this call can give up on the startup without abandoning it half-done
+            threading.Thread(target=_run_pending_start, args=(pyngrok_config, pending_start), daemon=True).start()
+
+    if deadline is None:
+        return pending_start.result()
+
+    try:
+        return pending_start.result(timeout=deadline.remaining())
+    except FutureTimeoutError:
+        raise PyngrokDeadlineError(f"The deadline of {deadline.timeout} seconds was exceeded waiting for ngrok "
+                                   f"to start.", "starting ngrok")
+
+
+def prewarm(pyngrok_config: PyngrokConfig) -> "Future[NgrokProcess]":
+    """
+    Start a ``ngrok`` process for the given config's ``ngrok_path`` in a background thread, so it is already
+    healthy (or nearly so) by the time it is first needed. Calls to :func:`~pyngrok.process.get_process` made
+    while the startup is in progress will wait for it and receive the same process.
+
+    If ``ngrok`` is already running, or is already being started, nothing new will be started.
+
+    :param pyngrok_config: The ``pyngrok`` configuration to use when interacting with the ``ngrok`` binary.
+    :return: A future that resolves to the ``ngrok`` process, or to the error raised if it could not start.
+    """
+    pending_start, started_here = _claim_pending_start(pyngrok_config)
+
+    if started_here:
+        logger.debug(f"Prewarming ngrok process for \"ngrok_path\" {pyngrok_config.ngrok_path}")
+
+        threading.Thread(target=_run_pending_start, args=(pyngrok_config, pending_start), daemon=True).start()
+
+    return pending_start
+
+
+def _claim_pending_start(pyngrok_config: PyngrokConfig) -> Tuple["Future[NgrokProcess]", bool]:
+    """
+    Get a future for the ``ngrok`` process at the given config's ``ngrok_path``. If the process is neither running
+    nor already being started, a new pending startup is registered, and the caller is responsible for running it
+    with :func:`_run_pending_start`.
+
+    :param pyngrok_config: The ``pyngrok`` configuration to use when interacting with the ``ngrok`` binary.
+    :return: The future, and whether the caller must run the startup.
     """
-    if is_process_running(pyngrok_config.ngrok_path):
-        return _current_processes[pyngrok_config.ngrok_path]
+    with _startup_lock:
+        # A starting process is registered before it is healthy, so check for a pending startup first
+        pending_start = _pending_starts.get(pyngrok_config.ngrok_path)
+        if pending_start is not None:
+            return pending_start, False
+
+        pending_start = Future()
+        if is_process_running(pyngrok_config.ngrok_path):
+            pending_start.set_result(_current_processes[pyngrok_config.ngrok_path])
+
+            return pending_start, False
+
+        _pending_starts[pyngrok_config.ngrok_path] = pending_start
+
+        return pending_start, True
+
+
+def _run_pending_start(pyngrok_config: PyngrokConfig,
+                       pending_start: "Future[NgrokProcess]") -> None:
+    try:
+        if _is_shared(pyngrok_config):
+            ngrok_process = _attach_or_start_process(pyngrok_config)
+        else:
+            ngrok_process = _start_process(pyngrok_config)
+    except BaseException as e:
+        _finish_pending_start(pyngrok_config.ngrok_path)
+        pending_start.set_exception(e)
+    else:
+        _finish_pending_start(pyngrok_config.ngrok_path)
+        pending_start.set_result(ngrok_process)
+
 
-    return _start_process(pyngrok_config)
+def _finish_pending_start(ngrok_path: str) -> None:
+    # Stop tracking the startup before resolving its future, so a caller woken by a failure starts a fresh process
+    with _startup_lock:
+        _pending_starts.pop(ngrok_path, None)
 
 
 def kill_process(ngrok_path: str) -> None:
@@ -278,21 +697,62 @@ def kill_process(ngrok_path: str) -> None:
     Terminate the ``ngrok`` processes, if running, for the given path. This method will not block, it will just
     issue a kill request.
 
+    If the process is supervised, it will not be restarted, and any restart in progress will be abandoned. If the
+    process is shared with other Python processes through ``attach``, it will only be terminated if no other
+    process is still attached to it, otherwise this Python process just detaches from it.
+
     :param ngrok_path: The path to the ``ngrok`` binary.
     """
+    restarting_process = _restarting_processes.get(ngrok_path)
+    if restarting_process is not None:
+        restarting_process._stop_supervising()
+
+    _kill_process(ngrok_path, stopped_by_user=True)
+
+
+def _kill_process(ngrok_path: str, stopped_by_user: bool) -> None:
     if is_process_running(ngrok_path):
         ngrok_process = _current_processes[ngrok_path]
 
+        if stopped_by_user:
+            ngrok_process._stop_supervising()
+            ngrok_process.stop_health_check_thread()
+
+            if _is_shared(ngrok_process.pyngrok_config):
+                # Decides whether this Python process is the last one attached, and so now owns the process
+                _release_attachment(ngrok_process)
+
+        if not ngrok_process.owned:
+            # For instance, a process still in use by other attached processes, or one inherited by a forked child
+            logger.info(f"Detaching from ngrok process, which is not owned by this Python process: "
+                        f"{ngrok_process.proc.pid}")
+
+            ngrok_process.stop_monitor_thread()
+            ngrok_process.stop_health_check_thread()
+            ngrok_process._close_output()
+            atexit.unregister(ngrok_process._terminate)
+            _current_processes.pop(ngrok_path, None)
+
+            return
+
         logger.info(f"Killing ngrok process: {ngrok_process.proc.pid}")
 
         try:
             ngrok_process.proc.kill()
-            ngrok_process.proc.wait()
+            if not isinstance(ngrok_process.proc, _AttachedProc):
+                # A process this Python process didn't start can't be reaped here, and until its parent reaps it,
+                # it looks to be alive, so only this process's own children are waited on
+                ngrok_process.proc.wait()
         except OSError as e:  # pragma: no cover
             # If the process was already killed, nothing to do but cleanup state
             if e.errno != 3:
                 raise e
 
+        ngrok_process._close_output()
+        _spawned_procs.discard(ngrok_process.proc)
+        if stopped_by_user:
+            atexit.unregister(ngrok_process._terminate)
+
         _current_processes.pop(ngrok_path, None)
     else:
         logger.debug(f"\"ngrok_path\" {ngrok_path} is not running a process")
@@ -332,16 +792,23 @@ def capture_run_process(ngrok_path: str, args: List[str]) -> str:
     _validate_path(ngrok_path)
 
     start = [ngrok_path] + args
-    try:
-        output = subprocess.check_output(start, stderr=subprocess.STDOUT)
+    with instrumentation.span("capture_run_process", ngrok_path=ngrok_path,
+                              command=args[0] if args else None) as span:
+        try:
+            output = subprocess.check_output(start, stderr=subprocess.STDOUT)
 
-        return output.decode("utf-8").strip()
-    except subprocess.CalledProcessError as e:
-        if e.returncode != 0:
-            raise PyngrokNgrokError(f"The ngrok process exited with code {e.returncode}: "
-                                    f"{e.output.decode('utf-8').strip()}")
-        else:
-            raise e
+            span.set_attribute("returncode", 0)
+            span.set_attribute("output_bytes", len(output))
+
+            return output.decode("utf-8").strip()
+        except subprocess.CalledProcessError as e:
+            span.set_attribute("returncode", e.returncode)
+
+            if e.returncode != 0:
+                raise PyngrokNgrokError(f"The ngrok process exited with code {e.returncode}: "
+                                        f"{e.output.decode('utf-8').strip()}")
+            else:
+                raise e
 
 
 def _validate_path(ngrok_path: str) -> None:
@@ -374,6 +841,18 @@ def _terminate_process(process: subprocess.Popen) -> None:  # type: ignore
     if process is None:
         return
 
+    if process not in _spawned_procs:
+        # For instance, in a forked child, which inherits its parent's exit handlers
+        logger.debug(f"ngrok process was not started by this Python process, leaving it running: {process.pid}")
+
+        return
+
+    for ngrok_process in list(_current_processes.values()):
+        if ngrok_process.proc is process and not ngrok_process.owned:
+            logger.debug(f"ngrok process is not owned by this Python process, leaving it running: {process.pid}")
+
+            return
+
     try:
         process.terminate()
     except OSError:  # pragma: no cover
@@ -389,12 +868,37 @@ def _start_process(pyngrok_config: PyngrokConfig) -> NgrokProcess:
     :return: The ``ngrok`` process.
     :raises: :class:`~pyngrok.exception.PyngrokNgrokError`: When ``ngrok`` could not start.
     """
+    with instrumentation.span("start_process", ngrok_path=pyngrok_config.ngrok_path) as span:
+        ngrok_process = _start_and_await_process(pyngrok_config)
+
+        span.set_attribute("pid", ngrok_process.proc.pid)
+        span.set_attribute("api_url", ngrok_process.api_url)
+
+    return ngrok_process
+
+
+def _start_and_await_process(pyngrok_config: PyngrokConfig) -> NgrokProcess:
     config_path = conf.get_config_path(pyngrok_config)
 
     _validate_path(pyngrok_config.ngrok_path)
     _validate_config(config_path)
 
-    start = [pyngrok_config.ngrok_path, "start", "--none", "--log", "stdout"]
+    ngrok_process = NgrokProcess(_launch_process(pyngrok_config), pyngrok_config)
+    _register_process(ngrok_process)
+
+    _await_process(ngrok_process)
+
+    return ngrok_process
+
+
+def _launch_process(pyngrok_config: PyngrokConfig) -> subprocess.Popen:  # type: ignore
+    log_path = None
+    if _is_shared(pyngrok_config):
+        # A shared process may outlive this Python process, so it must not log to a pipe this process owns
+        log_path = _get_agent_state_path(pyngrok_config, "log")
+        open(log_path, "w").close()
+
+    start = [pyngrok_config.ngrok_path, "start", "--none", "--log", log_path or "stdout"]
     if pyngrok_config.config_path:
         logger.info(f"Starting ngrok with config file: {pyngrok_config.config_path}")
         start.append("--config")
@@ -409,50 +913,533 @@ def _start_process(pyngrok_config: PyngrokConfig) -> NgrokProcess:
         start.append(pyngrok_config.region)
 
     popen_kwargs: Dict[str, Any] = {"stdout": subprocess.PIPE, "universal_newlines": True}
-    if os.name == "posix":
+    if log_path is not None:
+        popen_kwargs.update(stdout=subprocess.DEVNULL, start_new_session=True)
+    elif os.name == "posix":
         popen_kwargs.update(start_new_session=pyngrok_config.start_new_session)
     elif pyngrok_config.start_new_session:
         logger.warning("Ignoring start_new_session=True, which requires POSIX")
     proc = subprocess.Popen(start, **popen_kwargs)
-    atexit.register(_terminate_process, proc)
+    _spawned_procs.add(proc)
+
+    if log_path is not None:
+        proc.stdout = open(log_path, "r")
 
     logger.debug(f"ngrok process starting with PID: {proc.pid}")
 
-    ngrok_process = NgrokProcess(proc, pyngrok_config)
-    _current_processes[pyngrok_config.ngrok_path] = ngrok_process
+    return proc
+
+
+def _register_process(ngrok_process: NgrokProcess) -> None:
+    ngrok_path = ngrok_process.pyngrok_config.ngrok_path
+
+    _current_processes[ngrok_path] = ngrok_process
+    _start_counts[ngrok_path] = _start_counts.get(ngrok_path, 0) + 1
+
+    # Registered once per process, rather than per launch, as a supervised process's restarts replace its proc
+    atexit.unregister(ngrok_process._terminate)
+    atexit.register(ngrok_process._terminate)
+    if ngrok_process.pyngrok_config.supervise:
+        # (Re-)registered after the process's own termination handler, so it runs first and the exit isn't restarted
+        atexit.unregister(ngrok_process._stop_supervising)
+        atexit.register(ngrok_process._stop_supervising)
+
+
+def _await_process(ngrok_process: NgrokProcess) -> None:
+    """
+    Wait for the given ``ngrok`` process to finish starting up, killing it if it does not become healthy.
+
+    :param ngrok_process: The ``ngrok`` process to wait on.
+    :raises: :class:`~pyngrok.exception.PyngrokNgrokError`: When ``ngrok`` could not start.
+    """
+    pyngrok_config = ngrok_process.pyngrok_config
+    proc = ngrok_process.proc
+
+    # readline() blocks until ngrok writes a line, so the loop's timeout alone can't stop a process that goes silent
+    watchdog = _StartupWatchdog(proc, pyngrok_config.startup_timeout)
 
     timeout = time.time() + pyngrok_config.startup_timeout
-    while time.time() < timeout:
-        if proc.stdout is None:
-            logger.debug("Output from process is empty, breaking startup loop")
-            break
+    try:
+        while time.time() < timeout:
+            if proc.stdout is None:
+                logger.debug("Output from process is empty, breaking startup loop")
+                break
 
-        line = proc.stdout.readline()
-        ngrok_process._log_startup_line(line)
+            line = proc.stdout.readline()
+            if not line:
+                # When logs are read from a file, wait for ngrok to write more
+                time.sleep(_LOG_FILE_POLL_INTERVAL)
 
-        if ngrok_process.healthy():
-            logger.debug(f"ngrok process has started with API URL: {ngrok_process.api_url}")
+            ngrok_process._log_startup_line(line)
 
-            ngrok_process.startup_error = None
+            if ngrok_process.healthy():
+                logger.debug(f"ngrok process has started with API URL: {ngrok_process.api_url}")
 
-            if pyngrok_config.monitor_thread:
-                ngrok_process.start_monitor_thread()
+                ngrok_process.startup_error = None
 
-        if ngrok_process.healthy() or ngrok_process.proc.poll() is not None:
-            break
+                if pyngrok_config.monitor_thread:
+                    ngrok_process.start_monitor_thread()
+                if pyngrok_config.health_check_interval is not None:
+                    ngrok_process.start_health_check_thread()
 
-    if not ngrok_process.healthy():
+            if ngrok_process.healthy() or ngrok_process.proc.poll() is not None:
+                break
+    finally:
+        watchdog.cancel()
+
+    if watchdog.fired or not ngrok_process.healthy():
         # If the process did not come up in a healthy state, clean up the state
-        kill_process(pyngrok_config.ngrok_path)
+        _kill_process(pyngrok_config.ngrok_path, stopped_by_user=False)
+
+        # The process may have exited, and been forgotten, before it could be killed, so release it regardless
+        ngrok_process._close_output()
+        _spawned_procs.discard(proc)
+        atexit.unregister(ngrok_process._terminate)
+        atexit.unregister(ngrok_process._stop_supervising)
 
         if ngrok_process.startup_error is not None:
             raise PyngrokNgrokError(f"The ngrok process errored on start: {ngrok_process.startup_error}.",
                                     ngrok_process.logs,
                                     ngrok_process.startup_error)
+        elif watchdog.fired:
+            raise PyngrokNgrokError(f"The ngrok process did not start within {pyngrok_config.startup_timeout} "
+                                    f"seconds.", ngrok_process.logs)
         else:
             raise PyngrokNgrokError("The ngrok process was unable to start.", ngrok_process.logs)
 
+
+class _StartupWatchdog:
+    """
+    Terminates a starting ``ngrok`` process if it is still starting once its ``startup_timeout`` has passed, which
+    unblocks a read of its output that would otherwise wait indefinitely.
+    """
+
+    def __init__(self,
+                 proc: subprocess.Popen,  # type: ignore
+                 timeout: float) -> None:
+        self.proc = proc
+        self.fired = False
+
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._timer = threading.Timer(timeout, self._fire)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._cancelled = True
+        self._timer.cancel()
+
+    def _fire(self) -> None:
+        with self._lock:
+            if self._cancelled:
+                return
+            self.fired = True
+
+        logger.debug(f"ngrok process {self.proc.pid} did not start in time, terminating it")
+
+        _terminate_process(self.proc)
+
+
+def _restart_process(ngrok_process: NgrokProcess) -> None:
+    """
+    Restart the given supervised ``ngrok`` process after it exited unexpectedly, with backoff between attempts, then
+    re-create its tunnels. While the restart is in progress, :func:`~pyngrok.process.get_process` will wait on it.
+
+    :param ngrok_process: The ``ngrok`` process that exited.
+    """
+    pyngrok_config = ngrok_process.pyngrok_config
+
+    logger.warning(f"ngrok process {ngrok_process.proc.pid} exited unexpectedly with code "
+                   f"{ngrok_process.proc.returncode}, restarting")
+    _emit_process_event(NgrokProcessEvent("exited", ngrok_process, returncode=ngrok_process.proc.returncode))
+
+    pending_start, started_here = _claim_pending_start(pyngrok_config)
+    if not started_here:
+        logger.debug(f"ngrok process for \"ngrok_path\" {pyngrok_config.ngrok_path} is already being started")
+
+        return
+
+    _restarting_processes[pyngrok_config.ngrok_path] = ngrok_process
+    try:
+        _run_restart_attempts(ngrok_process, pending_start)
+    finally:
+        _restarting_processes.pop(pyngrok_config.ngrok_path, None)
+
+
+def _run_restart_attempts(ngrok_process: NgrokProcess,
+                          pending_start: "Future[NgrokProcess]") -> None:
+    pyngrok_config = ngrok_process.pyngrok_config
+
+    error = None
+    for attempt in range(1, pyngrok_config.max_restart_attempts + 1):
+        if attempt > 1:
+            time.sleep(min(pyngrok_config.restart_backoff * 2 ** (attempt - 2), MAX_RESTART_BACKOFF))
+        if ngrok_process._stopping:
+            error = "The ngrok process was stopped while restarting."
+            break
+
+        _emit_process_event(NgrokProcessEvent("restarting", ngrok_process, attempt=attempt))
+
+        try:
+            _validate_config(conf.get_config_path(pyngrok_config))
+
+            ngrok_process._reset(_launch_process(pyngrok_config))
+            _register_process(ngrok_process)
+
+            _await_process(ngrok_process)
+        except (PyngrokError, OSError) as e:
+            logger.warning(f"ngrok restart attempt {attempt} failed: {e}")
+
+            error = str(e)
+
+            continue
+
+        _finish_pending_start(pyngrok_config.ngrok_path)
+        pending_start.set_result(ngrok_process)
+
+        public_urls = _restore_tunnels(ngrok_process)
+
+        ngrok_process.restart_count += 1
+
+        logger.info(f"ngrok process restarted with PID: {ngrok_process.proc.pid}")
+        _emit_process_event(NgrokProcessEvent("restarted", ngrok_process, attempt=attempt, public_urls=public_urls))
+
+        return
+
+    _finish_pending_start(pyngrok_config.ngrok_path)
+    pending_start.set_exception(PyngrokNgrokError(f"The ngrok process could not be restarted: {error}",
+                                                  ngrok_process.logs))
+
+    logger.error(f"ngrok process could not be restarted: {error}")
+    _emit_process_event(NgrokProcessEvent("restart_failed", ngrok_process, error=error))
+
+
+def _restore_tunnels(ngrok_process: NgrokProcess) -> Dict[str, str]:
+    """
+    Re-create the tunnels opened on the given ``ngrok`` process, after it was restarted, with the restorer
+    registered by :mod:`~pyngrok.ngrok`, which keeps the registry of tunnels.
+
+    :param ngrok_process: The restarted ``ngrok`` process.
+    :return: The new public URLs of the re-created tunnels, by their public URL before the restart.
+    """
+    if _tunnel_restorer is None or not ngrok_process._tunnel_definitions:
+        return {}
+
+    try:
+        return _tunnel_restorer(ngrok_process)
+    except PyngrokError as e:
+        logger.warning(f"Tunnels could not be re-created: {e}")
+
+        return {}
+
+
+def _emit_process_event(event: NgrokProcessEvent) -> None:
+    callback = event.ngrok_process.pyngrok_config.process_event_callback
+    if callback is None:
+        return
+
+    try:
+        callback(event)
+    except Exception as e:
+        logger.warning(f"An error occurred in process_event_callback for \"{event.event}\": {e}")
+
+
+def _attach_or_start_process(pyngrok_config: PyngrokConfig) -> NgrokProcess:
+    """
+    Attach to a ``ngrok`` process that is already running for the given config's ``config_path``, or start one and
+    record it in a state file next to the config, so other Python processes can attach to it.
+
+    :param pyngrok_config: The ``pyngrok`` configuration to use when interacting with the ``ngrok`` binary.
+    :return: The ``ngrok`` process.
+    :raises: :class:`~pyngrok.exception.PyngrokError`: When not on POSIX.
+    :raises: :class:`~pyngrok.exception.PyngrokNgrokError`: When ``ngrok`` could not start.
+    """
+    if os.name != "posix":
+        raise PyngrokError(f"\"{'persist' if pyngrok_config.persist else 'attach'}\" requires POSIX")
+
+    with _agent_state_lock(pyngrok_config):
+        state = _read_agent_state(pyngrok_config)
+
+        ngrok_process = _attach_process(pyngrok_config, state)
+        if ngrok_process is None:
+            ngrok_process = _start_process(pyngrok_config)
+
+            state = {"pid": ngrok_process.proc.pid,
+                     "api_url": ngrok_process.api_url,
+                     "owner_pid": os.getpid(),
+                     "log_path": _get_agent_state_path(pyngrok_config, "log"),
+                     "attached_pids": []}
+        elif state is None or state.get("api_url") != ngrok_process.api_url:
+            # Discovered by web_addr, so it was not started by pyngrok, and no one owns it
+            state = {"pid": None,
+                     "api_url": ngrok_process.api_url,
+                     "owner_pid": None,
+                     "log_path": None,
+                     "attached_pids": []}
+        else:
+            # Pick back up the tunnels opened by processes that attached before, for instance before a reload
+            ngrok_process._tunnel_definitions.update(state.get("tunnel_definitions") or {})
+            ngrok_process._tunnel_spec_hashes.update(state.get("tunnel_spec_hashes") or {})
+
+        state["attached_pids"] = [pid for pid in state.get("attached_pids", [])
+                                  if pid != os.getpid() and _pid_alive(pid)] + [os.getpid()]
+        _write_agent_state(pyngrok_config, state)
+
+    atexit.register(_release_process, ngrok_process)
+
     return ngrok_process
 
 
+def _attach_process(pyngrok_config: PyngrokConfig,
+                    state: Optional[Dict[str, Any]]) -> Optional[NgrokProcess]:
+    candidates = []
+    if state is not None and state.get("api_url"):
+        candidates.append(_AttachedProc(state.get("pid"), state["api_url"], state.get("log_path")))
+    web_addr = _get_web_addr(pyngrok_config)
+    if web_addr is not None:
+        candidates.append(_AttachedProc(None, f"http://{web_addr}"))
+
+    for proc in candidates:
+        if proc.poll() is not None:
+            if proc.stdout is not None:
+                proc.stdout.close()
+
+            continue
+
+        ngrok_process = NgrokProcess(proc, pyngrok_config)  # type: ignore
+        ngrok_process.api_url = proc.api_url
+        ngrok_process.owned = False
+        ngrok_process._tunnel_started = True
+        ngrok_process._client_connected = True
+
+        if not ngrok_process.healthy():
+            ngrok_process._close_output()
+
+            continue
+
+        logger.info(f"Attaching to ngrok process with API URL: {proc.api_url}")
+
+        _current_processes[pyngrok_config.ngrok_path] = ngrok_process
+
+        if pyngrok_config.monitor_thread and proc.stdout is not None:
+            ngrok_process.start_monitor_thread()
+        if pyngrok_config.health_check_interval is not None:
+            ngrok_process.start_health_check_thread()
+
+        return ngrok_process
+
+    return None
+
+
+def _release_process(ngrok_process: NgrokProcess) -> None:
+    if _current_processes.get(ngrok_process.pyngrok_config.ngrok_path) is not ngrok_process:
+        # Already released, for instance by ngrok.kill()
+        return
+
+    if ngrok_process.pyngrok_config.persist:
+        _detach_process(ngrok_process)
+    elif _release_attachment(ngrok_process):
+        _terminate_process(ngrok_process.proc)
+
+    # Shared processes log to a file, so the monitor thread stops at its next poll, rather than blocking on a read
+    ngrok_process.stop_monitor_thread()
+    ngrok_process._close_output()
+
+
+def _detach_process(ngrok_process: NgrokProcess) -> None:
+    """
+    Detach this Python process from the given persistent ``ngrok`` process as it exits, leaving ``ngrok`` and the
+    state file in place for the next process to attach to.
+
+    :param ngrok_process: The ``ngrok`` process.
+    """
+    pyngrok_config = ngrok_process.pyngrok_config
+
+    with _agent_state_lock(pyngrok_config):
+        state = _read_agent_state(pyngrok_config)
+        if state is not None and state.get("api_url") == ngrok_process.api_url:
+            state["attached_pids"] = [pid for pid in state.get("attached_pids", [])
+                                      if pid != os.getpid() and _pid_alive(pid)]
+            _write_agent_state(pyngrok_config, state)
+
+    logger.info(f"Leaving persistent ngrok process running: {ngrok_process.proc.pid}")
+
+    # Keeps the process's own exit handler, registered when it was started, from terminating it
+    ngrok_process.owned = False
+
+
+def _save_tunnel_state(ngrok_process: NgrokProcess) -> None:
+    """
+    Record the given persistent ``ngrok`` process's tunnels in its state file, so the next process to attach to
+    it, for instance after a reload, can reuse them. Nothing is done if ``persist`` is not set.
+
+    :param ngrok_process: The ``ngrok`` process.
+    """
+    pyngrok_config = ngrok_process.pyngrok_config
+    if not pyngrok_config.persist or os.name != "posix":
+        return
+
+    with _agent_state_lock(pyngrok_config):
+        state = _read_agent_state(pyngrok_config)
+        if state is None or state.get("api_url") != ngrok_process.api_url:
+            return
+
+        state["tunnel_definitions"] = ngrok_process._tunnel_definitions
+        state["tunnel_spec_hashes"] = ngrok_process._tunnel_spec_hashes
+        _write_agent_state(pyngrok_config, state)
+
+
+def _release_attachment(ngrok_process: NgrokProcess) -> bool:
+    """
+    Detach this Python process from the given shared ``ngrok`` process. If this Python process owns it and others
+    are still attached, ownership is handed off to one of them.
+
+    :param ngrok_process: The ``ngrok`` process.
+    :return: ``True`` if no other process is attached, and the caller should terminate the ``ngrok`` process.
+    """
+    pyngrok_config = ngrok_process.pyngrok_config
+
+    with _agent_state_lock(pyngrok_config):
+        state = _read_agent_state(pyngrok_config)
+        if state is None or state.get("pid") != ngrok_process.proc.pid or \
+                state.get("api_url") != ngrok_process.api_url:
+            # The state file no longer describes this process, so it is not shared
+            return ngrok_process.owned
+
+        others = [pid for pid in state.get("attached_pids", []) if pid != os.getpid() and _pid_alive(pid)]
+        if others:
+            if state.get("owner_pid") == os.getpid():
+                logger.info(f"Handing off ownership of ngrok process {ngrok_process.proc.pid} to PID {others[0]}")
+
+                state["owner_pid"] = others[0]
+
+            state["attached_pids"] = others
+            _write_agent_state(pyngrok_config, state)
+
+            ngrok_process.owned = False
+
+            return False
+
+        os.remove(_get_agent_state_path(pyngrok_config, "json"))
+
+        # The last process to detach terminates ngrok, unless it was not started by pyngrok
+        ngrok_process.owned = state.get("owner_pid") is not None
+
+        return ngrok_process.owned
+
+
+def _is_shared(pyngrok_config: PyngrokConfig) -> bool:
+    return pyngrok_config.attach or pyngrok_config.persist
+
+
+def _get_agent_state_path(pyngrok_config: PyngrokConfig, extension: str) -> str:
+    return f"{conf.get_config_path(pyngrok_config)}.pyngrok-agent.{extension}"
+
+
+@contextmanager
+def _agent_state_lock(pyngrok_config: PyngrokConfig) -> Iterator[None]:
+    lock_path = _get_agent_state_path(pyngrok_config, "lock")
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+
+    with open(lock_path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _read_agent_state(pyngrok_config: PyngrokConfig) -> Optional[Dict[str, Any]]:
+    state_path = _get_agent_state_path(pyngrok_config, "json")
+
+    try:
+        with open(state_path, "rb") as state_file:
+            state: Dict[str, Any] = codec.loads(state_file.read())
+    except (OSError, ValueError):
+        return None
+
+    return state
+
+
+def _write_agent_state(pyngrok_config: PyngrokConfig,
+                       state: Dict[str, Any]) -> None:
+    state_path = _get_agent_state_path(pyngrok_config, "json")
+
+    with open(f"{state_path}.tmp", "wb") as state_file:
+        state_file.write(codec.dumps(state))
+    os.replace(f"{state_path}.tmp", state_path)
+
+
+def _get_web_addr(pyngrok_config: PyngrokConfig) -> Optional[str]:
+    config_path = conf.get_config_path(pyngrok_config)
+    if not os.path.exists(config_path):
+        return None
+
+    config = installer.get_ngrok_config(config_path, use_cache=False, ngrok_version=pyngrok_config.ngrok_version,
+                                        config_version=pyngrok_config.config_version)
+    if str(config.get("version")) == "3":
+        web_addr = (config.get("agent") or {}).get("web_addr")
+    else:
+        web_addr = config.get("web_addr")
+
+    return str(web_addr) if web_addr else None
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+    return True
+
+
 _current_processes: Dict[str, NgrokProcess] = {}
+# The number of times a process has been started for each ``ngrok_path``, including failed starts
+_start_counts: Dict[str, int] = {}
+# Processes currently being started, by ``ngrok_path``, so concurrent callers share a single startup
+_pending_starts: Dict[str, "Future[NgrokProcess]"] = {}
+_startup_lock = threading.Lock()
+# Supervised processes currently being restarted, by ``ngrok_path``
+_restarting_processes: Dict[str, NgrokProcess] = {}
+# The ngrok child processes started by this Python process, which it is responsible for terminating
+_spawned_procs: Set[subprocess.Popen] = set()  # type: ignore
+# Re-creates a restarted process's tunnels, set by pyngrok.ngrok, which can't be imported here without a cycle
+_tunnel_restorer: Optional[Callable[[NgrokProcess], Dict[str, str]]] = None
+
+
+def _reinitialize_after_fork() -> None:
+    """
+    Reset per-process state in a child forked from a process using ``pyngrok`` (for instance, a ``gunicorn`` worker
+    or a ``multiprocessing`` child). ``ngrok`` processes inherited from the parent remain usable, but the child does
+    not own them, so it won't read their logs, restart them, or terminate them when it exits.
+    """
+    global _startup_lock
+
+    # Any thread that held the lock or was running a startup at the time of the fork doesn't exist in the child
+    _startup_lock = threading.Lock()
+    _pending_starts.clear()
+    _restarting_processes.clear()
+    _spawned_procs.clear()
+
+    for ngrok_path, ngrok_process in list(_current_processes.items()):
+        if ngrok_process.api_url is None:
+            _current_processes.pop(ngrok_path, None)
+
+            continue
+
+        # The parent's Popen can't be polled from the child, which isn't the ngrok process's parent
+        ngrok_process.proc = _AttachedProc(ngrok_process.proc.pid, ngrok_process.api_url)  # type: ignore
+        ngrok_process.owned = False
+        ngrok_process._monitor_thread = None
+        ngrok_process._monitor_thread_alive = False
+        ngrok_process._health_check_thread = None
+        ngrok_process._health_check_stop = threading.Event()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinitialize_after_fork)
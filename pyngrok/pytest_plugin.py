@@ -0,0 +1,163 @@
+__copyright__ = "Copyright (c) 2018-2025 Alex Laird"
+__license__ = "MIT"
+
+import copy
+import logging
+import os
+import shutil
+import socket
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+import pytest
+
+from pyngrok import conf, installer, ngrok
+from pyngrok.conf import PyngrokConfig
+from pyngrok.exception import PyngrokError
+from pyngrok.ngrok import NgrokTunnel
+from pyngrok.process import NgrokProcess
+
+logger = logging.getLogger(__name__)
+
+#: The worker ID used when tests are not being run by ``pytest-xdist``.
+DEFAULT_WORKER_ID = "master"
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line("markers",
+                            "ngrok_tunnel(addr=None, proto=None, name=None, **options): the arguments "
+                            "the ngrok_tunnel fixture passes to pyngrok.ngrok.connect()")
+
+
+def get_worker_id(config: pytest.Config) -> str:
+    """
+    Get the ID of the ``pytest-xdist`` worker running the session, for instance ``gw0``.
+
+    :param config: The ``pytest`` config for the session.
+    :return: The worker ID, or :data:`~pyngrok.pytest_plugin.DEFAULT_WORKER_ID` if ``pytest-xdist`` is not in use.
+    """
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None:
+        return str(workerinput["workerid"])
+
+    return os.environ.get("PYTEST_XDIST_WORKER", DEFAULT_WORKER_ID)
+
+
+@pytest.fixture(scope="session")
+def pyngrok_worker_id(request: pytest.FixtureRequest) -> str:
+    """
+    The ID of the ``pytest-xdist`` worker running the session, or ``master`` if ``pytest-xdist`` is not in use.
+    """
+    return get_worker_id(request.config)
+
+
+@pytest.fixture(scope="session")
+def pyngrok_config(tmp_path_factory: pytest.TempPathFactory,
+                   pyngrok_worker_id: str) -> PyngrokConfig:
+    """
+    A copy of :func:`~pyngrok.conf.get_default()` with a ``config_path`` in a temporary directory for this worker.
+    The config file starts as a copy of the default one, so its auth token and tunnel definitions carry over, but
+    its ``web_addr`` is set to a free port, so workers' ``ngrok`` processes don't collide. The ``ngrok`` binary at
+    ``ngrok_path`` is still shared.
+
+    Override this fixture in a ``conftest.py`` to customize the config.
+    """
+    default_config = conf.get_default()
+    default_config_path = conf.get_config_path(default_config)
+
+    config_dir = tmp_path_factory.mktemp(f"pyngrok-{pyngrok_worker_id}")
+    config_path = os.path.join(str(config_dir), "ngrok.yml")
+    if os.path.exists(default_config_path):
+        shutil.copyfile(default_config_path, config_path)
+
+    web_addr = f"127.0.0.1:{_get_free_port()}"
+    data: Dict[str, Any] = {}
+    if str(default_config.config_version) == "3":
+        config = installer.get_ngrok_config(config_path,
+                                            use_cache=False,
+                                            ngrok_version=default_config.ngrok_version,
+                                            config_version=default_config.config_version) \
+            if os.path.exists(config_path) else {}
+        data["agent"] = {**(config.get("agent") or {}), "web_addr": web_addr}
+    else:
+        data["web_addr"] = web_addr
+    installer.install_default_config(config_path, data, default_config.ngrok_version, default_config.config_version)
+
+    logger.debug(f"Worker \"{pyngrok_worker_id}\" will run ngrok with config_path {config_path} "
+                 f"and web_addr {web_addr}")
+
+    pyngrok_config = copy.copy(default_config)
+    pyngrok_config.config_path = config_path
+
+    return pyngrok_config
+
+
+@pytest.fixture(scope="session")
+def ngrok_process(pyngrok_config: PyngrokConfig) -> Iterator[NgrokProcess]:
+    """
+    The ``ngrok`` process for this worker, started once and shared by every test in the session. For the duration
+    of the session, ``pyngrok_config`` is also set as the default, so code under test that uses
+    :mod:`~pyngrok.ngrok` without a ``pyngrok_config`` shares this process too.
+    """
+    previous_default = conf.get_default()
+    conf.set_default(pyngrok_config)
+
+    try:
+        yield ngrok.get_ngrok_process(pyngrok_config)
+    finally:
+        ngrok.kill(pyngrok_config)
+
+        conf.set_default(previous_default)
+
+
+@pytest.fixture
+def ngrok_connect(ngrok_process: NgrokProcess) -> Iterator[Callable[..., NgrokTunnel]]:
+    """
+    A function with the same arguments as :func:`~pyngrok.ngrok.connect`, less ``pyngrok_config``, that opens a
+    tunnel on the session's ``ngrok`` process. Every tunnel it opens is closed when the test finishes.
+    """
+    tunnels: List[NgrokTunnel] = []
+
+    def connect(addr: Optional[str] = None,
+                proto: Optional[Union[str, int]] = None,
+                name: Optional[str] = None,
+                **options: Any) -> NgrokTunnel:
+        tunnel = ngrok.connect(addr, proto, name, ngrok_process.pyngrok_config, **options)
+        tunnels.append(tunnel)
+
+        return tunnel
+
+    yield connect
+
+    for tunnel in tunnels:
+        try:
+            ngrok.disconnect(str(tunnel.public_url), ngrok_process.pyngrok_config)
+        except PyngrokError as e:
+            logger.warning(f"Error closing tunnel \"{tunnel.public_url}\": {e}")
+
+
+@pytest.fixture
+def ngrok_tunnel(request: pytest.FixtureRequest,
+                 ngrok_connect: Callable[..., NgrokTunnel]) -> NgrokTunnel:
+    """
+    A tunnel opened on the session's ``ngrok`` process for the duration of the test. Its arguments to
+    :func:`~pyngrok.ngrok.connect` are given with the ``ngrok_tunnel`` marker.
+
+    .. code-block:: python
+
+        @pytest.mark.ngrok_tunnel("8000", domain="my-domain.ngrok.dev")
+        def test_webhook(ngrok_tunnel):
+            assert ngrok_tunnel.public_url == "https://my-domain.ngrok.dev"
+    """
+    marker = request.node.get_closest_marker("ngrok_tunnel")
+    args = marker.args if marker is not None else ()
+    kwargs = marker.kwargs if marker is not None else {}
+
+    return ngrok_connect(*args, **kwargs)
+
+
+def _get_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+
+    return port
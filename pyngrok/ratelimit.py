@@ -0,0 +1,55 @@
+__copyright__ = "Copyright (c) 2018-2025 Alex Laird"
+__license__ = "MIT"
+
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket that allows ``rate`` acquisitions per second, with bursts of up to ``capacity``.
+    It paces :func:`~pyngrok.agent.replay_many` and :func:`~pyngrok.har.replay_har` when they are given a
+    ``rate``.
+
+    .. code-block:: python
+
+        from pyngrok.ratelimit import TokenBucket
+
+        bucket = TokenBucket(10)
+
+        for request in requests:
+            # Blocks as needed, so no more than 10 requests are sent per second
+            bucket.acquire()
+            send(request)
+    """
+
+    def __init__(self,
+                 rate: float,
+                 capacity: float = 1) -> None:
+        if rate <= 0:
+            raise ValueError("\"rate\" must be greater than 0.")
+
+        #: The number of acquisitions allowed per second.
+        self.rate: float = rate
+        #: The max number of acquisitions that can be made at once after the bucket has been idle.
+        self.capacity: float = capacity
+
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Take a token from the bucket, blocking until one is available.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+
+            # Reserve the token now, so concurrent callers queue up behind it rather than racing for it
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+
+        if wait:
+            time.sleep(wait)
@@ -0,0 +1,296 @@
+__copyright__ = "Copyright (c) 2018-2025 Alex Laird"
+__license__ = "MIT"
+
+import copy
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from pyngrok import conf, ngrok, process
+from pyngrok.conf import PyngrokConfig
+from pyngrok.exception import PyngrokError
+from pyngrok.ngrok import NgrokTunnel
+
+logger = logging.getLogger(__name__)
+
+#: The default number of tunnels :func:`~pyngrok.reconciler.apply` creates or deletes at once.
+DEFAULT_CONCURRENCY = 4
+
+
+class TunnelSpec:
+    """
+    The desired state of a tunnel, with the same arguments as :func:`~pyngrok.ngrok.connect`. Unlike with
+    :func:`~pyngrok.ngrok.connect`, a ``name`` is required, since it is what a live tunnel is matched on.
+    """
+
+    def __init__(self,
+                 name: str,
+                 addr: Optional[str] = None,
+                 proto: Optional[Union[str, int]] = None,
+                 **options: Any) -> None:
+        if not name:
+            raise ValueError("\"name\" is required.")
+
+        #: The name of the tunnel, or of a definition in ``ngrok``'s config file.
+        self.name: str = name
+        #: The local port or address the tunnel forwards to.
+        self.addr: Optional[str] = addr
+        #: The tunnel protocol.
+        self.proto: Optional[Union[str, int]] = proto
+        #: The remaining configuration for the ``ngrok`` agent.
+        self.options: Dict[str, Any] = options
+
+        self._normalized: Optional[Tuple[Tuple[Any, ...], Dict[str, Any]]] = None
+
+    def normalize(self,
+                  pyngrok_config: PyngrokConfig) -> Dict[str, Any]:
+        """
+        Get the options :func:`~pyngrok.ngrok.connect` would send to ``ngrok`` for this spec, after merging in any
+        matching definition from ``ngrok``'s config file and upgrading legacy params. The result is cached until
+        the config file changes.
+
+        :param pyngrok_config: The ``pyngrok`` configuration to normalize against.
+        :return: The normalized options, including the ``name`` the tunnel will be started with.
+        """
+        config_path = conf.get_config_path(pyngrok_config)
+        key = (config_path,
+               os.path.getmtime(config_path) if os.path.exists(config_path) else None,
+               pyngrok_config.config_version,
+               pyngrok_config.ngrok_version)
+
+        if self._normalized is None or self._normalized[0] != key:
+            options = copy.deepcopy(self.options)
+            ngrok._interpolate_tunnel_definition(pyngrok_config, options, self.addr, self.proto, self.name)
+            ngrok._upgrade_legacy_params(pyngrok_config, options)
+
+            self._normalized = (key, options)
+
+        return self._normalized[1]
+
+    def __repr__(self) -> str:
+        return f"<TunnelSpec: \"{self.name}\">"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"TunnelSpec: \"{self.name}\""
+
+
+class ReconcilePlan:
+    """
+    An object containing the changes needed to bring the live tunnels to their desired state. A spec whose live
+    tunnel has different options is both deleted and created, since a tunnel can't be changed in place.
+    """
+
+    def __init__(self,
+                 create: List[TunnelSpec],
+                 delete: List[NgrokTunnel],
+                 unchanged: List[NgrokTunnel]) -> None:
+        #: The specs that need a tunnel created.
+        self.create: List[TunnelSpec] = create
+        #: The live tunnels that need to be deleted.
+        self.delete: List[NgrokTunnel] = delete
+        #: The live tunnels that already match their spec.
+        self.unchanged: List[NgrokTunnel] = unchanged
+
+    @property
+    def empty(self) -> bool:
+        """
+        Whether there is nothing to create or delete.
+        """
+        return not self.create and not self.delete
+
+    def __repr__(self) -> str:
+        return f"<ReconcilePlan: create={len(self.create)} delete={len(self.delete)}>"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"ReconcilePlan: create={len(self.create)} delete={len(self.delete)}"
+
+
+class ReconcileResult:
+    """
+    An object containing the outcome of applying a :class:`~pyngrok.reconciler.ReconcilePlan`.
+    """
+
+    def __init__(self,
+                 plan: ReconcilePlan,
+                 created: List[NgrokTunnel],
+                 deleted: List[NgrokTunnel],
+                 errors: Dict[str, PyngrokError]) -> None:
+        #: The plan that was applied.
+        self.plan: ReconcilePlan = plan
+        #: The tunnels that were created.
+        self.created: List[NgrokTunnel] = created
+        #: The tunnels that were deleted.
+        self.deleted: List[NgrokTunnel] = deleted
+        #: The errors for the changes that failed, keyed by the tunnel's name (or public URL, if it has no name).
+        self.errors: Dict[str, PyngrokError] = errors
+
+    @property
+    def ok(self) -> bool:
+        """
+        Whether every change succeeded.
+        """
+        return not self.errors
+
+    def __repr__(self) -> str:
+        return f"<ReconcileResult: created={len(self.created)} deleted={len(self.deleted)} ok={self.ok}>"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"ReconcileResult: created={len(self.created)} deleted={len(self.deleted)} ok={self.ok}"
+
+
+def plan(specs: Iterable[TunnelSpec],
+         pyngrok_config: Optional[PyngrokConfig] = None,
+         prune: bool = True) -> ReconcilePlan:
+    """
+    Compute the minimal changes needed to bring the live tunnels to the given desired state. A live tunnel matches
+    a spec when it has the spec's name and was started with the same normalized options. Tunnels that were not
+    started by this Python process have no known options, so they match on name alone.
+
+    If ``ngrok`` is not running and there are no specs, nothing will be started.
+
+    :param specs: The desired tunnels.
+    :param pyngrok_config: A ``pyngrok`` configuration to use when interacting with the ``ngrok`` binary,
+        overriding :func:`~pyngrok.conf.get_default()`.
+    :param prune: Delete live tunnels that have no spec.
+    :return: The plan.
+    :raises: :py:class:`ValueError`: When more than one spec has the same name.
+    """
+    if pyngrok_config is None:
+        pyngrok_config = conf.get_default()
+
+    desired: Dict[str, Tuple[TunnelSpec, Dict[str, Any]]] = {}
+    for spec in specs:
+        options = spec.normalize(pyngrok_config)
+        if options["name"] in desired:
+            raise ValueError(f"More than one spec has the name \"{spec.name}\".")
+        desired[options["name"]] = (spec, options)
+
+    if not desired and not process.is_process_running(pyngrok_config.ngrok_path):
+        return ReconcilePlan([], [], [])
+
+    ngrok_process = ngrok.get_ngrok_process(pyngrok_config)
+    live = ngrok.get_tunnels(pyngrok_config)
+
+    create = []
+    delete = []
+    unchanged = []
+    matched = set()
+    for tunnel in live:
+        spec_and_options = desired.get(tunnel.name) if tunnel.name is not None else None
+        if spec_and_options is None:
+            if prune:
+                delete.append(tunnel)
+            else:
+                unchanged.append(tunnel)
+            continue
+
+        spec, options = spec_and_options
+        definition = ngrok_process._tunnel_definitions.get(tunnel.name) if tunnel.name is not None else None
+        if definition is None or definition == options:
+            unchanged.append(tunnel)
+            matched.add(tunnel.name)
+        else:
+            logger.debug(f"Tunnel \"{tunnel.name}\" does not match its spec, replacing it")
+
+            delete.append(tunnel)
+
+    for name, (spec, options) in desired.items():
+        if name not in matched:
+            create.append(spec)
+
+    return ReconcilePlan(create, delete, unchanged)
+
+
+def apply(reconcile_plan: ReconcilePlan,
+          pyngrok_config: Optional[PyngrokConfig] = None,
+          concurrency: int = DEFAULT_CONCURRENCY) -> ReconcileResult:
+    """
+    Apply the given plan, with up to ``concurrency`` changes in flight at once. All deletes finish before any
+    creates start, so a replaced tunnel's name is free to be reused. A failed change does not stop the others; its
+    error is instead set on the result.
+
+    :param reconcile_plan: The plan to apply.
+    :param pyngrok_config: A ``pyngrok`` configuration to use when interacting with the ``ngrok`` binary,
+        overriding :func:`~pyngrok.conf.get_default()`.
+    :param concurrency: The max number of changes in flight at once.
+    :return: The outcome.
+    """
+    if pyngrok_config is None:
+        pyngrok_config = conf.get_default()
+    if concurrency < 1:
+        raise ValueError("\"concurrency\" must be at least 1.")
+
+    created: List[NgrokTunnel] = []
+    deleted: List[NgrokTunnel] = []
+    errors: Dict[str, PyngrokError] = {}
+
+    if reconcile_plan.empty:
+        return ReconcileResult(reconcile_plan, created, deleted, errors)
+
+    def delete(tunnel: NgrokTunnel) -> Optional[PyngrokError]:
+        try:
+            ngrok.disconnect(str(tunnel.public_url), pyngrok_config)
+        except PyngrokError as e:
+            return e
+
+        return None
+
+    def create(spec: TunnelSpec) -> Union[NgrokTunnel, PyngrokError]:
+        try:
+            return ngrok.connect(spec.addr, spec.proto, spec.name, pyngrok_config, **copy.deepcopy(spec.options))
+        except PyngrokError as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="pyngrok-reconcile") as executor:
+        for tunnel, error in zip(reconcile_plan.delete, executor.map(delete, reconcile_plan.delete)):
+            if error is None:
+                deleted.append(tunnel)
+            else:
+                logger.warning(f"Error deleting tunnel \"{tunnel.name or tunnel.public_url}\": {error}")
+
+                errors[str(tunnel.name or tunnel.public_url)] = error
+
+        for spec, outcome in zip(reconcile_plan.create, executor.map(create, reconcile_plan.create)):
+            if isinstance(outcome, NgrokTunnel):
+                created.append(outcome)
+            else:
+                logger.warning(f"Error creating tunnel \"{spec.name}\": {outcome}")
+
+                errors[spec.name] = outcome
+
+    return ReconcileResult(reconcile_plan, created, deleted, errors)
+
+
+def reconcile(specs: Iterable[TunnelSpec],
+              pyngrok_config: Optional[PyngrokConfig] = None,
+              prune: bool = True,
+              concurrency: int = DEFAULT_CONCURRENCY) -> ReconcileResult:
+    """
+    Bring the live tunnels to the given desired state, creating and deleting only the tunnels that differ from it.
+    Reconciling is idempotent: when nothing has changed, it only lists the live tunnels, so it is cheap to run on a
+    timer.
+
+    .. code-block:: python
+
+        from pyngrok import reconciler
+        from pyngrok.reconciler import TunnelSpec
+
+        specs = [TunnelSpec("web", "8000"),
+                 TunnelSpec("ssh", "22", "tcp")]
+
+        result = reconciler.reconcile(specs)
+
+    This is :func:`~pyngrok.reconciler.plan` followed by :func:`~pyngrok.reconciler.apply`.
+
+    :param specs: The desired tunnels.
+    :param pyngrok_config: A ``pyngrok`` configuration to use when interacting with the ``ngrok`` binary,
+        overriding :func:`~pyngrok.conf.get_default()`.
+    :param prune: Delete live tunnels that have no spec.
+    :param concurrency: The max number of changes in flight at once.
+    :return: The outcome.
+    """
+    if pyngrok_config is None:
+        pyngrok_config = conf.get_default()
+
+    return apply(plan(specs, pyngrok_config, prune), pyngrok_config, concurrency)
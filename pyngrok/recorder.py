@@ -0,0 +1,328 @@
+__copyright__ = "Copyright (c) 2018-2025 Alex Laird"
+__license__ = "MIT"
+
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+from pyngrok import agent, codec, conf, process
+from pyngrok.agent import CapturedRequest
+from pyngrok.conf import PyngrokConfig
+
+logger = logging.getLogger(__name__)
+
+#: The default interval, in seconds, between syncs by the recorder's background thread.
+DEFAULT_SYNC_INTERVAL = 5.0
+
+# How far before the latest recorded request a sync starts from, which covers the precision of stored start times
+_SYNC_OVERLAP = timedelta(milliseconds=1)
+
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS captured_requests (
+        id TEXT PRIMARY KEY,
+        tunnel_name TEXT,
+        method TEXT,
+        path TEXT,
+        status_code INTEGER,
+        remote_addr TEXT,
+        start TEXT,
+        start_ts REAL,
+        duration INTEGER,
+        data TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_captured_requests_start ON captured_requests (start_ts)",
+    "CREATE INDEX IF NOT EXISTS idx_captured_requests_tunnel ON captured_requests (tunnel_name, start_ts)",
+    "CREATE INDEX IF NOT EXISTS idx_captured_requests_method ON captured_requests (method, start_ts)",
+    "CREATE INDEX IF NOT EXISTS idx_captured_requests_path ON captured_requests (path, start_ts)",
+    "CREATE INDEX IF NOT EXISTS idx_captured_requests_status ON captured_requests (status_code, start_ts)",
+    "CREATE INDEX IF NOT EXISTS idx_captured_requests_remote_addr ON captured_requests (remote_addr, start_ts)",
+]
+
+
+class RequestRecorder:
+    """
+    Records :class:`~pyngrok.agent.CapturedRequest`'s in to a local SQLite database, indexed by tunnel, method,
+    path, status code, remote address, and start time. ``ngrok`` only keeps a small rolling window of captured
+    requests, so recording them keeps history beyond that window, and lets it be queried without going back to
+    the ``ngrok`` agent.
+
+    Requests are recorded with :func:`~pyngrok.recorder.RequestRecorder.record`, or pulled from the ``ngrok`` agent
+    with :func:`~pyngrok.recorder.RequestRecorder.sync`, which is called on an interval once
+    :func:`~pyngrok.recorder.RequestRecorder.start` has been called. Syncing will never start the ``ngrok`` process.
+
+    .. code-block:: python
+
+        from pyngrok import ngrok
+        from pyngrok.recorder import RequestRecorder
+
+        ngrok.connect(8000, name="webhooks")
+
+        recorder = RequestRecorder("requests.db", max_age=24 * 60 * 60)
+        recorder.start()
+
+        # ... later
+        failures = recorder.query(tunnel_name="webhooks", status_code=500)
+    """
+
+    def __init__(self,
+                 path: str = ":memory:",
+                 pyngrok_config: Optional[PyngrokConfig] = None,
+                 max_requests: Optional[int] = None,
+                 max_age: Optional[float] = None,
+                 sync_interval: float = DEFAULT_SYNC_INTERVAL) -> None:
+        #: The path to the SQLite database.
+        self.path: str = path
+        #: The ``pyngrok`` configuration of the ``ngrok`` process to sync requests from. If not set,
+        #: :func:`~pyngrok.conf.get_default()` is used at sync time.
+        self.pyngrok_config: Optional[PyngrokConfig] = pyngrok_config
+        #: The max number of requests to retain. When exceeded, the oldest requests are deleted.
+        self.max_requests: Optional[int] = max_requests
+        #: The max age, in seconds, of requests to retain, by their start time.
+        self.max_age: Optional[float] = max_age
+        #: How often, in seconds, requests are synced by the background thread.
+        self.sync_interval: float = sync_interval
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._stop_event = threading.Event()
+        self._sync_thread: Optional[threading.Thread] = None
+
+        with self._lock, self._connection:
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+
+    def record(self,
+               captured_requests: Iterable[CapturedRequest]) -> int:
+        """
+        Record the given requests. Requests that have already been recorded are skipped. Retention limits are
+        applied afterward.
+
+        :param captured_requests: The requests to record.
+        :return: The number of requests that were newly recorded.
+        """
+        rows = [_to_row(captured_request) for captured_request in captured_requests]
+
+        with self._lock, self._connection:
+            cursor = self._connection.executemany(
+                "INSERT OR IGNORE INTO captured_requests "
+                "(id, tunnel_name, method, path, status_code, remote_addr, start, start_ts, duration, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            recorded = max(cursor.rowcount, 0)
+
+            self._apply_retention()
+
+        return recorded
+
+    def sync(self,
+             tunnel_name: Optional[str] = None) -> int:
+        """
+        Record the requests captured by the ``ngrok`` agent since the most recently recorded request (for the given
+        tunnel name, if one is given), if the ``ngrok`` process is running.
+
+        :param tunnel_name: The tunnel name to filter by.
+        :return: The number of requests that were newly recorded.
+        """
+        pyngrok_config = self.pyngrok_config if self.pyngrok_config is not None else conf.get_default()
+
+        if not process.is_process_running(pyngrok_config.ngrok_path):
+            logger.debug(f"\"ngrok_path\" {pyngrok_config.ngrok_path} is not running a process, nothing to sync")
+
+            return 0
+
+        where, params = self._where(tunnel_name or None, None, None, None, None, None, None)
+        with self._lock:
+            latest_ts = self._connection.execute(f"SELECT MAX(start_ts) FROM captured_requests{where}",
+                                                 params).fetchone()[0]
+
+        since = None
+        if latest_ts is not None:
+            # Requests that started at the same time as the latest one recorded may not have been recorded yet, so
+            # the cutoff is backed off, and those that were already recorded are ignored when inserted
+            since = datetime.fromtimestamp(latest_ts, timezone.utc) - _SYNC_OVERLAP
+
+        return self.record(agent.iter_requests(tunnel_name, since=since, follow=False,
+                                               pyngrok_config=pyngrok_config))
+
+    def get(self,
+            request_id: str) -> Optional[CapturedRequest]:
+        """
+        Get the recorded request with the given ID.
+
+        :param request_id: The ID of the request.
+        :return: The request, or ``None`` if it has not been recorded.
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT data FROM captured_requests WHERE id = ?",
+                                           (request_id,)).fetchone()
+
+        return CapturedRequest(codec.loads(row[0])) if row is not None else None
+
+    def query(self,
+              tunnel_name: Optional[str] = None,
+              method: Optional[str] = None,
+              path: Optional[str] = None,
+              status_code: Optional[int] = None,
+              remote_addr: Optional[str] = None,
+              start_after: Optional[Union[str, datetime]] = None,
+              start_before: Optional[Union[str, datetime]] = None,
+              limit: Optional[int] = None,
+              newest_first: bool = False) -> List[CapturedRequest]:
+        """
+        Query the recorded requests. All given filters must match.
+
+        :param tunnel_name: The tunnel name to filter by.
+        :param method: The HTTP method to filter by.
+        :param path: The request path, without its query string, to filter by.
+        :param status_code: The response status code to filter by.
+        :param remote_addr: The remote address to filter by.
+        :param start_after: Only include requests that started at or after this time, either as a
+            :py:class:`~datetime.datetime` (assumed to be UTC if naive) or an ISO 8601 string.
+        :param start_before: Only include requests that started before this time.
+        :param limit: The max number of requests to return.
+        :param newest_first: Order requests from newest to oldest, rather than oldest to newest.
+        :return: The requests.
+        """
+        where, params = self._where(tunnel_name, method, path, status_code, remote_addr, start_after, start_before)
+
+        sql = f"SELECT data FROM captured_requests{where} ORDER BY start_ts {'DESC' if newest_first else 'ASC'}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+
+        return [CapturedRequest(codec.loads(row[0])) for row in rows]
+
+    def count(self,
+              tunnel_name: Optional[str] = None,
+              method: Optional[str] = None,
+              path: Optional[str] = None,
+              status_code: Optional[int] = None,
+              remote_addr: Optional[str] = None,
+              start_after: Optional[Union[str, datetime]] = None,
+              start_before: Optional[Union[str, datetime]] = None) -> int:
+        """
+        Count the recorded requests. Filters are the same as for :func:`~pyngrok.recorder.RequestRecorder.query`.
+
+        :return: The number of matching requests.
+        """
+        where, params = self._where(tunnel_name, method, path, status_code, remote_addr, start_after, start_before)
+
+        with self._lock:
+            count: int = self._connection.execute(f"SELECT COUNT(*) FROM captured_requests{where}",
+                                                  params).fetchone()[0]
+
+        return count
+
+    def start(self) -> None:
+        """
+        Start a thread that syncs requests every ``sync_interval`` seconds. If the thread is already running,
+        nothing will be done.
+        """
+        if self._sync_thread is None:
+            self._stop_event.clear()
+            self._sync_thread = threading.Thread(target=self._sync_loop, daemon=True)
+            self._sync_thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the sync thread, if running.
+        """
+        if self._sync_thread is not None:
+            self._stop_event.set()
+            self._sync_thread.join()
+            self._sync_thread = None
+
+    def close(self) -> None:
+        """
+        Stop the sync thread, if running, and close the database.
+        """
+        self.stop()
+
+        with self._lock:
+            self._connection.close()
+
+    def _sync_loop(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.sync()
+            except Exception as e:
+                logger.warning(f"Error syncing captured requests: {e}")
+
+            self._stop_event.wait(self.sync_interval)
+
+    def _apply_retention(self) -> None:
+        if self.max_age is not None:
+            expires_before = time.time() - self.max_age
+            # A request whose start time couldn't be parsed falls back to insertion order, so it expires along with
+            # any request recorded after it
+            self._connection.execute("DELETE FROM captured_requests WHERE start_ts IS NULL AND rowid < "
+                                     "(SELECT MAX(rowid) FROM captured_requests WHERE start_ts < ?)",
+                                     (expires_before,))
+            self._connection.execute("DELETE FROM captured_requests WHERE start_ts < ?", (expires_before,))
+        if self.max_requests is not None:
+            # NULLs sort last, so requests without a start time are the first to go
+            self._connection.execute("DELETE FROM captured_requests WHERE id NOT IN "
+                                     "(SELECT id FROM captured_requests ORDER BY start_ts DESC LIMIT ?)",
+                                     (self.max_requests,))
+
+    @staticmethod
+    def _where(tunnel_name: Optional[str],
+               method: Optional[str],
+               path: Optional[str],
+               status_code: Optional[int],
+               remote_addr: Optional[str],
+               start_after: Optional[Union[str, datetime]],
+               start_before: Optional[Union[str, datetime]]) -> Tuple[str, List[Any]]:
+        clauses = []
+        params: List[Any] = []
+        for column, value in [("tunnel_name", tunnel_name),
+                              ("method", method.upper() if method else None),
+                              ("path", path),
+                              ("status_code", status_code),
+                              ("remote_addr", remote_addr)]:
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if start_after is not None:
+            clauses.append("start_ts >= ?")
+            params.append(_timestamp(start_after))
+        if start_before is not None:
+            clauses.append("start_ts < ?")
+            params.append(_timestamp(start_before))
+
+        return (f" WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+
+def _to_row(captured_request: CapturedRequest) -> Tuple[Any, ...]:
+    request = captured_request.request or {}
+    response = captured_request.response or {}
+    start = agent._parse_start(captured_request.start)
+
+    return (captured_request.id,
+            captured_request.tunnel_name,
+            request.get("method"),
+            urlparse(request.get("uri") or "").path or None,
+            response.get("status_code"),
+            captured_request.remote_addr,
+            captured_request.start,
+            start.timestamp() if start is not None else None,
+            captured_request.duration,
+            codec.dumps(captured_request.data).decode("utf-8"))
+
+
+def _timestamp(value: Union[str, datetime]) -> float:
+    parsed = agent._parse_start(value) if isinstance(value, str) else value
+    if parsed is None:
+        raise ValueError(f"Unable to parse time: {value}")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+
+    return parsed.timestamp()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+
+__copyright__ = "Copyright (c) 2018-2025 Alex Laird"
+__license__ = "MIT"
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.request import urlopen
+
+import yaml
+
+from pyngrok import __version__, codec, fake_agent, installer, ngrok, process
+from pyngrok.conf import PyngrokConfig
+from pyngrok.log import NgrokLog
+
+DEFAULT_OUTPUT = os.path.join("build", "benchmarks", "results.json")
+
+SAMPLE_LOG_LINES = [
+    "t=2024-05-01T12:00:00+0000 lvl=info msg=\"no configuration paths supplied\"",
+    "t=2024-05-01T12:00:00+0000 lvl=info msg=\"open config file\" path=/home/user/.config/ngrok/ngrok.yml err=nil",
+    "t=2024-05-01T12:00:00+0000 lvl=info msg=\"starting web service\" obj=web addr=127.0.0.1:4040 allow_hosts=[]",
+    "t=2024-05-01T12:00:01+0000 lvl=info msg=\"client session established\" obj=csess id=0123456789ab",
+    "t=2024-05-01T12:00:01+0000 lvl=info msg=\"tunnel session started\" obj=tunnels.session",
+    "t=2024-05-01T12:00:02+0000 lvl=info msg=\"started tunnel\" obj=tunnels name=http-80 addr=http://localhost:80 "
+    "url=https://0123456789ab.ngrok-free.app",
+    "t=2024-05-01T12:00:03+0000 lvl=warn msg=\"failed to check for update\" obj=updater err=\"Post "
+    "\\\"https://update.equinox.io/check\\\": context deadline exceeded\"",
+    "t=2024-05-01T12:00:04+0000 lvl=eror msg=\"session closing\" obj=tunnels.session err=\"authentication failed\"",
+]
+
+
+def run_benchmarks(output, scale=1.0, only=None):
+    """
+    Run ``pyngrok``'s benchmark suite against a fake agent, then write the results as JSON.
+
+    :param output: The path the JSON results are written to.
+    :param scale: A multiplier for the number of iterations each benchmark runs.
+    :param only: If given, the names of the benchmarks to run.
+    :return: The results.
+    """
+    work_dir = tempfile.mkdtemp(prefix="pyngrok-benchmark-")
+    pyngrok_config = PyngrokConfig(ngrok_path=os.path.join(work_dir, installer.get_ngrok_bin()),
+                                   config_path=os.path.join(work_dir, "config.yml"))
+    fake_agent.install_fake_agent(pyngrok_config.ngrok_path)
+    ngrok.install_ngrok(pyngrok_config)
+
+    benchmarks = {
+        "start_process": lambda: benchmark_start_process(pyngrok_config, _iterations(10, scale)),
+        "connect_disconnect": lambda: benchmark_connect_disconnect(pyngrok_config, _iterations(100, scale)),
+        "get_tunnels": lambda: benchmark_get_tunnels(pyngrok_config, _iterations(50, scale)),
+        "log_parse": lambda: benchmark_log_parse(_iterations(5000, scale)),
+        "get_ngrok_config": lambda: benchmark_get_ngrok_config(work_dir, _iterations(20, scale)),
+        "get_requests": lambda: benchmark_get_requests(pyngrok_config, _iterations(20, scale)),
+    }
+
+    results = {
+        "pyngrok_version": __version__,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "scale": scale,
+        "benchmarks": {},
+    }
+    try:
+        for name, benchmark in benchmarks.items():
+            if only and name not in only:
+                continue
+
+            print(f"--> Running benchmark: {name}")
+            results["benchmarks"][name] = benchmark()
+            ngrok.kill(pyngrok_config)
+    finally:
+        ngrok.kill(pyngrok_config)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    output_dir = os.path.dirname(output)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print(f"--> Results written to {output}")
+
+    return results
+
+
+def benchmark_start_process(pyngrok_config, iterations):
+    """
+    Measure the time from spawning the agent until ``pyngrok`` considers it healthy.
+    """
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        ngrok_process = process._start_process(pyngrok_config)
+        samples.append(time.perf_counter() - start)
+
+        process.kill_process(pyngrok_config.ngrok_path)
+        ngrok_process.proc.wait()
+
+    return {"time_to_healthy": _summarize(samples)}
+
+
+def benchmark_connect_disconnect(pyngrok_config, iterations):
+    """
+    Measure ``connect()`` followed by ``disconnect()`` round trips per second at several concurrency levels.
+    """
+    ngrok.get_ngrok_process(pyngrok_config)
+
+    def connect_disconnect(port):
+        start = time.perf_counter()
+        tunnel = ngrok.connect(port, pyngrok_config=pyngrok_config)
+        ngrok.disconnect(tunnel.public_url, pyngrok_config=pyngrok_config)
+        return time.perf_counter() - start
+
+    results = {}
+    for concurrency in [1, 4, 16]:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            start = time.perf_counter()
+            samples = list(executor.map(connect_disconnect, range(8000, 8000 + iterations)))
+            elapsed = time.perf_counter() - start
+
+        results[f"concurrency_{concurrency}"] = {
+            "ops_per_sec": round(iterations / elapsed, 2),
+            "latency": _summarize(samples),
+        }
+
+    return results
+
+
+def benchmark_get_tunnels(pyngrok_config, iterations):
+    """
+    Measure ``get_tunnels()`` latency as the number of active tunnels grows.
+    """
+    ngrok.get_ngrok_process(pyngrok_config)
+
+    results = {}
+    active = 0
+    for tunnel_count in [1, 10, 100]:
+        while active < tunnel_count:
+            ngrok.connect(9000 + active, pyngrok_config=pyngrok_config)
+            active += 1
+
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            ngrok.get_tunnels(pyngrok_config)
+            samples.append(time.perf_counter() - start)
+
+        results[f"tunnels_{tunnel_count}"] = _summarize(samples)
+
+    return results
+
+
+def benchmark_log_parse(iterations):
+    """
+    Measure :class:`~pyngrok.log.NgrokLog` parse throughput over representative ``ngrok`` log lines.
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for line in SAMPLE_LOG_LINES:
+            NgrokLog(line)
+    elapsed = time.perf_counter() - start
+
+    line_count = iterations * len(SAMPLE_LOG_LINES)
+
+    return {"lines": line_count, "lines_per_sec": round(line_count / elapsed, 2)}
+
+
+def benchmark_get_ngrok_config(work_dir, iterations):
+    """
+    Measure ``get_ngrok_config()`` latency, both uncached and cached, as the number of tunnel definitions grows.
+    """
+    results = {}
+    for definition_count in [10, 100, 1000]:
+        config_path = os.path.join(work_dir, f"config_{definition_count}.yml")
+        tunnels = {f"tunnel-{i}": {"proto": "http", "addr": 8000 + i, "inspect": False}
+                   for i in range(definition_count)}
+        with open(config_path, "w") as f:
+            yaml.dump({"version": "2", "region": "us", "tunnels": tunnels}, f)
+
+        uncached = []
+        cached = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            installer.get_ngrok_config(config_path, use_cache=False)
+            uncached.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            installer.get_ngrok_config(config_path)
+            cached.append(time.perf_counter() - start)
+
+        results[f"definitions_{definition_count}"] = {"uncached": _summarize(uncached),
+                                                      "cached": _summarize(cached)}
+
+    return results
+
+
+def benchmark_get_requests(pyngrok_config, iterations):
+    """
+    Measure decoding a large ``/api/requests/http`` response with each installed JSON codec, both on its own and
+    end to end through ``api_request()``.
+    """
+    api_url = ngrok.get_ngrok_process(pyngrok_config).api_url
+    ngrok.api_request(f"{api_url}/_fake/requests", method="POST",
+                      data={"method": "POST", "uri": "/webhook", "body": "x" * 8192,
+                            "count": fake_agent.DEFAULT_MAX_REQUESTS})
+    with urlopen(f"{api_url}/api/requests/http") as response:
+        body = response.read()
+
+    results = {"response_bytes": len(body)}
+    try:
+        for name in codec.available_codecs():
+            codec.set_codec(name)
+            # Warm up, so the first codec measured isn't penalized for allocating the process's memory
+            codec.loads(body)
+
+            decode = []
+            api_request = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                codec.loads(body)
+                decode.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                ngrok.api_request(f"{api_url}/api/requests/http")
+                api_request.append(time.perf_counter() - start)
+
+            results[name] = {"decode": _summarize(decode), "api_request": _summarize(api_request)}
+    finally:
+        codec.set_codec(None)
+
+    return results
+
+
+def _iterations(base, scale):
+    return max(1, int(base * scale))
+
+
+def _summarize(samples):
+    """
+    Summarize the given samples, in seconds, as milliseconds.
+    """
+    ordered = sorted(samples)
+
+    return {
+        "count": len(ordered),
+        "min_ms": round(ordered[0] * 1000, 3),
+        "median_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run pyngrok's benchmarks against a fake ngrok agent.")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="The path the JSON results are written to.")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="A multiplier for the number of iterations each benchmark runs.")
+    parser.add_argument("--only", nargs="*", help="The names of the benchmarks to run.")
+    args = parser.parse_args()
+
+    if installer.get_system() == "windows":
+        print("Benchmarks are not supported on Windows, as the fake agent requires POSIX.")
+        sys.exit(1)
+
+    run_benchmarks(args.output, args.scale, args.only)
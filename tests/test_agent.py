@@ -1,9 +1,13 @@
 __copyright__ = "Copyright (c) 2018-2025 Alex Laird"
 __license__ = "MIT"
 
+import base64
 import os
+import platform
 import time
 import unittest
+from datetime import datetime, timezone
+from unittest import mock
 from urllib.parse import urlparse
 from urllib.request import urlopen
 
@@ -74,3 +78,154 @@ class TestAgent(NgrokTestCase):
         self.assertEqual("online", response.status)
         self.assertIsNotNone(response.agent_version)
         self.assertIsNotNone(response.uri)
+
+    @unittest.skipIf(platform.system() == "Windows", "The fake agent is not supported on Windows")
+    def test_iter_requests(self):
+        # GIVEN
+        self.given_fake_ngrok_installed(self.pyngrok_config)
+        api_url = ngrok.get_ngrok_process(self.pyngrok_config).api_url
+        self.given_captured_requests(api_url, "my-tunnel", 3)
+        self.given_captured_requests(api_url, "other-tunnel", 1)
+        ids = [r.id for r in reversed(agent.get_requests(pyngrok_config=self.pyngrok_config))]
+
+        # WHEN
+        all_requests = list(agent.iter_requests(follow=False, pyngrok_config=self.pyngrok_config))
+        tunnel_requests = list(agent.iter_requests("my-tunnel", follow=False, pyngrok_config=self.pyngrok_config))
+        since_requests = list(agent.iter_requests(since=all_requests[1].start, follow=False,
+                                                  pyngrok_config=self.pyngrok_config))
+        limited_requests = list(agent.iter_requests(limit=2, follow=False, pyngrok_config=self.pyngrok_config))
+
+        # THEN
+        self.assertEqual(ids, [r.id for r in all_requests])
+        self.assertEqual(ids[:3], [r.id for r in tunnel_requests])
+        self.assertEqual(ids[2:], [r.id for r in since_requests])
+        self.assertEqual(ids[2:], [r.id for r in limited_requests])
+
+    def test_parse_start(self):
+        # GIVEN
+        starts = {"2025-01-02T03:04:05.1Z": 100000,
+                  "2025-01-02T03:04:05.12345Z": 123450,
+                  "2025-01-02T03:04:05.123456789Z": 123456,
+                  "2025-01-02T03:04:05Z": 0}
+
+        for start, microsecond in starts.items():
+            # WHEN
+            parsed = agent._parse_start(start)
+
+            # THEN
+            self.assertEqual(datetime(2025, 1, 2, 3, 4, 5, microsecond, tzinfo=timezone.utc), parsed)
+
+        # WHEN
+        parsed = agent._parse_start("2025-01-02T03:04:05.5-07:00")
+
+        # THEN
+        self.assertEqual(datetime(2025, 1, 2, 10, 4, 5, 500000, tzinfo=timezone.utc), parsed)
+        self.assertIsNone(agent._parse_start("not a time"))
+
+    @unittest.skipIf(platform.system() == "Windows", "The fake agent is not supported on Windows")
+    def test_iter_requests_follow(self):
+        # GIVEN
+        self.given_fake_ngrok_installed(self.pyngrok_config)
+        api_url = ngrok.get_ngrok_process(self.pyngrok_config).api_url
+        self.given_captured_requests(api_url, "my-tunnel", 2)
+        requests = agent.iter_requests(poll_interval=0.01, max_poll_interval=0.05,
+                                       pyngrok_config=self.pyngrok_config)
+
+        # WHEN
+        first_requests = [next(requests), next(requests)]
+        self.given_captured_requests(api_url, "my-tunnel", 25)
+        with mock.patch("pyngrok.agent.api_request", wraps=agent.api_request) as mock_api_request:
+            followed_requests = [next(requests) for _ in range(25)]
+
+        # THEN
+        ids = [r.id for r in reversed(agent.get_requests(pyngrok_config=self.pyngrok_config))]
+        self.assertEqual(ids[:2], [r.id for r in first_requests])
+        self.assertEqual(ids[2:], [r.id for r in followed_requests])
+        # Once caught up, only a small page is fetched, grown until it reaches requests already seen
+        self.assertEqual([10, 20, 40], [c.kwargs["params"]["limit"] for c in mock_api_request.call_args_list])
+
+    def test_captured_request_lazy_decoding(self):
+        # GIVEN
+        raw_request = b"POST /webhook HTTP/1.1\r\nContent-Type: application/json\r\nX-Tag: a\r\nX-Tag: b\r\n\r\n" \
+                      b'{"event": "created"}'
+        raw_response = b"HTTP/1.1 204 No Content\r\n\r\n"
+        captured_request = agent.CapturedRequest({
+            "id": "airt_1",
+            "request": {"method": "POST", "uri": "/webhook", "raw": base64.b64encode(raw_request).decode()},
+            "response": {"status_code": 204, "headers": {"Server": ["test"]},
+                         "raw": base64.b64encode(raw_response).decode()},
+        })
+
+        # WHEN
+        with mock.patch("base64.b64decode", wraps=base64.b64decode) as mock_b64decode:
+            request_body = captured_request.request_body
+            request_json = captured_request.request_json
+
+        # THEN
+        self.assertEqual(1, mock_b64decode.call_count)
+        self.assertIsInstance(request_body, memoryview)
+        self.assertIs(captured_request.request_raw, request_body.obj)
+        self.assertEqual(b'{"event": "created"}', request_body.tobytes())
+        self.assertEqual({"event": "created"}, request_json)
+        self.assertEqual({"Content-Type": ["application/json"], "X-Tag": ["a", "b"]},
+                         captured_request.request_headers)
+        self.assertEqual(b"", captured_request.response_body.tobytes())
+        self.assertIsNone(captured_request.response_json)
+        self.assertEqual({"Server": ["test"]}, captured_request.response_headers)
+
+    @unittest.skipIf(platform.system() == "Windows", "The fake agent is not supported on Windows")
+    def test_get_requests_without_raw(self):
+        # GIVEN
+        self.given_fake_ngrok_installed(self.pyngrok_config)
+        api_url = ngrok.get_ngrok_process(self.pyngrok_config).api_url
+        ngrok.api_request(f"{api_url}/_fake/requests", method="POST",
+                          data={"tunnel_name": "my-tunnel", "method": "POST", "body": "{\"id\": 1}"})
+
+        # WHEN
+        captured_request = agent.get_requests(pyngrok_config=self.pyngrok_config)[0]
+        summary_request = agent.get_requests(pyngrok_config=self.pyngrok_config, include_raw=False)[0]
+
+        # THEN
+        self.assertEqual({"id": 1}, captured_request.request_json)
+        self.assertEqual(captured_request.id, summary_request.id)
+        self.assertNotIn("raw", summary_request.request)
+        self.assertNotIn("raw", summary_request.response)
+        self.assertIsNone(summary_request.request_body)
+        self.assertIsNone(summary_request.request_json)
+        self.assertEqual(captured_request.request_headers, summary_request.request_headers)
+
+    @unittest.skipIf(platform.system() == "Windows", "The fake agent is not supported on Windows")
+    def test_replay_many(self):
+        # GIVEN
+        self.given_fake_ngrok_installed(self.pyngrok_config)
+        api_url = ngrok.get_ngrok_process(self.pyngrok_config).api_url
+        self.given_captured_requests(api_url, "my-tunnel", 5)
+        ids = [r.id for r in agent.get_requests(pyngrok_config=self.pyngrok_config)]
+
+        # WHEN
+        start = time.monotonic()
+        results = agent.replay_many(ids + ["does-not-exist"], tunnel_name="other-tunnel", concurrency=3, rate=20,
+                                    pyngrok_config=self.pyngrok_config)
+        elapsed = time.monotonic() - start
+
+        # THEN
+        self.assertEqual(ids + ["does-not-exist"], [r.request_id for r in results])
+        self.assertTrue(all(r.ok for r in results[:5]))
+        self.assertTrue(all(r.latency > 0 for r in results))
+        self.assertFalse(results[5].ok)
+        self.assertEqual(404, results[5].error.status_code)
+        self.assertEqual(5, len(agent.get_requests("other-tunnel", pyngrok_config=self.pyngrok_config)))
+        # Six replays at 20 per second, the first of which is not delayed
+        self.assertGreaterEqual(elapsed, 0.25)
+
+    def test_replay_many_invalid(self):
+        # WHEN
+        with self.assertRaises(ValueError):
+            agent.replay_many(["1"], concurrency=0, pyngrok_config=self.pyngrok_config)
+        with self.assertRaises(ValueError):
+            agent.replay_many(["1"], rate=0, pyngrok_config=self.pyngrok_config)
+
+    @staticmethod
+    def given_captured_requests(api_url, tunnel_name, count):
+        ngrok.api_request(f"{api_url}/_fake/requests", method="POST",
+                          data={"tunnel_name": tunnel_name, "uri": "/webhook", "count": count})
@@ -0,0 +1,104 @@
+__copyright__ = "Copyright (c) 2018-2025 Alex Laird"
+__license__ = "MIT"
+
+import random
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from pyngrok import analytics
+from pyngrok.agent import CapturedRequest
+from pyngrok.exception import PyngrokError
+from tests.testcase import NgrokTestCase
+
+
+class TestAnalytics(NgrokTestCase):
+    def setUp(self):
+        super(TestAnalytics, self).setUp()
+
+        self.start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    def test_analyze(self):
+        # GIVEN
+        captured_requests = [
+            self.given_captured_request("my-tunnel", "GET", "/health?verbose=1", 200, 10, 0),
+            self.given_captured_request("my-tunnel", "GET", "/health", 200, 20, 1),
+            self.given_captured_request("my-tunnel", "POST", "/webhook", 500, 30, 61),
+            self.given_captured_request("other-tunnel", "POST", "/webhook", 201, 40, 185),
+            self.given_captured_request("other-tunnel", "POST", "/webhook", 201, None, 190),
+        ]
+
+        # WHEN
+        report = analytics.analyze(iter(captured_requests), percentiles=[50, 90], use_numpy=False)
+
+        # THEN
+        self.assertEqual(4, report.total.count)
+        self.assertAlmostEqual(0.025, report.total.mean)
+        self.assertAlmostEqual(0.01, report.total.min)
+        self.assertAlmostEqual(0.04, report.total.max)
+        self.assertAlmostEqual(0.025, report.total.percentiles[50])
+        self.assertAlmostEqual(0.037, report.total.percentiles[90])
+        self.assertEqual({200: 2, 201: 1, 500: 1}, report.total.status_codes)
+        self.assertEqual(["my-tunnel", "other-tunnel"], list(report.by_tunnel))
+        self.assertEqual(3, report.by_tunnel["my-tunnel"].count)
+        self.assertAlmostEqual(0.02, report.by_tunnel["my-tunnel"].percentiles[50])
+        self.assertEqual([("GET", "/health"), ("POST", "/webhook")], list(report.by_route))
+        self.assertEqual({201: 1, 500: 1}, report.by_route[("POST", "/webhook")].status_codes)
+        self.assertEqual([(self.start, 2), (self.start + timedelta(minutes=1), 1),
+                          (self.start + timedelta(minutes=2), 0), (self.start + timedelta(minutes=3), 1)],
+                         report.throughput)
+
+    def test_analyze_empty(self):
+        # WHEN
+        report = analytics.analyze([], use_numpy=False)
+
+        # THEN
+        self.assertIsNone(report.total)
+        self.assertEqual({}, report.by_tunnel)
+        self.assertEqual({}, report.by_route)
+        self.assertEqual([], report.throughput)
+
+    @unittest.skipIf(analytics._numpy is None, "NumPy is not installed")
+    def test_analyze_numpy(self):
+        # GIVEN
+        random.seed(7)
+        captured_requests = [
+            self.given_captured_request(random.choice(["a", "b", "c"]), random.choice(["GET", "POST"]),
+                                        random.choice(["/", "/webhook", "/health"]), random.choice([200, 404, 500]),
+                                        random.uniform(1, 500), random.uniform(0, 600))
+            for _ in range(2000)]
+
+        # WHEN
+        python_report = analytics.analyze(captured_requests, window=30, use_numpy=False)
+        numpy_report = analytics.analyze(captured_requests, window=30, use_numpy=True)
+
+        # THEN
+        self.assertEqual(python_report.throughput, numpy_report.throughput)
+        for python_summaries, numpy_summaries in [({None: python_report.total}, {None: numpy_report.total}),
+                                                  (python_report.by_tunnel, numpy_report.by_tunnel),
+                                                  (python_report.by_route, numpy_report.by_route)]:
+            self.assertEqual(set(python_summaries), set(numpy_summaries))
+            for key, python_summary in python_summaries.items():
+                numpy_summary = numpy_summaries[key]
+                self.assertEqual(python_summary.count, numpy_summary.count)
+                self.assertEqual(python_summary.status_codes, numpy_summary.status_codes)
+                self.assertAlmostEqual(python_summary.mean, numpy_summary.mean)
+                self.assertAlmostEqual(python_summary.max, numpy_summary.max)
+                for percentile, value in python_summary.percentiles.items():
+                    self.assertAlmostEqual(value, numpy_summary.percentiles[percentile])
+
+    def test_analyze_numpy_not_installed(self):
+        # WHEN
+        with mock.patch("pyngrok.analytics._numpy", None):
+            with self.assertRaises(PyngrokError):
+                analytics.analyze([], use_numpy=True)
+
+    def given_captured_request(self, tunnel_name, method, uri, status_code, duration_ms, seconds_after_start):
+        return CapturedRequest({
+            "id": f"airt_{random.random()}",
+            "tunnel_name": tunnel_name,
+            "start": (self.start + timedelta(seconds=seconds_after_start)).isoformat(),
+            "duration": int(duration_ms * 1000000) if duration_ms is not None else None,
+            "request": {"method": method, "uri": uri},
+            "response": {"status_code": status_code},
+        })
@@ -0,0 +1,84 @@
+__copyright__ = "Copyright (c) 2018-2025 Alex Laird"
+__license__ = "MIT"
+
+import json
+import platform
+import unittest
+from unittest import mock
+
+from pyngrok import codec, ngrok
+from pyngrok.codec import JSONCodec
+from pyngrok.exception import PyngrokError
+from pyngrok.ngrok import NgrokApiResponse
+from tests.testcase import NgrokTestCase
+
+
+class TestCodec(NgrokTestCase):
+    def tearDown(self):
+        codec.set_codec(None)
+
+        super(TestCodec, self).tearDown()
+
+    def test_codecs(self):
+        # GIVEN
+        data = {"tunnels": [{"name": "my-tunnel", "public_url": "https://ünïcode.ngrok.io", "metrics": {"count": 1}}]}
+        encoded = json.dumps(data).encode("utf-8")
+
+        for name in codec.available_codecs():
+            with self.subTest(codec=name):
+                # WHEN
+                codec.set_codec(name)
+
+                # THEN
+                self.assertEqual(name, codec.get_codec().name)
+                self.assertEqual(data, codec.loads(encoded))
+                self.assertEqual(data, codec.loads(memoryview(encoded)[0:]))
+                self.assertEqual(data, codec.loads(encoded.decode("utf-8")))
+                self.assertEqual(data, json.loads(codec.dumps(data)))
+                with self.assertRaises(ValueError):
+                    codec.loads(b"{\"tunnels\": ")
+
+    def test_get_codec_preferred(self):
+        # WHEN
+        preferred_codec = codec.get_codec()
+
+        # THEN
+        self.assertEqual(codec.available_codecs()[0], preferred_codec.name)
+        self.assertIn("json", codec.available_codecs())
+
+    def test_set_codec_not_installed(self):
+        # WHEN
+        with self.assertRaises(PyngrokError):
+            codec.set_codec("not-a-codec")
+
+    def test_from_body_bytes(self):
+        # WHEN
+        response = NgrokApiResponse.from_body(b"200 OK\n{\"id\": \"ep_1\"}")
+        str_response = NgrokApiResponse.from_body("200 OK\n{\"id\": \"ep_1\"}")
+        no_json_response = NgrokApiResponse.from_body(b"404 Not Found")
+
+        # THEN
+        self.assertEqual("200 OK\n", response.status)
+        self.assertEqual({"id": "ep_1"}, response.data)
+        self.assertEqual(response.data, str_response.data)
+        self.assertEqual("404 Not Found", no_json_response.status)
+        self.assertIsNone(no_json_response.data)
+
+    @unittest.skipIf(platform.system() == "Windows", "The fake agent is not supported on Windows")
+    def test_api_request_custom_codec(self):
+        # GIVEN
+        self.given_fake_ngrok_installed(self.pyngrok_config)
+        api_url = ngrok.get_ngrok_process(self.pyngrok_config).api_url
+        stdlib_codec = JSONCodec("json", json.loads, lambda obj: json.dumps(obj).encode("utf-8"))
+        custom_codec = JSONCodec("custom", mock.Mock(wraps=stdlib_codec.loads), mock.Mock(wraps=stdlib_codec.dumps))
+        codec.set_codec(custom_codec)
+
+        # WHEN
+        response = ngrok.api_request(f"{api_url}/_fake/requests", method="POST",
+                                     data={"tunnel_name": "my-tunnel", "count": 2})
+
+        # THEN
+        self.assertEqual(2, len(response["requests"]))
+        custom_codec._dumps.assert_called_once_with({"tunnel_name": "my-tunnel", "count": 2})
+        loaded = custom_codec._loads.call_args[0][0]
+        self.assertIsInstance(loaded, bytes)
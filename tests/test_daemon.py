@@ -0,0 +1,184 @@
+__copyright__ = "Copyright (c) 2018-2025 Alex Laird"
+__license__ = "MIT"
+
+import io
+import json
+import os
+import platform
+import socket
+import threading
+import unittest
+from unittest import mock
+
+from pyngrok import daemon, ngrok, process
+from pyngrok.daemon import DaemonClient, PyngrokDaemon
+from pyngrok.exception import PyngrokError
+from tests.testcase import NgrokTestCase
+
+
+@unittest.skipIf(platform.system() == "Windows", "The daemon is not supported on Windows")
+class TestDaemon(NgrokTestCase):
+    def setUp(self):
+        super(TestDaemon, self).setUp()
+
+        self.given_fake_ngrok_installed(self.pyngrok_config)
+        self.socket_path = os.path.join(self.config_dir, "daemon.sock")
+
+    def tearDown(self):
+        if hasattr(self, "serve_thread"):
+            self.daemon.shutdown()
+            self.serve_thread.join(timeout=5)
+
+        super(TestDaemon, self).tearDown()
+
+    def given_daemon_serving(self):
+        self.daemon = PyngrokDaemon(self.pyngrok_config, self.socket_path)
+        self.daemon.start()
+        self.serve_thread = threading.Thread(target=self.daemon.serve_forever, daemon=True)
+        self.serve_thread.start()
+
+        return DaemonClient(self.socket_path, timeout=10)
+
+    def test_connect_list_disconnect(self):
+        # GIVEN
+        client = self.given_daemon_serving()
+
+        # WHEN
+        with mock.patch.object(client, "request", wraps=client.request) as mock_request:
+            tunnel = client.connect("8000", name="web", schemes=["http"])
+        tunnels = client.get_tunnels()
+
+        # THEN
+        mock_request.assert_called_once_with("connect", options={"schemes": ["http"]}, addr="8000", name="web")
+        self.assertEqual("web", tunnel["name"])
+        self.assertTrue(tunnel["public_url"].startswith("http://"))
+        self.assertEqual([tunnel["public_url"]], [t["public_url"] for t in tunnels])
+        self.assertTrue(self.daemon.pyngrok_config.supervise)
+
+        # WHEN
+        client.disconnect(tunnel["public_url"])
+
+        # THEN
+        self.assertEqual([], client.get_tunnels())
+        self.assertEqual([], ngrok.get_tunnels(self.daemon.pyngrok_config))
+
+    def test_metrics(self):
+        # GIVEN
+        client = self.given_daemon_serving()
+        tunnel = client.connect("8000")
+
+        # WHEN
+        metrics = client.get_metrics()
+
+        # THEN
+        self.assertEqual(2, metrics["requests"])
+        self.assertEqual(1, metrics["process_starts"])
+        self.assertEqual([tunnel["public_url"]], list(metrics["tunnels"]))
+        self.assertGreater(metrics["uptime"], 0)
+
+    def test_errors(self):
+        # GIVEN
+        client = self.given_daemon_serving()
+
+        # WHEN
+        with self.assertRaises(PyngrokError) as cm:
+            client.request("unknown")
+
+        # THEN
+        self.assertIn("Unsupported op", str(cm.exception))
+        self.assertEqual("ValueError", self.daemon.handle(b"[]")["error_type"])
+        self.assertFalse(self.daemon.handle('{"op": "disconnect"}')["ok"])
+        self.assertEqual({"ok": True, "result": "pong"}, self.daemon.handle('{"op": "ping"}'))
+        with self.assertRaises(ValueError):
+            client.connect("8000", options={"schemes": ["http"]})
+
+        # WHEN
+        with self.assertRaises(PyngrokError):
+            PyngrokDaemon(self.pyngrok_config, self.socket_path).start()
+
+    def test_unexpected_errors(self):
+        # GIVEN
+        client = self.given_daemon_serving()
+
+        # WHEN
+        with mock.patch("pyngrok.ngrok.get_tunnels", side_effect=KeyError("public_url")), \
+                self.assertLogs("pyngrok.daemon", level="ERROR"), \
+                self.assertRaises(PyngrokError) as cm:
+            client.get_tunnels()
+
+        # THEN
+        self.assertIn("public_url", str(cm.exception))
+        self.assertEqual([], client.get_tunnels())
+
+    def test_invalid_response(self):
+        # GIVEN
+        invalid_socket_path = os.path.join(self.config_dir, "invalid.sock")
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(invalid_socket_path)
+        server.listen(1)
+
+        def respond():
+            conn, _ = server.accept()
+            with conn:
+                conn.recv(1024)
+                conn.sendall(b"not json\n")
+
+        respond_thread = threading.Thread(target=respond, daemon=True)
+        respond_thread.start()
+
+        # WHEN
+        with self.assertRaises(PyngrokError) as cm:
+            DaemonClient(invalid_socket_path, timeout=10).get_tunnels()
+        respond_thread.join(timeout=5)
+        server.close()
+
+        # THEN
+        self.assertIn("sent an invalid response", str(cm.exception))
+
+    def test_stop(self):
+        # GIVEN
+        client = self.given_daemon_serving()
+
+        # WHEN
+        client.stop()
+        self.serve_thread.join(timeout=5)
+
+        # THEN
+        self.assertFalse(self.serve_thread.is_alive())
+        self.assertFalse(os.path.exists(self.socket_path))
+        self.assertFalse(process.is_process_running(self.pyngrok_config.ngrok_path))
+        with self.assertRaises(PyngrokError):
+            client.get_tunnels()
+
+    def test_main(self):
+        # GIVEN
+        self.given_daemon_serving()
+
+        # WHEN
+        with mock.patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
+            exit_code = daemon.main(["--socket", self.socket_path, "connect", "8000", "--proto", "tcp"])
+
+        # THEN
+        self.assertEqual(0, exit_code)
+        self.assertTrue(json.loads(mock_stdout.getvalue())["public_url"].startswith("tcp://"))
+
+        # WHEN
+        with mock.patch("sys.stderr", new_callable=io.StringIO) as mock_stderr:
+            exit_code = daemon.main(["--socket", os.path.join(self.config_dir, "missing.sock"), "list"])
+
+        # THEN
+        self.assertEqual(1, exit_code)
+        self.assertIn("Unable to reach the pyngrok daemon", mock_stderr.getvalue())
+
+    @mock.patch("pyngrok.daemon.main", return_value=0)
+    @mock.patch("pyngrok.ngrok.run")
+    def test_ngrok_main_dispatches_daemon(self, mock_run, mock_main):
+        # WHEN
+        with mock.patch("sys.argv", ["pyngrok", "daemon", "list"]):
+            with self.assertRaises(SystemExit) as cm:
+                ngrok.main()
+
+        # THEN
+        self.assertEqual(0, cm.exception.code)
+        mock_main.assert_called_once_with(["list"])
+        mock_run.assert_not_called()
@@ -0,0 +1,58 @@
+__copyright__ = "Copyright (c) 2018-2025 Alex Laird"
+__license__ = "MIT"
+
+import time
+
+from pyngrok.deadline import MIN_TIMEOUT, Deadline, resolve_deadline
+from pyngrok.exception import PyngrokDeadlineError
+from tests.testcase import NgrokTestCase
+
+
+class TestDeadline(NgrokTestCase):
+    def test_deadline(self):
+        # WHEN
+        deadline = Deadline(10)
+
+        # THEN
+        self.assertFalse(deadline.expired)
+        self.assertLessEqual(deadline.remaining(), 10)
+        self.assertGreater(deadline.remaining(), 9)
+        self.assertEqual(2, deadline.cap(2, "connect"))
+        self.assertLessEqual(deadline.cap(60, "connect"), 10)
+        deadline.check("connect")
+
+    def test_deadline_expired(self):
+        # GIVEN
+        deadline = Deadline(0.05)
+
+        # WHEN
+        time.sleep(0.1)
+
+        # THEN
+        self.assertTrue(deadline.expired)
+        self.assertEqual(0, deadline.remaining())
+        with self.assertRaises(PyngrokDeadlineError) as cm:
+            deadline.cap(2, "connect")
+        self.assertEqual("connect", cm.exception.stage)
+
+    def test_deadline_cap_never_zero(self):
+        # GIVEN
+        deadline = Deadline(10)
+        deadline.expires_at = time.monotonic() + MIN_TIMEOUT / 10
+
+        # THEN
+        self.assertGreaterEqual(deadline.cap(2, "connect"), MIN_TIMEOUT)
+
+    def test_negative_deadline(self):
+        # WHEN
+        with self.assertRaises(ValueError):
+            Deadline(-1)
+
+    def test_resolve_deadline(self):
+        # GIVEN
+        deadline = Deadline(10)
+
+        # THEN
+        self.assertIsNone(resolve_deadline(None))
+        self.assertIs(deadline, resolve_deadline(deadline))
+        self.assertEqual(5, resolve_deadline(5).timeout)
@@ -0,0 +1,176 @@
+__copyright__ = "Copyright (c) 2018-2025 Alex Laird"
+__license__ = "MIT"
+
+from unittest import mock
+from urllib.error import HTTPError, URLError
+from urllib.request import urlopen
+
+from pyngrok import exporter, instrumentation, ngrok, process
+from pyngrok.exception import PyngrokNgrokURLError
+from pyngrok.exporter import LatencyHistogram, MetricsCollector
+from pyngrok.ngrok import NgrokTunnel
+from tests.testcase import NgrokTestCase
+
+
+class TestExporter(NgrokTestCase):
+    def setUp(self):
+        super(TestExporter, self).setUp()
+
+        self.histogram = LatencyHistogram(buckets=[0.1, 1])
+
+    def tearDown(self):
+        exporter.disable_api_request_metrics()
+        exporter.api_request_latency.clear()
+
+        super(TestExporter, self).tearDown()
+
+    def test_histogram_observe(self):
+        # WHEN
+        self.histogram.observe("GET", "http://127.0.0.1:4040/api/tunnels/my-tunnel", 200, 0.05)
+        self.histogram.observe("GET", "http://127.0.0.1:4040/api/tunnels/other-tunnel", 200, 0.5)
+        self.histogram.observe("POST", "https://some-domain.ngrok.dev/some-route", None, 2)
+
+        # THEN
+        samples = self.histogram.samples()
+        tunnel_labels = (("method", "GET"), ("route", "/api/tunnels/{id}"), ("code", "200"))
+        self.assertIn(("_bucket", tunnel_labels + (("le", "0.1"),), 1), samples)
+        self.assertIn(("_bucket", tunnel_labels + (("le", "1.0"),), 2), samples)
+        self.assertIn(("_bucket", tunnel_labels + (("le", "+Inf"),), 2), samples)
+        self.assertIn(("_count", tunnel_labels, 2), samples)
+        self.assertIn(("_sum", tunnel_labels, 0.55), samples)
+        other_labels = (("method", "POST"), ("route", "other"), ("code", "none"))
+        self.assertIn(("_bucket", other_labels + (("le", "1.0"),), 0), samples)
+        self.assertIn(("_count", other_labels, 1), samples)
+
+    def test_render_without_agent(self):
+        # GIVEN
+        collector = MetricsCollector(self.pyngrok_config, histogram=self.histogram)
+        self.histogram.observe("GET", "http://127.0.0.1:4040/api/status", 200, 0.01)
+
+        # WHEN
+        with mock.patch("pyngrok.process.is_process_running", return_value=False):
+            metrics = collector.collect()
+
+        # THEN
+        self.assertIn(f"pyngrok_agent_up{{ngrok_path=\"{self.pyngrok_config.ngrok_path}\"}} 0", metrics)
+        self.assertNotIn("pyngrok_agent_info", metrics)
+        self.assertIn("# TYPE pyngrok_api_request_duration_seconds histogram", metrics)
+        self.assertIn("pyngrok_api_request_duration_seconds_count{method=\"GET\",route=\"/api/status\","
+                      "code=\"200\"} 1", metrics)
+        self.assertTrue(metrics.endswith("# EOF\n"))
+        self.assertEqual(metrics, collector.render())
+
+    def test_render_tunnel_metrics(self):
+        # GIVEN
+        tunnel = NgrokTunnel({"name": "my-tunnel",
+                              "public_url": "https://my-tunnel.ngrok.dev",
+                              "proto": "https",
+                              "metrics": {"conns": {"count": 3, "gauge": 1, "rate1": 0.5, "p50": 2000000000},
+                                          "http": {"count": 7, "p99": 500000000}}},
+                             self.pyngrok_config, "http://127.0.0.1:4040")
+        ngrok_process = mock.MagicMock(api_url="http://127.0.0.1:4040", restart_count=1)
+        status = {"status": "online", "agent_version": "3.22.0"}
+
+        # WHEN
+        with mock.patch("pyngrok.process.is_process_running", return_value=True), \
+                mock.patch.dict(process._current_processes, {self.pyngrok_config.ngrok_path: ngrok_process}), \
+                mock.patch.dict(process._start_counts, {self.pyngrok_config.ngrok_path: 3}), \
+                mock.patch("pyngrok.ngrok._fetch_tunnels", return_value=[tunnel]), \
+                mock.patch("pyngrok.ngrok.api_request", return_value=status):
+            metrics = MetricsCollector(self.pyngrok_config, histogram=self.histogram).collect()
+
+        # THEN
+        labels = "tunnel=\"my-tunnel\",public_url=\"https://my-tunnel.ngrok.dev\",proto=\"https\""
+        self.assertIn("pyngrok_agent_info{status=\"online\",agent_version=\"3.22.0\"} 1", metrics)
+        self.assertIn(f"pyngrok_process_starts_total{{ngrok_path=\"{self.pyngrok_config.ngrok_path}\"}} 3",
+                      metrics)
+        self.assertIn(f"pyngrok_process_restarts_total{{ngrok_path=\"{self.pyngrok_config.ngrok_path}\"}} 1",
+                      metrics)
+        self.assertIn(f"pyngrok_tunnel_connections_total{{{labels}}} 3", metrics)
+        self.assertIn(f"pyngrok_tunnel_open_connections{{{labels}}} 1", metrics)
+        self.assertIn(f"pyngrok_tunnel_connections_rate{{{labels},window=\"1m\"}} 0.5", metrics)
+        self.assertIn(f"pyngrok_tunnel_connections_duration_seconds{{{labels},quantile=\"0.5\"}} 2", metrics)
+        self.assertIn(f"pyngrok_tunnel_http_requests_total{{{labels}}} 7", metrics)
+        self.assertIn(f"pyngrok_tunnel_http_requests_duration_seconds{{{labels},quantile=\"0.99\"}} 0.5", metrics)
+
+    def test_render_non_finite_values(self):
+        # GIVEN
+        tunnel = NgrokTunnel({"name": "my-tunnel",
+                              "public_url": "https://my-tunnel.ngrok.dev",
+                              "proto": "https",
+                              "metrics": {"conns": {"rate1": float("nan"), "rate5": float("inf"),
+                                                    "rate15": float("-inf")}}},
+                             self.pyngrok_config, "http://127.0.0.1:4040")
+        ngrok_process = mock.MagicMock(api_url="http://127.0.0.1:4040", restart_count=0)
+        status = {"status": "online", "agent_version": "3.22.0"}
+
+        # WHEN
+        with mock.patch("pyngrok.process.is_process_running", return_value=True), \
+                mock.patch.dict(process._current_processes, {self.pyngrok_config.ngrok_path: ngrok_process}), \
+                mock.patch("pyngrok.ngrok._fetch_tunnels", return_value=[tunnel]), \
+                mock.patch("pyngrok.ngrok.api_request", return_value=status):
+            metrics = MetricsCollector(self.pyngrok_config, histogram=self.histogram).collect()
+
+        # THEN
+        labels = "tunnel=\"my-tunnel\",public_url=\"https://my-tunnel.ngrok.dev\",proto=\"https\""
+        self.assertIn(f"pyngrok_tunnel_connections_rate{{{labels},window=\"1m\"}} NaN", metrics)
+        self.assertIn(f"pyngrok_tunnel_connections_rate{{{labels},window=\"5m\"}} +Inf", metrics)
+        self.assertIn(f"pyngrok_tunnel_connections_rate{{{labels},window=\"15m\"}} -Inf", metrics)
+
+    def test_collect_agent_error(self):
+        # GIVEN
+        collector = MetricsCollector(self.pyngrok_config, histogram=self.histogram)
+
+        # WHEN
+        with mock.patch("pyngrok.process.is_process_running", return_value=True), \
+                mock.patch.dict(process._current_processes, {self.pyngrok_config.ngrok_path: mock.MagicMock()}), \
+                mock.patch("pyngrok.ngrok._fetch_tunnels", side_effect=OSError("connection refused")):
+            metrics = collector.collect()
+
+        # THEN
+        self.assertEqual(1, collector.refresh_errors)
+        self.assertIn("pyngrok_agent_up{", metrics)
+        self.assertIn("pyngrok_exporter_refresh_errors_total 1", metrics)
+
+    def test_enable_api_request_metrics(self):
+        # WHEN
+        exporter.enable_api_request_metrics()
+        exporter.enable_api_request_metrics()
+
+        # THEN
+        self.assertEqual(1, instrumentation._hooks.count(exporter._api_request_latency_hook))
+
+        # WHEN
+        with mock.patch("pyngrok.ngrok.urlopen", side_effect=URLError("connection refused")):
+            with self.assertRaises(PyngrokNgrokURLError):
+                ngrok.api_request("http://127.0.0.1:4040/api/tunnels/my-tunnel", method="DELETE")
+
+        # THEN
+        labels = (("method", "DELETE"), ("route", "/api/tunnels/{id}"), ("code", "none"))
+        self.assertIn(("_count", labels, 1), exporter.api_request_latency.samples())
+
+        # WHEN
+        exporter.disable_api_request_metrics()
+
+        # THEN
+        self.assertNotIn(exporter._api_request_latency_hook, instrumentation._hooks)
+
+    def test_start_http_server(self):
+        # GIVEN
+        collector = MetricsCollector(self.pyngrok_config, histogram=self.histogram)
+        collector._snapshot = "pyngrok_agent_up 1\n# EOF\n"
+        metrics_server = exporter.start_http_server(0, collector=collector)
+        url = f"http://127.0.0.1:{metrics_server.server_address[1]}"
+
+        try:
+            # WHEN
+            response = urlopen(f"{url}/metrics")
+
+            # THEN
+            self.assertEqual(exporter.CONTENT_TYPE, response.headers["Content-Type"])
+            self.assertEqual(b"pyngrok_agent_up 1\n# EOF\n", response.read())
+            with self.assertRaises(HTTPError) as cm:
+                urlopen(f"{url}/unknown")
+            self.assertEqual(404, cm.exception.code)
+        finally:
+            metrics_server.shutdown()
@@ -0,0 +1,125 @@
+__copyright__ = "Copyright (c) 2018-2025 Alex Laird"
+__license__ = "MIT"
+
+import os
+import platform
+import unittest
+from unittest import mock
+
+from pyngrok import agent, fake_agent, ngrok, process
+from pyngrok.exception import PyngrokNgrokError, PyngrokNgrokHTTPError
+from tests.testcase import NgrokTestCase
+
+
+@unittest.skipIf(platform.system() == "Windows", "The fake agent is not supported on Windows")
+class TestFakeAgent(NgrokTestCase):
+    def setUp(self):
+        super(TestFakeAgent, self).setUp()
+
+        self.given_fake_ngrok_installed(self.pyngrok_config)
+
+    def test_start_process(self):
+        # WHEN
+        ngrok_process = process._start_process(self.pyngrok_config)
+
+        # THEN
+        self.assertTrue(ngrok_process.healthy())
+        self.assertIsNotNone(ngrok_process.api_url)
+        self.assertTrue(ngrok_process._tunnel_started)
+        self.assertTrue(ngrok_process._client_connected)
+        self.assertIsNone(ngrok_process.startup_error)
+        self.assertTrue(any("starting web service" in log.msg for log in ngrok_process.logs))
+
+    def test_connect_and_disconnect(self):
+        # WHEN
+        tunnel = ngrok.connect(8000, name="my-tunnel", pyngrok_config=self.pyngrok_config)
+        tcp_tunnel = ngrok.connect(5000, "tcp", pyngrok_config=self.pyngrok_config)
+
+        # THEN
+        self.assertEqual("my-tunnel", tunnel.name)
+        self.assertEqual("https", tunnel.proto)
+        self.assertTrue(tunnel.public_url.startswith("https://"))
+        self.assertEqual("http://localhost:8000", tunnel.config["addr"])
+        self.assertTrue(tcp_tunnel.public_url.startswith("tcp://"))
+        self.assertEqual("localhost:5000", tcp_tunnel.config["addr"])
+        self.assertEqual(2, len(ngrok.get_tunnels(pyngrok_config=self.pyngrok_config)))
+
+        # WHEN
+        ngrok.disconnect(tunnel.public_url, pyngrok_config=self.pyngrok_config)
+
+        # THEN
+        self.assertEqual([tcp_tunnel.public_url],
+                         [t.public_url for t in ngrok.get_tunnels(pyngrok_config=self.pyngrok_config)])
+
+    def test_connect_v3_endpoint(self):
+        # GIVEN
+        pyngrok_config = self.copy_with_updates(self.pyngrok_config, config_version="3")
+
+        # WHEN
+        tunnel = ngrok.connect(8000, name="my-endpoint", pyngrok_config=pyngrok_config)
+
+        # THEN
+        self.assertEqual("/api/endpoints/my-endpoint", tunnel.uri)
+        self.assertEqual({"url": "http://localhost:8000"}, tunnel.upstream)
+        self.assertEqual(1, len(ngrok.get_tunnels(pyngrok_config=pyngrok_config)))
+
+    def test_captured_requests(self):
+        # GIVEN
+        tunnel = ngrok.connect(8000, name="my-tunnel", pyngrok_config=self.pyngrok_config)
+        ngrok.api_request(f"{tunnel.api_url}/_fake/requests", method="POST",
+                          data={"tunnel_name": "my-tunnel", "uri": "/webhook", "method": "POST", "count": 3})
+
+        # WHEN
+        requests = agent.get_requests(pyngrok_config=self.pyngrok_config)
+
+        # THEN
+        self.assertEqual(3, len(requests))
+        self.assertEqual("my-tunnel", requests[0].tunnel_name)
+        self.assertEqual("/webhook", requests[0].request["uri"])
+        self.assertEqual(0, len(agent.get_requests("unknown-tunnel", self.pyngrok_config)))
+
+        # WHEN
+        agent.replay_request(requests[0].id, pyngrok_config=self.pyngrok_config)
+
+        # THEN
+        self.assertEqual(4, len(agent.get_requests(pyngrok_config=self.pyngrok_config)))
+        self.assertEqual(requests[0].id, agent.get_request(requests[0].id, pyngrok_config=self.pyngrok_config).id)
+        self.assertEqual("online", agent.get_agent_status(self.pyngrok_config).status)
+
+        # WHEN
+        agent.delete_requests(pyngrok_config=self.pyngrok_config)
+
+        # THEN
+        self.assertEqual(0, len(agent.get_requests(pyngrok_config=self.pyngrok_config)))
+
+    def test_failure_injection(self):
+        # GIVEN
+        api_url = ngrok.get_ngrok_process(pyngrok_config=self.pyngrok_config).api_url
+        ngrok.api_request(f"{api_url}/_fake/config", method="POST", data={"failure_rate": 1})
+
+        # WHEN
+        with self.assertRaises(PyngrokNgrokHTTPError) as cm:
+            ngrok.get_tunnels(pyngrok_config=self.pyngrok_config)
+
+        # THEN
+        self.assertEqual(502, cm.exception.status_code)
+
+    def test_startup_error(self):
+        # WHEN
+        with mock.patch.dict(os.environ, {fake_agent.STARTUP_ERROR_ENV: "authentication failed"}):
+            with self.assertRaises(PyngrokNgrokError) as cm:
+                process._start_process(self.pyngrok_config)
+
+        # THEN
+        self.assertEqual("authentication failed", cm.exception.ngrok_error)
+        self.assertEqual(0, len(process._current_processes))
+
+    def test_cli_commands(self):
+        # WHEN
+        ngrok.set_auth_token("some-auth-token", pyngrok_config=self.pyngrok_config)
+        ngrok_version, _ = ngrok.get_version(pyngrok_config=self.pyngrok_config)
+
+        # THEN
+        with open(self.pyngrok_config.config_path, "r") as config_file:
+            self.assertIn("authtoken: some-auth-token", config_file.read())
+        self.assertEqual(fake_agent.FAKE_AGENT_VERSION, ngrok_version)
@@ -0,0 +1,192 @@
+__copyright__ = "Copyright (c) 2018-2025 Alex Laird"
+__license__ = "MIT"
+
+import base64
+import io
+import json
+import os
+import platform
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from pyngrok import har, ngrok
+from pyngrok.agent import CapturedRequest
+from pyngrok.exception import PyngrokSecurityError
+from tests.testcase import NgrokTestCase
+
+
+class TestHar(NgrokTestCase):
+    def test_write_har(self):
+        # GIVEN
+        captured_requests = [
+            self.given_captured_request("1", "POST", "/webhook?a=1&b=", b'{"event": "created"}', 201),
+            self.given_captured_request("2", "PUT", "/upload", b"\xff\xfe\x00", 500),
+        ]
+        fp = io.StringIO()
+
+        # WHEN
+        count = har.write_har(iter(captured_requests), fp)
+
+        # THEN
+        self.assertEqual(2, count)
+        document = json.loads(fp.getvalue())
+        self.assertEqual("1.2", document["log"]["version"])
+        self.assertEqual("pyngrok", document["log"]["creator"]["name"])
+        first, second = document["log"]["entries"]
+        self.assertEqual("1", first["_id"])
+        self.assertEqual("POST", first["request"]["method"])
+        self.assertEqual("http://example.ngrok.io/webhook?a=1&b=", first["request"]["url"])
+        self.assertEqual([{"name": "a", "value": "1"}, {"name": "b", "value": ""}], first["request"]["queryString"])
+        self.assertEqual({"text": '{"event": "created"}', "mimeType": "application/json"},
+                         first["request"]["postData"])
+        self.assertEqual(201, first["response"]["status"])
+        self.assertEqual("Created", first["response"]["statusText"])
+        self.assertEqual(1.5, first["time"])
+        self.assertEqual(base64.b64encode(b"\xff\xfe\x00").decode(), second["request"]["postData"]["text"])
+        self.assertEqual("base64", second["request"]["postData"]["_encoding"])
+
+    def test_iter_har_entries(self):
+        # GIVEN
+        fp = io.StringIO()
+        har.write_har([self.given_captured_request(str(i), "POST", f"/webhook/{i}", b'{"a": "]}"}', 200)
+                       for i in range(20)], fp)
+        fp.seek(0)
+
+        # WHEN
+        with mock.patch("pyngrok.har._READ_CHUNK_SIZE", 7):
+            entries = list(har.iter_har_entries(fp))
+
+        # THEN
+        self.assertEqual([str(i) for i in range(20)], [e["_id"] for e in entries])
+        self.assertEqual(json.loads(fp.getvalue())["log"]["entries"], entries)
+
+    def test_iter_har_entries_large_entry(self):
+        # GIVEN
+        fp = io.StringIO()
+        har.write_har([self.given_captured_request("1", "POST", "/upload", os.urandom(1024 * 1024), 200),
+                       self.given_captured_request("2", "GET", "/", b"", 200)], fp)
+        fp.seek(0)
+
+        # WHEN
+        with mock.patch("pyngrok.har._READ_CHUNK_SIZE", 1024):
+            with mock.patch.object(fp, "read", wraps=fp.read) as mock_read:
+                entries = list(har.iter_har_entries(fp))
+
+        # THEN
+        self.assertEqual(["1", "2"], [e["_id"] for e in entries])
+        # The read size grows while an entry is split across reads, rather than one chunk being read per retry
+        self.assertLess(mock_read.call_count, 20)
+
+    def test_iter_har_entries_invalid(self):
+        # WHEN
+        with self.assertRaises(ValueError):
+            list(har.iter_har_entries(io.StringIO("{\"log\": {}}")))
+        with self.assertRaises(ValueError):
+            list(har.iter_har_entries(io.StringIO("{\"log\": {\"entries\": [{\"request\": ")))
+
+    def test_replay_har(self):
+        # GIVEN
+        received = []
+        server = self.given_upstream(received)
+        path = os.path.join(os.path.dirname(self.pyngrok_config.config_path), "traffic.har")
+        with open(path, "w") as fp:
+            har.write_har([
+                self.given_captured_request("1", "POST", "/webhook?a=1", b'{"event": "created"}', 201),
+                self.given_captured_request("2", "PUT", "/upload", b"\xff\xfe\x00", 200),
+                self.given_captured_request("3", "GET", "/missing", b"", 200),
+            ], fp)
+        upstream_url = f"http://localhost:{server.server_address[1]}"
+
+        # WHEN
+        results = har.replay_har(path, upstream_url, concurrency=1, rate=100)
+
+        # THEN
+        self.assertEqual([0, 1, 2], [r.index for r in results])
+        self.assertTrue(all(r.ok for r in results))
+        self.assertEqual([200, 200, 404], [r.status_code for r in results])
+        self.assertEqual(f"{upstream_url}/webhook?a=1", results[0].url)
+        self.assertEqual([("POST", "/webhook?a=1", b'{"event": "created"}', "application/json"),
+                          ("PUT", "/upload", b"\xff\xfe\x00", "application/json"),
+                          ("GET", "/missing", b"", "application/json")], received)
+
+    def test_replay_har_upstream_unreachable(self):
+        # GIVEN
+        fp = io.StringIO()
+        har.write_har([self.given_captured_request("1", "GET", "/", b"", 200)], fp)
+        fp.seek(0)
+
+        # WHEN
+        results = har.replay_har(fp, "http://localhost:1", timeout=1)
+
+        # THEN
+        self.assertFalse(results[0].ok)
+        self.assertIsNone(results[0].status_code)
+
+    def test_replay_har_invalid_url(self):
+        # WHEN
+        with self.assertRaises(PyngrokSecurityError):
+            har.replay_har(io.StringIO(), "file:///etc/passwd")
+
+    @unittest.skipIf(platform.system() == "Windows", "The fake agent is not supported on Windows")
+    def test_export_har(self):
+        # GIVEN
+        self.given_fake_ngrok_installed(self.pyngrok_config)
+        api_url = ngrok.get_ngrok_process(self.pyngrok_config).api_url
+        ngrok.api_request(f"{api_url}/_fake/requests", method="POST",
+                          data={"tunnel_name": "my-tunnel", "method": "POST", "uri": "/webhook", "body": "hi",
+                                "count": 3})
+        path = os.path.join(os.path.dirname(self.pyngrok_config.config_path), "traffic.har")
+
+        # WHEN
+        count = har.export_har(path, tunnel_name="my-tunnel", base_url="https://example.ngrok.io",
+                               pyngrok_config=self.pyngrok_config)
+
+        # THEN
+        self.assertEqual(3, count)
+        with open(path) as fp:
+            entries = list(har.iter_har_entries(fp))
+        self.assertEqual(3, len(entries))
+        self.assertEqual("https://example.ngrok.io/webhook", entries[0]["request"]["url"])
+        self.assertEqual("hi", entries[0]["request"]["postData"]["text"])
+        self.assertEqual("my-tunnel", entries[0]["_tunnel_name"])
+
+    @staticmethod
+    def given_captured_request(request_id, method, uri, body, status_code):
+        raw_request = (f"{method} {uri} HTTP/1.1\r\nHost: example.ngrok.io\r\n"
+                       f"Content-Type: application/json\r\n\r\n").encode() + body
+        raw_response = b"HTTP/1.1 200 OK\r\nContent-Type: text/plain\r\n\r\nok"
+        return CapturedRequest({
+            "id": request_id,
+            "tunnel_name": "my-tunnel",
+            "remote_addr": "127.0.0.1",
+            "start": "2025-01-01T00:00:00.000000Z",
+            "duration": 1500000,
+            "request": {"method": method, "proto": "HTTP/1.1", "uri": uri,
+                        "raw": base64.b64encode(raw_request).decode()},
+            "response": {"status": f"{status_code} {'Created' if status_code == 201 else 'OK'}",
+                         "status_code": status_code, "proto": "HTTP/1.1",
+                         "raw": base64.b64encode(raw_response).decode()},
+        })
+
+    def given_upstream(self, received):
+        class UpstreamHandler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def handle_one(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                received.append((self.command, self.path, body, self.headers.get("Content-Type")))
+                self.send_response(404 if self.path == "/missing" else 200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            do_GET = do_POST = do_PUT = handle_one  # noqa: N815
+
+        server = ThreadingHTTPServer(("localhost", 0), UpstreamHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        return server
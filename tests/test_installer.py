@@ -10,7 +10,8 @@ from urllib.error import HTTPError
 
 from pyngrok import installer, ngrok, conf
 from pyngrok.conf import PyngrokConfig
-from pyngrok.exception import PyngrokError, PyngrokNgrokInstallError, PyngrokSecurityError
+from pyngrok.deadline import Deadline
+from pyngrok.exception import PyngrokDeadlineError, PyngrokError, PyngrokNgrokInstallError, PyngrokSecurityError
 from pyngrok.installer import PLATFORMS
 from tests.testcase import NgrokTestCase
 
@@ -134,6 +135,32 @@ class TestInstaller(NgrokTestCase):
         self.assertEqual(mock_urlopen.call_count, 4)
         self.assertFalse(os.path.exists(self.pyngrok_config.ngrok_path))
 
+    @mock.patch("pyngrok.installer.urlopen")
+    def test_installer_deadline_stops_retries(self, mock_urlopen):
+        # GIVEN
+        mock_urlopen.side_effect = socket.timeout("The read operation timed out")
+
+        self.given_file_doesnt_exist(self.pyngrok_config.ngrok_path)
+
+        # WHEN
+        with self.assertRaises(PyngrokDeadlineError) as cm:
+            ngrok.connect(pyngrok_config=self.pyngrok_config, deadline=0.2)
+
+        # THEN
+        self.assertEqual("downloading ngrok", cm.exception.stage)
+        self.assertEqual(mock_urlopen.call_count, 1)
+        self.assertLessEqual(mock_urlopen.call_args[1]["timeout"], 0.2)
+        self.assertFalse(os.path.exists(self.pyngrok_config.ngrok_path))
+
+    def test_download_file_deadline_exhausted(self):
+        # WHEN
+        with mock.patch("pyngrok.installer.urlopen") as mock_urlopen:
+            with self.assertRaises(PyngrokDeadlineError):
+                installer._download_file("https://bin.equinox.io/ngrok.zip", deadline=Deadline(0))
+
+        # THEN
+        mock_urlopen.assert_not_called()
+
     def test_download_file_security_error(self):
         # WHEN
         with self.assertRaises(PyngrokSecurityError):
@@ -0,0 +1,117 @@
+__copyright__ = "Copyright (c) 2018-2025 Alex Laird"
+__license__ = "MIT"
+
+import sys
+from unittest import mock
+from urllib.error import URLError
+
+from pyngrok import codec, instrumentation, ngrok
+from pyngrok.exception import PyngrokError, PyngrokNgrokURLError
+from pyngrok.instrumentation import InstrumentationHook
+from tests.testcase import NgrokTestCase
+
+
+class RecordingHook(InstrumentationHook):
+    def __init__(self):
+        self.started = []
+        self.ended = []
+
+    def on_start(self, span):
+        self.started.append(span)
+
+    def on_end(self, span):
+        self.ended.append(span)
+
+
+class TestInstrumentation(NgrokTestCase):
+    def setUp(self):
+        super(TestInstrumentation, self).setUp()
+
+        self.hook = RecordingHook()
+        instrumentation.add_hook(self.hook)
+
+    def tearDown(self):
+        instrumentation.remove_hook(self.hook)
+
+        super(TestInstrumentation, self).tearDown()
+
+    def test_span_without_hooks_is_noop(self):
+        # GIVEN
+        instrumentation.remove_hook(self.hook)
+
+        # WHEN
+        span = instrumentation.span("api_request", method="GET")
+
+        # THEN
+        self.assertIs(instrumentation._NOOP_SPAN, span)
+        with span as s:
+            s.set_attribute("status_code", 200)
+
+    def test_api_request_span(self):
+        # GIVEN
+        response = mock.MagicMock()
+        response.read.return_value = b"{\"tunnels\": []}"
+        response.getcode.return_value = 200
+
+        # WHEN
+        with mock.patch("pyngrok.ngrok.urlopen", return_value=response):
+            ngrok.api_request("http://127.0.0.1:4040/api/tunnels", method="post", data={"name": "my-tunnel"})
+
+        # THEN
+        self.assertEqual(1, len(self.hook.started))
+        self.assertEqual(1, len(self.hook.ended))
+        span = self.hook.ended[0]
+        self.assertEqual("api_request", span.name)
+        self.assertEqual("POST", span.attributes["method"])
+        self.assertEqual("/api/tunnels", span.attributes["path"])
+        self.assertEqual(200, span.attributes["status_code"])
+        self.assertEqual(len(codec.dumps({"name": "my-tunnel"})), span.attributes["request_bytes"])
+        self.assertEqual(15, span.attributes["response_bytes"])
+        self.assertIsNotNone(span.duration)
+        self.assertIsNone(span.error)
+
+    def test_api_request_span_error(self):
+        # WHEN
+        with mock.patch("pyngrok.ngrok.urlopen", side_effect=URLError("connection refused")):
+            with self.assertRaises(PyngrokNgrokURLError):
+                ngrok.api_request("http://127.0.0.1:4040/api/status")
+
+        # THEN
+        span = self.hook.ended[0]
+        self.assertNotIn("status_code", span.attributes)
+        self.assertIsInstance(span.error, PyngrokNgrokURLError)
+
+    def test_interpolate_tunnel_definition_span(self):
+        # GIVEN
+        options = {}
+
+        # WHEN
+        ngrok._interpolate_tunnel_definition(self.pyngrok_config, options, "8000", "http", "my-tunnel")
+
+        # THEN
+        span = self.hook.ended[0]
+        self.assertEqual("interpolate_tunnel_definition", span.name)
+        self.assertEqual("my-tunnel", span.attributes["tunnel_name"])
+        self.assertEqual("2", span.attributes["config_version"])
+
+    def test_failing_hook_is_ignored(self):
+        # GIVEN
+        failing_hook = InstrumentationHook()
+        failing_hook.on_start = mock.MagicMock(side_effect=ValueError("hook failed"))
+        instrumentation.add_hook(failing_hook)
+
+        try:
+            # WHEN
+            with instrumentation.span("some_operation") as span:
+                span.set_attribute("foo", "bar")
+
+            # THEN
+            self.assertEqual({"foo": "bar"}, self.hook.ended[0].attributes)
+        finally:
+            instrumentation.remove_hook(failing_hook)
+
+    def test_opentelemetry_hook_not_installed(self):
+        # WHEN
+        with mock.patch.dict(sys.modules, {"opentelemetry": None}):
+            with self.assertRaises(PyngrokError):
+                instrumentation.OpenTelemetryHook()
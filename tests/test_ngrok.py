@@ -1,22 +1,29 @@
 __copyright__ = "Copyright (c) 2018-2025 Alex Laird"
 __license__ = "MIT"
 
+import io
 import os
+import platform
+import socket
+import threading
 import time
 import traceback
 import unittest
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
 from unittest import mock
+from urllib.error import HTTPError, URLError
 from urllib.parse import urlparse
 from urllib.request import urlopen
 
 import yaml
 
 from pyngrok import __version__, installer, ngrok, process
-from pyngrok.conf import PyngrokConfig
-from pyngrok.exception import PyngrokError, PyngrokNgrokError, PyngrokNgrokHTTPError, PyngrokNgrokURLError, \
-    PyngrokSecurityError
+from pyngrok.conf import PyngrokConfig, RetryPolicy
+from pyngrok.deadline import Deadline
+from pyngrok.exception import PyngrokDeadlineError, PyngrokError, PyngrokNgrokError, PyngrokNgrokHTTPError, \
+    PyngrokNgrokURLError, PyngrokSecurityError
 from scripts.create_test_resources import create_test_resources, generate_name_for_subdomain
 from tests.testcase import NgrokTestCase
 
@@ -1064,7 +1071,8 @@ class TestNgrok(NgrokTestCase):
 
         # THEN
         mock_api_request.assert_called_with(f"{mock_get_ngrok_process().api_url}/api/tunnels", method="POST",
-                                            data=expected_options, timeout=pyngrok_config.request_timeout)
+                                            data=expected_options, timeout=pyngrok_config.request_timeout,
+                                            retry_policy=pyngrok_config.retry_policy, deadline=None)
 
     @mock.patch('pyngrok.ngrok.api_request')
     @mock.patch('pyngrok.ngrok.get_ngrok_process')
@@ -1240,3 +1248,252 @@ class TestNgrok(NgrokTestCase):
 
         # THEN
         self.assertEqual(tunnel.uri, "/api/endpoints/my-tunnel")
+
+    def test_api_request_retries_get_on_timeout(self):
+        # GIVEN
+        retry_policy = RetryPolicy(backoff=0.01)
+
+        # WHEN
+        with mock.patch("pyngrok.ngrok.urlopen",
+                        side_effect=[socket.timeout(), self.given_api_response(b"{\"tunnels\": []}")]) as mock_urlopen:
+            response = ngrok.api_request("http://127.0.0.1:4040/api/tunnels", retry_policy=retry_policy)
+
+        # THEN
+        self.assertEqual({"tunnels": []}, response)
+        self.assertEqual(2, mock_urlopen.call_count)
+        self.assertEqual({"GET /api/tunnels": 1}, retry_policy.retry_counts)
+
+    def test_api_request_retries_post_on_connection_refused(self):
+        # GIVEN
+        retry_policy = RetryPolicy(backoff=0.01)
+
+        # WHEN
+        with mock.patch("pyngrok.ngrok.urlopen",
+                        side_effect=[URLError(ConnectionRefusedError()), URLError(ConnectionRefusedError()),
+                                     self.given_api_response(b"{\"name\": \"my-tunnel\"}")]) as mock_urlopen:
+            response = ngrok.api_request("http://127.0.0.1:4040/api/tunnels", method="POST",
+                                         data={"name": "my-tunnel"}, retry_policy=retry_policy)
+
+        # THEN
+        self.assertEqual({"name": "my-tunnel"}, response)
+        self.assertEqual(3, mock_urlopen.call_count)
+        self.assertEqual({"POST /api/tunnels": 2}, retry_policy.retry_counts)
+
+    def test_api_request_does_not_retry_post_that_may_have_been_applied(self):
+        # GIVEN
+        retry_policy = RetryPolicy(backoff=0.01)
+        bad_gateway = HTTPError("http://127.0.0.1:4040/api/tunnels", 502, "Bad Gateway", {}, io.BytesIO(b"{}"))
+
+        for error in [socket.timeout(), URLError(ConnectionResetError()), bad_gateway]:
+            with self.subTest(error=error):
+                # WHEN
+                with mock.patch("pyngrok.ngrok.urlopen", side_effect=error) as mock_urlopen:
+                    with self.assertRaises(PyngrokNgrokError):
+                        ngrok.api_request("http://127.0.0.1:4040/api/tunnels", method="POST",
+                                          data={"name": "my-tunnel"}, retry_policy=retry_policy)
+
+                # THEN
+                self.assertEqual(1, mock_urlopen.call_count)
+        self.assertEqual({}, retry_policy.retry_counts)
+
+    def test_api_request_retries_until_max_attempts(self):
+        # GIVEN
+        retry_policy = RetryPolicy(max_attempts=3, backoff=0.01)
+
+        # WHEN
+        with mock.patch("pyngrok.ngrok.urlopen", side_effect=lambda *args: self.given_http_error(503)) \
+                as mock_urlopen:
+            with self.assertRaises(PyngrokNgrokHTTPError) as cm:
+                ngrok.api_request("http://127.0.0.1:4040/api/tunnels/my-tunnel", method="DELETE",
+                                  retry_policy=retry_policy)
+        with mock.patch("pyngrok.ngrok.urlopen", side_effect=lambda *args: self.given_http_error(404)):
+            with self.assertRaises(PyngrokNgrokHTTPError):
+                ngrok.api_request("http://127.0.0.1:4040/api/tunnels/my-tunnel", retry_policy=retry_policy)
+
+        # THEN
+        self.assertEqual(503, cm.exception.status_code)
+        self.assertEqual(3, mock_urlopen.call_count)
+        self.assertEqual({"DELETE /api/tunnels/{id}": 2}, retry_policy.retry_counts)
+
+    def test_api_request_retries_within_total_timeout(self):
+        # GIVEN
+        retry_policy = RetryPolicy(max_attempts=10, backoff=0.2, total_timeout=0.5)
+
+        # WHEN
+        start = time.monotonic()
+        with mock.patch("pyngrok.ngrok.urlopen", side_effect=socket.timeout()) as mock_urlopen:
+            with self.assertRaises(PyngrokNgrokURLError):
+                ngrok.api_request("http://127.0.0.1:4040/api/status", retry_policy=retry_policy)
+        elapsed = time.monotonic() - start
+
+        # THEN
+        self.assertLess(elapsed, 0.5)
+        self.assertLess(mock_urlopen.call_count, 10)
+        self.assertLessEqual(mock_urlopen.call_args[0][2], 0.5)
+
+    @unittest.skipIf(platform.system() == "Windows", "The fake agent is not supported on Windows")
+    def test_connect_reuse(self):
+        # GIVEN
+        self.given_fake_ngrok_installed(self.pyngrok_config)
+        tunnel1 = ngrok.connect("8000", pyngrok_config=self.pyngrok_config, reuse=True)
+
+        # WHEN
+        with mock.patch("pyngrok.ngrok.api_request", wraps=ngrok.api_request) as mock_api_request:
+            tunnel2 = ngrok.connect("8000", pyngrok_config=self.pyngrok_config, reuse=True)
+
+        # THEN
+        self.assertEqual(tunnel1.public_url, tunnel2.public_url)
+        self.assertEqual(tunnel1.name, tunnel2.name)
+        self.assertNotIn("POST", [c[1].get("method") for c in mock_api_request.call_args_list])
+        self.assertEqual(1, len(ngrok.get_tunnels(self.pyngrok_config)))
+
+        # WHEN
+        tunnel3 = ngrok.connect("8000", pyngrok_config=self.pyngrok_config, bind_tls=True, reuse=True)
+        tunnel4 = ngrok.connect("8000", pyngrok_config=self.pyngrok_config)
+
+        # THEN
+        self.assertNotEqual(tunnel1.public_url, tunnel3.public_url)
+        self.assertNotEqual(tunnel1.public_url, tunnel4.public_url)
+        self.assertEqual(3, len(ngrok.get_tunnels(self.pyngrok_config)))
+
+    @unittest.skipIf(platform.system() == "Windows", "The fake agent is not supported on Windows")
+    def test_connect_reuse_concurrent(self):
+        # GIVEN
+        self.given_fake_ngrok_installed(self.pyngrok_config)
+        ngrok.get_ngrok_process(self.pyngrok_config)
+        barrier = threading.Barrier(8)
+        create_tunnel = ngrok._create_tunnel
+        creating = []
+        max_creating = []
+
+        def slow_create_tunnel(*args):
+            creating.append(None)
+            max_creating.append(len(creating))
+            time.sleep(0.2)
+            try:
+                return create_tunnel(*args)
+            finally:
+                creating.pop()
+
+        def connect(port):
+            barrier.wait()
+            return ngrok.connect(port, pyngrok_config=self.pyngrok_config, reuse=True)
+
+        # WHEN
+        with mock.patch("pyngrok.ngrok._create_tunnel", side_effect=slow_create_tunnel):
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                tunnels = list(executor.map(connect, [8000, 8001, 8002, 8003] * 2))
+
+        # THEN
+        self.assertEqual([t.public_url for t in tunnels[:4]], [t.public_url for t in tunnels[4:]])
+        self.assertEqual(4, len({t.public_url for t in tunnels}))
+        self.assertEqual(4, len(ngrok.get_tunnels(self.pyngrok_config)))
+        # Tunnels with different definitions are created concurrently
+        self.assertGreater(max(max_creating), 1)
+
+    @unittest.skipIf(platform.system() == "Windows", "The fake agent is not supported on Windows")
+    def test_connect_reuse_closed_tunnel(self):
+        # GIVEN
+        self.given_fake_ngrok_installed(self.pyngrok_config)
+        tunnel1 = ngrok.connect("8000", pyngrok_config=self.pyngrok_config, reuse=True)
+        ngrok.disconnect(tunnel1.public_url, self.pyngrok_config)
+
+        # WHEN
+        tunnel2 = ngrok.connect("8000", pyngrok_config=self.pyngrok_config, reuse=True)
+
+        # THEN
+        self.assertNotEqual(tunnel1.public_url, tunnel2.public_url)
+
+        # GIVEN
+        ngrok.api_request(f"{tunnel2.api_url}{tunnel2.uri}", method="DELETE")
+
+        # WHEN
+        tunnel3 = ngrok.connect("8000", pyngrok_config=self.pyngrok_config, reuse=True)
+
+        # THEN
+        self.assertNotEqual(tunnel2.public_url, tunnel3.public_url)
+        self.assertEqual([tunnel3.public_url], [t.public_url for t in ngrok.get_tunnels(self.pyngrok_config)])
+
+    def test_tunnel_spec_hash_ignores_generated_name(self):
+        # GIVEN
+        options1 = {"name": "http-80-1", "addr": "80", "proto": "http"}
+        options2 = {"proto": "http", "addr": "80", "name": "http-80-2"}
+
+        # THEN
+        self.assertEqual(ngrok._tunnel_spec_hash(options1, True), ngrok._tunnel_spec_hash(options2, True))
+        self.assertNotEqual(ngrok._tunnel_spec_hash(options1, False), ngrok._tunnel_spec_hash(options2, False))
+
+    def test_api_request_deadline_caps_timeout(self):
+        # WHEN
+        with mock.patch("pyngrok.ngrok.urlopen",
+                        return_value=self.given_api_response(b"{\"tunnels\": []}")) as mock_urlopen:
+            ngrok.api_request("http://127.0.0.1:4040/api/tunnels", timeout=4, deadline=0.5)
+
+        # THEN
+        self.assertLessEqual(mock_urlopen.call_args[0][2], 0.5)
+
+    def test_api_request_deadline_exceeded(self):
+        # GIVEN
+        deadline = Deadline(0.2)
+        retry_policy = RetryPolicy(backoff=0.05)
+
+        def timeout(request, data, timeout):
+            time.sleep(timeout)
+            raise socket.timeout()
+
+        # WHEN
+        start = time.monotonic()
+        with mock.patch("pyngrok.ngrok.urlopen", side_effect=timeout):
+            with self.assertRaises(PyngrokDeadlineError) as cm:
+                ngrok.api_request("http://127.0.0.1:4040/api/tunnels", retry_policy=retry_policy, deadline=deadline)
+        elapsed = time.monotonic() - start
+
+        # THEN
+        self.assertEqual("GET /api/tunnels", cm.exception.stage)
+        self.assertLess(elapsed, 0.5)
+
+        # WHEN
+        with mock.patch("pyngrok.ngrok.urlopen") as mock_urlopen:
+            with self.assertRaises(PyngrokDeadlineError):
+                ngrok.api_request("http://127.0.0.1:4040/api/tunnels", deadline=deadline)
+
+        # THEN
+        mock_urlopen.assert_not_called()
+
+    @mock.patch("pyngrok.ngrok.api_request")
+    @mock.patch("pyngrok.process.get_process")
+    def test_connect_shares_deadline(self, mock_get_process, mock_api_request):
+        # GIVEN
+        self.given_fake_ngrok_installed(self.pyngrok_config)
+        mock_api_request.return_value = {"public_url": "https://my-tunnel.ngrok.io", "name": "my-tunnel"}
+
+        # WHEN
+        ngrok.connect(pyngrok_config=self.pyngrok_config, deadline=5)
+
+        # THEN
+        deadline = mock_get_process.call_args[0][1]
+        self.assertIsInstance(deadline, Deadline)
+        self.assertIs(deadline, mock_api_request.call_args[1]["deadline"])
+
+    def test_retry_policy_get_delay(self):
+        # GIVEN
+        retry_policy = RetryPolicy(backoff=0.1, max_backoff=0.3)
+
+        # WHEN
+        delays = [[retry_policy.get_delay(retry) for _ in range(50)] for retry in [1, 2, 3, 4]]
+
+        # THEN
+        for (low, high), retry_delays in zip([(0.05, 0.1), (0.1, 0.2), (0.15, 0.3), (0.15, 0.3)], delays):
+            self.assertTrue(all(low <= delay <= high for delay in retry_delays))
+        self.assertGreater(len(set(delays[0])), 1)
+
+    @staticmethod
+    def given_api_response(body):
+        response = mock.MagicMock()
+        response.read.return_value = body
+        response.getcode.return_value = 200
+        return response
+
+    @staticmethod
+    def given_http_error(status_code):
+        return HTTPError("http://127.0.0.1:4040/api/tunnels/my-tunnel", status_code, "Error", {}, io.BytesIO(b"{}"))
@@ -0,0 +1,133 @@
+__copyright__ = "Copyright (c) 2018-2025 Alex Laird"
+__license__ = "MIT"
+
+import platform
+import threading
+import time
+import unittest
+from unittest import mock
+
+from pyngrok import ngrok
+from pyngrok.exception import PyngrokError
+from pyngrok.pool import TunnelPool
+from tests.testcase import NgrokTestCase
+
+
+@unittest.skipIf(platform.system() == "Windows", "The fake agent is not supported on Windows")
+class TestTunnelPool(NgrokTestCase):
+    def setUp(self):
+        super(TestTunnelPool, self).setUp()
+
+        self.given_fake_ngrok_installed(self.pyngrok_config)
+
+    def test_lease(self):
+        # GIVEN
+        pool = TunnelPool(2, "8000", pyngrok_config=self.pyngrok_config)
+        pool.start()
+        public_urls = {t.public_url for t in ngrok.get_tunnels(self.pyngrok_config)}
+
+        # WHEN
+        with mock.patch("pyngrok.ngrok.connect") as mock_connect:
+            with pool.lease() as tunnel1, pool.lease() as tunnel2:
+                stats = pool.stats()
+            with pool.lease() as tunnel3:
+                pass
+
+        # THEN
+        mock_connect.assert_not_called()
+        self.assertEqual(public_urls, {tunnel1.public_url, tunnel2.public_url})
+        self.assertIn(tunnel3.public_url, public_urls)
+        self.assertEqual(2, stats.in_use)
+        self.assertEqual(3, pool.stats().leases)
+        self.assertEqual(0, pool.stats().in_use)
+        self.assertEqual(2, pool.stats().creates)
+        self.assertGreater(pool.stats().utilization, 0)
+
+        # WHEN
+        pool.close()
+
+        # THEN
+        self.assertEqual([], ngrok.get_tunnels(self.pyngrok_config))
+
+    def test_lease_waits_for_release(self):
+        # GIVEN
+        pool = TunnelPool(1, "8000", pyngrok_config=self.pyngrok_config)
+        leased = pool.acquire()
+        threading.Timer(0.2, pool.release, args=(leased,)).start()
+
+        # WHEN
+        with pool.lease(timeout=5) as tunnel:
+            pass
+
+        # THEN
+        self.assertIs(leased, tunnel)
+        self.assertGreaterEqual(pool.stats().max_wait_time, 0.1)
+        self.assertGreater(pool.stats().mean_wait_time, 0)
+
+        # WHEN
+        pool.acquire()
+        with self.assertRaises(PyngrokError):
+            pool.acquire(timeout=0.1)
+
+        pool.close()
+
+    def test_lease_repoints_and_recycles(self):
+        # GIVEN
+        pool = TunnelPool(1, "8000", pyngrok_config=self.pyngrok_config)
+        ngrok_process = ngrok.get_ngrok_process(self.pyngrok_config)
+
+        # WHEN
+        with pool.lease("9000") as tunnel:
+            definition = ngrok_process._tunnel_definitions[tunnel.name]
+        with pool.lease("9000", recycle=True) as recycled_tunnel:
+            pass
+        with pool.lease("9000", timeout=5) as tunnel2:
+            pass
+
+        # THEN
+        self.assertEqual("9000", definition["addr"])
+        self.assertIs(tunnel, recycled_tunnel)
+        self.assertIsNot(tunnel, tunnel2)
+        self.assertEqual(1, pool.stats().repoints)
+        self.assertEqual(1, pool.stats().recycles)
+        self.assertEqual(3, pool.stats().creates)
+        self.assertEqual([tunnel2.public_url], [t.public_url for t in ngrok.get_tunnels(self.pyngrok_config)])
+
+        pool.close()
+
+    def test_max_concurrent_creates(self):
+        # GIVEN
+        in_flight = []
+        max_in_flight = []
+        lock = threading.Lock()
+        connect = ngrok.connect
+
+        def tracked_connect(*args, **kwargs):
+            with lock:
+                in_flight.append(1)
+                max_in_flight.append(len(in_flight))
+            time.sleep(0.05)
+            try:
+                return connect(*args, **kwargs)
+            finally:
+                with lock:
+                    in_flight.pop()
+
+        # WHEN
+        with mock.patch("pyngrok.ngrok.connect", side_effect=tracked_connect):
+            with TunnelPool(6, "8000", pyngrok_config=self.pyngrok_config, max_concurrent_creates=2) as pool:
+                size = len(ngrok.get_tunnels(self.pyngrok_config))
+
+        # THEN
+        self.assertEqual(6, size)
+        self.assertEqual(2, max(max_in_flight))
+        self.assertEqual(6, pool.stats().creates)
+
+    def test_release_unknown_tunnel(self):
+        # GIVEN
+        pool = TunnelPool(1, "8000", pyngrok_config=self.pyngrok_config)
+        tunnel = ngrok.connect("8000", pyngrok_config=self.pyngrok_config)
+
+        # WHEN
+        with self.assertRaises(ValueError):
+            pool.release(tunnel)
@@ -1,16 +1,23 @@
 __copyright__ = "Copyright (c) 2018-2024 Alex Laird"
 __license__ = "MIT"
 
+import json
 import os
 import platform
+import signal
+import socket
+import subprocess
+import sys
+import threading
 import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from unittest import mock
 from urllib.parse import urlparse
 from urllib.request import urlopen
 
-from pyngrok import installer, ngrok, process
-from pyngrok.exception import PyngrokNgrokError
+from pyngrok import fake_agent, installer, ngrok, process
+from pyngrok.exception import PyngrokDeadlineError, PyngrokNgrokError
 from pyngrok.process import NgrokLog
 from tests.testcase import NgrokTestCase
 
@@ -354,3 +361,572 @@ class TestProcess(NgrokTestCase):
         ngrok_log = NgrokLog("t=123456789")
         # THEN
         self.assertEqual(ngrok_log.t, "123456789")
+
+    @unittest.skipIf(platform.system() == "Windows", "The fake agent is not supported on Windows")
+    def test_prewarm(self):
+        # GIVEN
+        self.given_fake_ngrok_installed(self.pyngrok_config)
+
+        # WHEN
+        with mock.patch.dict(os.environ, {fake_agent.STARTUP_DELAY_ENV: "0.5"}):
+            pending_start = ngrok.prewarm(self.pyngrok_config)
+            duplicate_pending_start = ngrok.prewarm(self.pyngrok_config)
+            ngrok_process = ngrok.get_ngrok_process(self.pyngrok_config)
+
+        # THEN
+        self.assertIs(pending_start, duplicate_pending_start)
+        self.assertIs(ngrok_process, pending_start.result())
+        self.assertTrue(ngrok_process.healthy())
+        self.assertEqual(1, process._start_counts[self.pyngrok_config.ngrok_path])
+        self.assertNotIn(self.pyngrok_config.ngrok_path, process._pending_starts)
+
+        # WHEN
+        running_start = ngrok.prewarm(self.pyngrok_config)
+
+        # THEN
+        self.assertTrue(running_start.done())
+        self.assertIs(ngrok_process, running_start.result())
+        self.assertEqual(1, process._start_counts[self.pyngrok_config.ngrok_path])
+
+    @unittest.skipIf(platform.system() == "Windows", "The fake agent is not supported on Windows")
+    def test_prewarm_startup_error(self):
+        # GIVEN
+        self.given_fake_ngrok_installed(self.pyngrok_config)
+
+        # WHEN
+        with mock.patch.dict(os.environ, {fake_agent.STARTUP_ERROR_ENV: "authentication failed"}):
+            pending_start = ngrok.prewarm(self.pyngrok_config)
+            with self.assertRaises(PyngrokNgrokError) as cm:
+                ngrok.get_ngrok_process(self.pyngrok_config)
+
+        # THEN
+        self.assertEqual("authentication failed", cm.exception.ngrok_error)
+        self.assertIs(cm.exception, pending_start.exception())
+
+        # WHEN
+        ngrok_process = ngrok.get_ngrok_process(self.pyngrok_config)
+
+        # THEN
+        self.assertTrue(ngrok_process.healthy())
+
+    @unittest.skipIf(platform.system() == "Windows", "The fake agent is not supported on Windows")
+    def test_get_process_deadline(self):
+        # GIVEN
+        self.given_fake_ngrok_installed(self.pyngrok_config)
+
+        # WHEN
+        start = time.monotonic()
+        with mock.patch.dict(os.environ, {fake_agent.STARTUP_DELAY_ENV: "1"}):
+            with self.assertRaises(PyngrokDeadlineError) as cm:
+                ngrok.get_ngrok_process(self.pyngrok_config, deadline=0.2)
+        elapsed = time.monotonic() - start
+
+        # THEN
+        self.assertEqual("starting ngrok", cm.exception.stage)
+        self.assertLess(elapsed, 0.8)
+
+        # WHEN
+        ngrok_process = ngrok.get_ngrok_process(self.pyngrok_config)
+
+        # THEN
+        self.assertTrue(ngrok_process.healthy())
+        self.assertEqual(1, process._start_counts[self.pyngrok_config.ngrok_path])
+
+    @unittest.skipIf(platform.system() == "Windows", "The fake agent is not supported on Windows")
+    def test_start_process_silent_past_startup_timeout(self):
+        # GIVEN
+        self.given_fake_ngrok_installed(self.pyngrok_config)
+        pyngrok_config = self.copy_with_updates(self.pyngrok_config, startup_timeout=0.5)
+
+        # WHEN
+        start = time.monotonic()
+        with mock.patch.dict(os.environ, {fake_agent.STARTUP_DELAY_ENV: "10"}):
+            with self.assertRaises(PyngrokNgrokError) as cm:
+                process.get_process(pyngrok_config)
+        elapsed = time.monotonic() - start
+
+        # THEN
+        self.assertIn("did not start within 0.5 seconds", str(cm.exception))
+        self.assertLess(elapsed, 5)
+        self.assertFalse(process.is_process_running(pyngrok_config.ngrok_path))
+
+    @unittest.skipIf(platform.system() == "Windows", "The fake agent is not supported on Windows")
+    def test_concurrent_get_process_single_flight(self):
+        # GIVEN
+        self.given_fake_ngrok_installed(self.pyngrok_config)
+        thread_count = 32
+        barrier = threading.Barrier(thread_count)
+
+        def connect(port):
+            barrier.wait()
+            tunnel = ngrok.connect(port, pyngrok_config=self.pyngrok_config)
+            return ngrok.get_ngrok_process(self.pyngrok_config), tunnel
+
+        # WHEN
+        with mock.patch.dict(os.environ, {fake_agent.STARTUP_DELAY_ENV: "0.2"}):
+            with ThreadPoolExecutor(max_workers=thread_count) as executor:
+                results = list(executor.map(connect, range(8000, 8000 + thread_count)))
+
+        # THEN
+        ngrok_processes = {id(ngrok_process) for ngrok_process, _ in results}
+        self.assertEqual(1, len(ngrok_processes))
+        self.assertEqual(1, process._start_counts[self.pyngrok_config.ngrok_path])
+        self.assertEqual(1, len(process._current_processes))
+        self.assertEqual(0, len(process._pending_starts))
+        self.assertEqual(thread_count, len({tunnel.public_url for _, tunnel in results}))
+        self.assertEqual(thread_count, len(ngrok.get_tunnels(self.pyngrok_config)))
+
+    @unittest.skipIf(platform.system() == "Windows", "The fake agent is not supported on Windows")
+    def test_supervised_process_restarts(self):
+        # GIVEN
+        events = []
+        pyngrok_config = self.copy_with_updates(self.pyngrok_config, supervise=True, restart_backoff=0.1,
+                                                process_event_callback=events.append)
+        self.given_fake_ngrok_installed(pyngrok_config)
+        tunnel = ngrok.connect(8000, name="my-tunnel", pyngrok_config=pyngrok_config)
+        public_url = tunnel.public_url
+        ngrok_process = ngrok.get_ngrok_process(pyngrok_config)
+        proc = ngrok_process.proc
+
+        # WHEN
+        proc.kill()
+        self.wait_for(lambda: ngrok_process.restart_count == 1)
+
+        # THEN
+        self.assertEqual(["exited", "restarting", "restarted"], [event.event for event in events])
+        self.assertEqual(-9, events[0].returncode)
+        self.assertEqual(1, events[2].restart_count)
+        self.assertNotEqual(proc.pid, ngrok_process.proc.pid)
+        self.assertTrue(proc.stdout.closed)
+        self.assertNotIn(proc, process._spawned_procs)
+        self.assertIs(ngrok_process, ngrok.get_ngrok_process(pyngrok_config))
+        self.assertTrue(ngrok_process.healthy())
+        self.assertEqual(2, process._start_counts[pyngrok_config.ngrok_path])
+        self.assertNotEqual(public_url, tunnel.public_url)
+        self.assertEqual({public_url: tunnel.public_url}, events[2].public_urls)
+        self.assertEqual([tunnel.public_url], list(ngrok._current_tunnels))
+        tunnels = ngrok.get_tunnels(pyngrok_config)
+        self.assertEqual(["my-tunnel"], [t.name for t in tunnels])
+        self.assertEqual([tunnel.public_url], [t.public_url for t in tunnels])
+        self.assertEqual("http://localhost:8000", tunnels[0].config["addr"])
+
+        # WHEN
+        ngrok.disconnect(tunnel.public_url, pyngrok_config=pyngrok_config)
+
+        # THEN
+        self.assertEqual(0, len(ngrok.get_tunnels(pyngrok_config)))
+        self.assertEqual({}, ngrok_process._tunnel_definitions)
+
+    @unittest.skipIf(platform.system() == "Windows", "The fake agent is not supported on Windows")
+    def test_supervised_process_killed_not_restarted(self):
+        # GIVEN
+        events = []
+        pyngrok_config = self.copy_with_updates(self.pyngrok_config, supervise=True,
+                                                process_event_callback=events.append)
+        self.given_fake_ngrok_installed(pyngrok_config)
+        ngrok_process = ngrok.get_ngrok_process(pyngrok_config)
+
+        # WHEN
+        ngrok.kill(pyngrok_config)
+        time.sleep(0.5)
+
+        # THEN
+        self.assertIsNotNone(ngrok_process.proc.poll())
+        self.assertFalse(process.is_process_running(pyngrok_config.ngrok_path))
+        self.assertEqual([], events)
+
+    @unittest.skipIf(platform.system() == "Windows", "The fake agent is not supported on Windows")
+    def test_startup_error_releases_process(self):
+        # GIVEN
+        pyngrok_config = self.copy_with_updates(self.pyngrok_config, supervise=True)
+        self.given_fake_ngrok_installed(pyngrok_config)
+        launch_process = process._launch_process
+        procs = []
+        exit_handlers = set()
+
+        def mock_launch_process(*args):
+            procs.append(launch_process(*args))
+            return procs[-1]
+
+        # WHEN
+        with mock.patch.dict(os.environ, {fake_agent.STARTUP_ERROR_ENV: "authentication failed"}), \
+                mock.patch("pyngrok.process._launch_process", side_effect=mock_launch_process), \
+                mock.patch("atexit.register", side_effect=exit_handlers.add), \
+                mock.patch("atexit.unregister", side_effect=exit_handlers.discard):
+            for _ in range(3):
+                with self.assertRaises(PyngrokNgrokError):
+                    process.get_process(pyngrok_config)
+
+        # THEN
+        self.assertEqual(3, len(procs))
+        self.assertTrue(all(proc.stdout.closed for proc in procs))
+        self.assertFalse(any(proc in process._spawned_procs for proc in procs))
+        self.assertEqual(set(), exit_handlers)
+        self.assertFalse(process.is_process_running(pyngrok_config.ngrok_path))
+
+    @unittest.skipIf(platform.system() == "Windows", "The fake agent is not supported on Windows")
+    def test_supervised_process_restart_fails(self):
+        # GIVEN
+        events = []
+        pyngrok_config = self.copy_with_updates(self.pyngrok_config, supervise=True, restart_backoff=0.05,
+                                                max_restart_attempts=2, process_event_callback=events.append)
+        self.given_fake_ngrok_installed(pyngrok_config)
+        ngrok_process = ngrok.get_ngrok_process(pyngrok_config)
+
+        # WHEN
+        with mock.patch.dict(os.environ, {fake_agent.STARTUP_ERROR_ENV: "authentication failed"}):
+            ngrok_process.proc.kill()
+            self.wait_for(lambda: events and events[-1].event == "restart_failed")
+
+        # THEN
+        self.assertEqual(["exited", "restarting", "restarting", "restart_failed"], [event.event for event in events])
+        self.assertIn("authentication failed", events[-1].error)
+        self.assertEqual(0, ngrok_process.restart_count)
+        self.assertFalse(process.is_process_running(pyngrok_config.ngrok_path))
+        self.assertEqual(0, len(process._pending_starts))
+
+    @unittest.skipIf(platform.system() == "Windows", "The fake agent is not supported on Windows")
+    def test_health_check_thread(self):
+        # GIVEN
+        pyngrok_config = self.copy_with_updates(self.pyngrok_config, health_check_interval=0.05, request_timeout=0.2)
+        self.given_fake_ngrok_installed(pyngrok_config)
+
+        # WHEN
+        ngrok_process = ngrok.get_ngrok_process(pyngrok_config)
+        self.wait_for(lambda: ngrok_process.health.healthy)
+
+        # THEN
+        last_success_at = ngrok_process.health.last_success_at
+        self.assertIsNotNone(last_success_at)
+        self.assertGreaterEqual(ngrok_process.health.latency, 0)
+        self.assertEqual(0, ngrok_process.health.consecutive_failures)
+
+        # WHEN
+        os.kill(ngrok_process.proc.pid, signal.SIGSTOP)
+        try:
+            self.wait_for(lambda: ngrok_process.health.consecutive_failures >= 2)
+        finally:
+            os.kill(ngrok_process.proc.pid, signal.SIGCONT)
+
+        # THEN
+        self.assertFalse(ngrok_process.health.healthy)
+        self.assertIsNotNone(ngrok_process.health.error)
+        self.assertGreaterEqual(ngrok_process.health.last_success_at, last_success_at)
+        self.assertTrue(process.is_process_running(pyngrok_config.ngrok_path))
+
+        # WHEN
+        self.wait_for(lambda: ngrok_process.health.healthy)
+        ngrok.kill(pyngrok_config)
+
+        # THEN
+        self.wait_for(lambda: ngrok_process._health_check_thread is None)
+        self.assertEqual(0, ngrok_process.restart_count)
+
+    @unittest.skipIf(platform.system() == "Windows", "The fake agent is not supported on Windows")
+    def test_health_check_restarts_hung_process(self):
+        for supervise in [True, False]:
+            with self.subTest(supervise=supervise):
+                # GIVEN
+                events = []
+                pyngrok_config = self.copy_with_updates(self.pyngrok_config, supervise=supervise,
+                                                        health_check_interval=0.05, max_health_check_failures=2,
+                                                        request_timeout=0.2, restart_backoff=0.1,
+                                                        process_event_callback=events.append)
+                self.given_fake_ngrok_installed(pyngrok_config)
+                ngrok.connect(8000, name="my-tunnel", pyngrok_config=pyngrok_config)
+                ngrok_process = ngrok.get_ngrok_process(pyngrok_config)
+                pid = ngrok_process.proc.pid
+
+                # WHEN
+                os.kill(pid, signal.SIGSTOP)
+                self.wait_for(lambda: ngrok_process.restart_count == 1)
+                self.wait_for(lambda: ngrok_process.health.healthy)
+
+                # THEN
+                self.assertEqual(["unresponsive", "exited", "restarting", "restarted"],
+                                 [event.event for event in events])
+                self.assertNotEqual(pid, ngrok_process.proc.pid)
+                self.assertFalse(process._pid_alive(pid))
+                self.assertEqual(["my-tunnel"], [t.name for t in ngrok.get_tunnels(pyngrok_config)])
+
+                ngrok.kill(pyngrok_config)
+
+    def wait_for(self, condition, timeout=10):
+        timeout_at = time.time() + timeout
+        while not condition():
+            if time.time() > timeout_at:
+                self.fail("Timed out waiting for condition")
+            time.sleep(0.05)
+
+    @unittest.skipIf(platform.system() == "Windows", "Attaching is not supported on Windows")
+    def test_attach_from_another_process(self):
+        # GIVEN
+        pyngrok_config = self.copy_with_updates(self.pyngrok_config, attach=True)
+        self.given_fake_ngrok_installed(pyngrok_config)
+        ngrok_process = ngrok.get_ngrok_process(pyngrok_config)
+
+        # WHEN
+        child = self.given_attached_child_process(pyngrok_config)
+        child_pid, child_owned = child.stdout.readline().split()
+
+        # THEN
+        self.assertTrue(ngrok_process.owned)
+        self.assertEqual(str(ngrok_process.proc.pid), child_pid)
+        self.assertEqual("False", child_owned)
+        state = process._read_agent_state(pyngrok_config)
+        self.assertEqual(os.getpid(), state["owner_pid"])
+        self.assertEqual([os.getpid(), child.pid], state["attached_pids"])
+
+        # WHEN
+        child.communicate()
+
+        # THEN
+        self.assertIsNone(ngrok_process.proc.poll())
+        self.assertEqual([os.getpid()], process._read_agent_state(pyngrok_config)["attached_pids"])
+
+        # WHEN
+        ngrok.kill(pyngrok_config)
+
+        # THEN
+        self.assertIsNotNone(ngrok_process.proc.poll())
+        self.assertIsNone(process._read_agent_state(pyngrok_config))
+
+    @unittest.skipIf(platform.system() == "Windows", "Attaching is not supported on Windows")
+    def test_attach_ownership_handoff(self):
+        # GIVEN
+        pyngrok_config = self.copy_with_updates(self.pyngrok_config, attach=True)
+        self.given_fake_ngrok_installed(pyngrok_config)
+        child = self.given_attached_child_process(pyngrok_config)
+        child_pid, child_owned = child.stdout.readline().split()
+
+        # WHEN
+        ngrok_process = ngrok.get_ngrok_process(pyngrok_config)
+
+        # THEN
+        self.assertEqual("True", child_owned)
+        self.assertEqual(child_pid, str(ngrok_process.proc.pid))
+        self.assertFalse(ngrok_process.owned)
+        self.assertEqual(child.pid, process._read_agent_state(pyngrok_config)["owner_pid"])
+
+        # WHEN
+        child.communicate()
+        tunnel = ngrok.connect(8000, pyngrok_config=pyngrok_config)
+
+        # THEN
+        self.assertEqual(os.getpid(), process._read_agent_state(pyngrok_config)["owner_pid"])
+        self.assertIsNone(ngrok_process.proc.poll())
+        self.assertEqual([tunnel.public_url], [t.public_url for t in ngrok.get_tunnels(pyngrok_config)])
+
+        # WHEN
+        ngrok.kill(pyngrok_config)
+        ngrok_process.proc.wait(timeout=5)
+
+        # THEN
+        self.assertIsNotNone(ngrok_process.proc.poll())
+        self.assertTrue(ngrok_process.proc.stdout.closed)
+        self.assertIsNone(process._read_agent_state(pyngrok_config))
+
+    @unittest.skipIf(platform.system() == "Windows", "Attaching is not supported on Windows")
+    def test_attach_rejected_candidates_closed(self):
+        # GIVEN
+        pyngrok_config = self.copy_with_updates(self.pyngrok_config, attach=True)
+        log_path = process._get_agent_state_path(pyngrok_config, "log")
+        open(log_path, "w").close()
+        dead_proc = subprocess.Popen([sys.executable, "-c", ""])
+        dead_proc.wait()
+        attached_procs = []
+        attached_proc_class = process._AttachedProc
+
+        def track_attached_proc(*args):
+            attached_procs.append(attached_proc_class(*args))
+            return attached_procs[-1]
+
+        for pid in [dead_proc.pid, os.getpid()]:
+            # WHEN
+            with mock.patch("pyngrok.process._AttachedProc", side_effect=track_attached_proc):
+                ngrok_process = process._attach_process(pyngrok_config, {"pid": pid,
+                                                                         "api_url": "http://127.0.0.1:1",
+                                                                         "log_path": log_path})
+
+            # THEN
+            self.assertIsNone(ngrok_process)
+            self.assertTrue(attached_procs[-1].stdout.closed)
+
+    @unittest.skipIf(platform.system() == "Windows", "Attaching is not supported on Windows")
+    def test_attach_by_web_addr(self):
+        # GIVEN
+        self.given_fake_ngrok_installed(self.pyngrok_config)
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            web_port = s.getsockname()[1]
+        with open(self.pyngrok_config.config_path, "w") as config_file:
+            config_file.write(f"version: 2\nweb_addr: 127.0.0.1:{web_port}\n")
+        unmanaged_process = process._start_process(self.pyngrok_config)
+        process._current_processes.pop(self.pyngrok_config.ngrok_path)
+        pyngrok_config = self.copy_with_updates(self.pyngrok_config, attach=True)
+
+        try:
+            # WHEN
+            ngrok_process = ngrok.get_ngrok_process(pyngrok_config)
+
+            # THEN
+            self.assertFalse(ngrok_process.owned)
+            self.assertIsNone(ngrok_process.proc.pid)
+            self.assertEqual(f"http://127.0.0.1:{web_port}", ngrok_process.api_url)
+            self.assertIsNone(process._read_agent_state(pyngrok_config)["owner_pid"])
+
+            # WHEN
+            ngrok.kill(pyngrok_config)
+
+            # THEN
+            self.assertIsNone(unmanaged_process.proc.poll())
+        finally:
+            unmanaged_process.proc.kill()
+            unmanaged_process.proc.wait()
+
+    @unittest.skipIf(platform.system() == "Windows", "Persisting is not supported on Windows")
+    def test_persist_across_reload(self):
+        # GIVEN
+        pyngrok_config = self.copy_with_updates(self.pyngrok_config, persist=True)
+        self.given_fake_ngrok_installed(pyngrok_config)
+        script = ("import sys\n"
+                  "from pyngrok import ngrok\n"
+                  "from pyngrok.conf import PyngrokConfig\n"
+                  "pyngrok_config = PyngrokConfig(ngrok_path=sys.argv[1], config_path=sys.argv[2], persist=True)\n"
+                  "tunnel = ngrok.connect(8000, pyngrok_config=pyngrok_config)\n"
+                  "print(ngrok.get_ngrok_process(pyngrok_config).proc.pid, tunnel.public_url, flush=True)\n")
+        env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+        # WHEN
+        output = subprocess.check_output([sys.executable, "-c", script, pyngrok_config.ngrok_path,
+                                          pyngrok_config.config_path], env=env, universal_newlines=True)
+        ngrok_pid, public_url = output.split()
+        try:
+            # THEN
+            self.assertTrue(process._pid_alive(int(ngrok_pid)))
+            state = process._read_agent_state(pyngrok_config)
+            self.assertEqual([], state["attached_pids"])
+            self.assertEqual(1, len(state["tunnel_spec_hashes"]))
+
+            # WHEN
+            tunnel = ngrok.connect(8000, pyngrok_config=pyngrok_config)
+            ngrok_process = ngrok.get_ngrok_process(pyngrok_config)
+
+            # THEN
+            self.assertEqual(public_url, tunnel.public_url)
+            self.assertEqual(ngrok_pid, str(ngrok_process.proc.pid))
+            self.assertFalse(ngrok_process.owned)
+            self.assertEqual(1, len(ngrok.get_tunnels(pyngrok_config)))
+
+            # WHEN
+            ngrok.disconnect(public_url, pyngrok_config)
+
+            # THEN
+            self.assertEqual({}, process._read_agent_state(pyngrok_config)["tunnel_spec_hashes"])
+
+            # WHEN
+            ngrok.kill(pyngrok_config)
+            ngrok_process.proc.wait(timeout=5)
+
+            # THEN
+            self.assertTrue(ngrok_process.proc.stdout.closed)
+            self.assertIsNone(process._read_agent_state(pyngrok_config))
+        finally:
+            if process._pid_alive(int(ngrok_pid)):
+                os.kill(int(ngrok_pid), signal.SIGKILL)
+
+    @staticmethod
+    def given_attached_child_process(pyngrok_config):
+        script = ("import sys\n"
+                  "from pyngrok import ngrok\n"
+                  "from pyngrok.conf import PyngrokConfig\n"
+                  "pyngrok_config = PyngrokConfig(ngrok_path=sys.argv[1], config_path=sys.argv[2], attach=True)\n"
+                  "ngrok_process = ngrok.get_ngrok_process(pyngrok_config)\n"
+                  "print(ngrok_process.proc.pid, ngrok_process.owned, flush=True)\n"
+                  "sys.stdin.readline()\n")
+        env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+        return subprocess.Popen([sys.executable, "-c", script, pyngrok_config.ngrok_path, pyngrok_config.config_path],
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, universal_newlines=True, env=env)
+
+    @unittest.skipIf(not hasattr(os, "fork"), "os.fork() is not supported")
+    def test_fork_safety(self):
+        # GIVEN
+        self.given_fake_ngrok_installed(self.pyngrok_config)
+        tunnel = ngrok.connect(8000, pyngrok_config=self.pyngrok_config)
+        ngrok_process = ngrok.get_ngrok_process(self.pyngrok_config)
+        proc = ngrok_process.proc
+        read_fd, write_fd = os.pipe()
+
+        # WHEN
+        with process._startup_lock:
+            pid = os.fork()
+            if pid == 0:
+                exit_code = 1
+                try:
+                    os.close(read_fd)
+                    cached_tunnels = len(ngrok._current_tunnels)
+                    child_process = ngrok.get_ngrok_process(self.pyngrok_config)
+                    result = {"same_process": child_process is ngrok_process,
+                              "owned": child_process.owned,
+                              "monitor_thread": child_process._monitor_thread is not None,
+                              "cached_tunnels": cached_tunnels,
+                              "tunnels": [t.public_url for t in ngrok.get_tunnels(self.pyngrok_config)]}
+                    # Simulate the exit handler the child inherited from the parent
+                    process._terminate_process(proc)
+                    with os.fdopen(write_fd, "w") as f:
+                        json.dump(result, f)
+                    exit_code = 0
+                finally:
+                    os._exit(exit_code)
+        os.close(write_fd)
+        with os.fdopen(read_fd, "r") as f:
+            output = f.read()
+        _, status = os.waitpid(pid, 0)
+
+        # THEN
+        self.assertEqual(0, os.waitstatus_to_exitcode(status))
+        result = json.loads(output)
+        self.assertTrue(result["same_process"])
+        self.assertFalse(result["owned"])
+        self.assertFalse(result["monitor_thread"])
+        self.assertEqual(0, result["cached_tunnels"])
+        self.assertEqual([tunnel.public_url], result["tunnels"])
+        self.assertIsNone(proc.poll())
+        self.assertTrue(ngrok_process.owned)
+        self.assertIsNotNone(ngrok_process._monitor_thread)
+
+    @unittest.skipIf(not hasattr(os, "fork"), "os.fork() is not supported")
+    def test_kill_in_forked_child(self):
+        # GIVEN
+        self.given_fake_ngrok_installed(self.pyngrok_config)
+        tunnel = ngrok.connect(8000, pyngrok_config=self.pyngrok_config)
+        ngrok_process = ngrok.get_ngrok_process(self.pyngrok_config)
+        proc = ngrok_process.proc
+
+        # WHEN
+        with process._startup_lock:
+            pid = os.fork()
+            if pid == 0:
+                exit_code = 1
+                try:
+                    ngrok.kill(self.pyngrok_config)
+                    if not process._current_processes and not ngrok._current_tunnels:
+                        exit_code = 0
+                finally:
+                    os._exit(exit_code)
+        timeout_at = time.time() + 10
+        waited_pid, status = os.waitpid(pid, os.WNOHANG)
+        while waited_pid == 0 and time.time() < timeout_at:
+            time.sleep(0.05)
+            waited_pid, status = os.waitpid(pid, os.WNOHANG)
+        if waited_pid == 0:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            self.fail("Forked child did not exit after ngrok.kill()")
+
+        # THEN
+        self.assertEqual(0, os.waitstatus_to_exitcode(status))
+        self.assertIsNone(proc.poll())
+        self.assertIs(ngrok_process, ngrok.get_ngrok_process(self.pyngrok_config))
+        self.assertEqual([tunnel.public_url], [t.public_url for t in ngrok.get_tunnels(self.pyngrok_config)])
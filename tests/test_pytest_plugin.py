@@ -0,0 +1,133 @@
+__copyright__ = "Copyright (c) 2018-2025 Alex Laird"
+__license__ = "MIT"
+
+import os
+import platform
+import subprocess
+import sys
+import unittest
+from unittest import mock
+
+from pyngrok import fake_agent, pytest_plugin
+from tests.testcase import NgrokTestCase
+
+CONFTEST = """
+import os
+
+from pyngrok import conf
+from pyngrok.conf import PyngrokConfig
+
+conf.set_default(PyngrokConfig(ngrok_path=os.environ["TEST_NGROK_PATH"], config_path=os.environ["TEST_CONFIG_PATH"],
+                               config_version=os.environ["TEST_CONFIG_VERSION"]))
+"""
+
+TESTS = """
+import pytest
+
+from pyngrok import conf, installer, ngrok
+
+pids = set()
+
+
+def get_web_addr(pyngrok_config):
+    config = installer.get_ngrok_config(pyngrok_config.config_path, use_cache=False,
+                                        config_version=pyngrok_config.config_version)
+
+    return config["agent"]["web_addr"] if pyngrok_config.config_version == "3" else config["web_addr"]
+
+
+def test_pyngrok_config(pyngrok_config, pyngrok_worker_id):
+    config = installer.get_ngrok_config(pyngrok_config.config_path, use_cache=False,
+                                        config_version=pyngrok_config.config_version)
+
+    assert pyngrok_worker_id == "gw3"
+    assert "pyngrok-gw3" in pyngrok_config.config_path
+    assert config["tunnels"]["web"]["addr"] == 5000
+    assert get_web_addr(pyngrok_config).startswith("127.0.0.1:")
+    if pyngrok_config.config_version == "3":
+        assert config["agent"]["authtoken"] == "some-token"
+        assert "web_addr" not in config
+
+
+@pytest.mark.ngrok_tunnel("8000", name="marked")
+def test_ngrok_tunnel(ngrok_process, ngrok_tunnel, pyngrok_config):
+    pids.add(ngrok_process.proc.pid)
+
+    assert ngrok_process.api_url == f"http://{get_web_addr(pyngrok_config)}"
+    assert conf.get_default() is pyngrok_config
+    assert ngrok_tunnel.name == "marked"
+    assert [ngrok_tunnel.public_url] == [t.public_url for t in ngrok.get_tunnels()]
+
+
+def test_ngrok_connect(ngrok_process, ngrok_connect):
+    pids.add(ngrok_process.proc.pid)
+
+    assert ngrok.get_tunnels() == []
+
+    tunnel = ngrok_connect("5000", name="web")
+
+    assert tunnel.upstream["url"] == "http://localhost:5000"
+    assert len(pids) == 1
+"""
+
+
+@unittest.skipIf(platform.system() == "Windows", "The fake agent is not supported on Windows")
+class TestPytestPlugin(NgrokTestCase):
+    def test_fixtures(self):
+        self.assert_fixtures_pass("2", "version: 2\ntunnels:\n  web:\n    proto: http\n    addr: 5000\n")
+
+    def test_fixtures_config_v3(self):
+        self.assert_fixtures_pass("3", "version: 3\nagent:\n  authtoken: some-token\n"
+                                       "tunnels:\n  web:\n    proto: http\n    addr: 5000\n")
+
+    def assert_fixtures_pass(self, config_version, config):
+        # GIVEN
+        fake_agent.install_fake_agent(self.pyngrok_config.ngrok_path)
+        with open(self.pyngrok_config.config_path, "w") as f:
+            f.write(config)
+        tests_dir = os.path.join(self.config_dir, "suite")
+        os.makedirs(tests_dir)
+        with open(os.path.join(tests_dir, "pytest.ini"), "w") as f:
+            f.write("[pytest]\n")
+        with open(os.path.join(tests_dir, "conftest.py"), "w") as f:
+            f.write(CONFTEST)
+        with open(os.path.join(tests_dir, "test_suite.py"), "w") as f:
+            f.write(TESTS)
+        env = dict(os.environ,
+                   PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                   PYTEST_XDIST_WORKER="gw3",
+                   TEST_NGROK_PATH=self.pyngrok_config.ngrok_path,
+                   TEST_CONFIG_PATH=self.pyngrok_config.config_path,
+                   TEST_CONFIG_VERSION=config_version)
+
+        # WHEN
+        result = subprocess.run([sys.executable, "-m", "pytest", "-q", "-p", "pyngrok.pytest_plugin",
+                                 "-p", "no:cacheprovider", "--basetemp", os.path.join(self.config_dir, "tmp"),
+                                 tests_dir],
+                                cwd=tests_dir, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                universal_newlines=True, timeout=60)
+
+        # THEN
+        self.assertEqual(0, result.returncode, result.stdout)
+        self.assertIn("3 passed", result.stdout)
+
+    def test_get_worker_id(self):
+        # GIVEN
+        config = mock.Mock(spec=[])
+
+        # WHEN
+        with mock.patch.dict(os.environ, clear=True):
+            worker_id = pytest_plugin.get_worker_id(config)
+
+        # THEN
+        self.assertEqual(pytest_plugin.DEFAULT_WORKER_ID, worker_id)
+
+        # GIVEN
+        config.workerinput = {"workerid": "gw1"}
+
+        # WHEN
+        with mock.patch.dict(os.environ, {"PYTEST_XDIST_WORKER": "gw2"}):
+            worker_id = pytest_plugin.get_worker_id(config)
+
+        # THEN
+        self.assertEqual("gw1", worker_id)
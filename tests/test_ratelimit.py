@@ -0,0 +1,30 @@
+__copyright__ = "Copyright (c) 2018-2025 Alex Laird"
+__license__ = "MIT"
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pyngrok.ratelimit import TokenBucket
+from tests.testcase import NgrokTestCase
+
+
+class TestRateLimit(NgrokTestCase):
+    def test_token_bucket(self):
+        # GIVEN
+        bucket = TokenBucket(50)
+
+        # WHEN
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda _: bucket.acquire(), range(11)))
+        elapsed = time.monotonic() - start
+
+        # THEN
+        # The first token is available right away, and each of the other 10 takes 1/50th of a second
+        self.assertGreaterEqual(elapsed, 0.19)
+        self.assertLess(elapsed, 1)
+
+    def test_token_bucket_invalid_rate(self):
+        # WHEN
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
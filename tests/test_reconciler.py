@@ -0,0 +1,114 @@
+__copyright__ = "Copyright (c) 2018-2025 Alex Laird"
+__license__ = "MIT"
+
+import platform
+import unittest
+from unittest import mock
+
+from pyngrok import ngrok, process, reconciler
+from pyngrok.exception import PyngrokNgrokHTTPError
+from pyngrok.reconciler import ReconcilePlan, TunnelSpec
+from tests.testcase import NgrokTestCase
+
+
+@unittest.skipIf(platform.system() == "Windows", "The fake agent is not supported on Windows")
+class TestReconciler(NgrokTestCase):
+    def setUp(self):
+        super(TestReconciler, self).setUp()
+
+        self.given_fake_ngrok_installed(self.pyngrok_config)
+
+    def test_reconcile_creates_tunnels(self):
+        # GIVEN
+        specs = [TunnelSpec("web", "8000"), TunnelSpec("ssh", "22", "tcp")]
+
+        # WHEN
+        result = reconciler.reconcile(specs, self.pyngrok_config)
+
+        # THEN
+        self.assertTrue(result.ok)
+        self.assertEqual(2, len(result.created))
+        self.assertEqual([], result.deleted)
+        self.assertEqual({"web", "ssh"}, {t.name for t in ngrok.get_tunnels(self.pyngrok_config)})
+
+    def test_reconcile_is_idempotent(self):
+        # GIVEN
+        specs = [TunnelSpec("web", "8000"), TunnelSpec("ssh", "22", "tcp")]
+        reconciler.reconcile(specs, self.pyngrok_config)
+
+        # WHEN
+        with mock.patch("pyngrok.ngrok.connect") as mock_connect, \
+                mock.patch("pyngrok.ngrok.disconnect") as mock_disconnect:
+            result = reconciler.reconcile(specs, self.pyngrok_config)
+
+        # THEN
+        self.assertTrue(result.plan.empty)
+        self.assertEqual(2, len(result.plan.unchanged))
+        mock_connect.assert_not_called()
+        mock_disconnect.assert_not_called()
+
+    def test_reconcile_replaces_changed_and_prunes_removed(self):
+        # GIVEN
+        reconciler.reconcile([TunnelSpec("web", "8000"), TunnelSpec("ssh", "22", "tcp")], self.pyngrok_config)
+        ngrok_process = ngrok.get_ngrok_process(self.pyngrok_config)
+
+        # WHEN
+        result = reconciler.reconcile([TunnelSpec("web", "9000")], self.pyngrok_config)
+
+        # THEN
+        self.assertTrue(result.ok)
+        self.assertEqual(["web"], [spec.name for spec in result.plan.create])
+        self.assertEqual({"web", "ssh"}, {t.name for t in result.deleted})
+        tunnels = ngrok.get_tunnels(self.pyngrok_config)
+        self.assertEqual(["web"], [t.name for t in tunnels])
+        self.assertEqual("9000", ngrok_process._tunnel_definitions["web"]["addr"])
+
+    def test_plan_without_prune(self):
+        # GIVEN
+        ngrok.connect("8000", name="unmanaged", pyngrok_config=self.pyngrok_config)
+
+        # WHEN
+        reconcile_plan = reconciler.plan([TunnelSpec("web", "8000")], self.pyngrok_config, prune=False)
+
+        # THEN
+        self.assertEqual(["web"], [spec.name for spec in reconcile_plan.create])
+        self.assertEqual([], reconcile_plan.delete)
+        self.assertEqual(["unmanaged"], [t.name for t in reconcile_plan.unchanged])
+
+    def test_plan_normalizes_legacy_params(self):
+        # GIVEN
+        reconciler.reconcile([TunnelSpec("web", "8000", bind_tls=True)], self.pyngrok_config)
+
+        # WHEN
+        reconcile_plan = reconciler.plan([TunnelSpec("web", "8000", schemes=["https"])], self.pyngrok_config)
+
+        # THEN
+        self.assertTrue(reconcile_plan.empty)
+
+    def test_plan_empty_does_not_start_process(self):
+        # WHEN
+        reconcile_plan = reconciler.plan([], self.pyngrok_config)
+
+        # THEN
+        self.assertTrue(reconcile_plan.empty)
+        self.assertFalse(process.is_process_running(self.pyngrok_config.ngrok_path))
+
+    def test_plan_duplicate_names(self):
+        # WHEN
+        with self.assertRaises(ValueError):
+            reconciler.plan([TunnelSpec("web", "8000"), TunnelSpec("web", "9000")], self.pyngrok_config)
+
+    def test_apply_collects_errors(self):
+        # GIVEN
+        reconcile_plan = ReconcilePlan([TunnelSpec("web", "8000"), TunnelSpec("ssh", "22", "tcp")], [], [])
+        error = PyngrokNgrokHTTPError("error", "http://localhost:4040/api/tunnels", 400, None, {}, "{}")
+        created = {"public_url": "tcp://0.tcp.ngrok.io:1", "name": "ssh"}
+
+        # WHEN
+        with mock.patch("pyngrok.ngrok.api_request", side_effect=[error, created]):
+            result = reconciler.apply(reconcile_plan, self.pyngrok_config, concurrency=1)
+
+        # THEN
+        self.assertFalse(result.ok)
+        self.assertIs(error, result.errors["web"])
+        self.assertEqual(["ssh"], [t.name for t in result.created])
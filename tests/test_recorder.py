@@ -0,0 +1,198 @@
+__copyright__ = "Copyright (c) 2018-2025 Alex Laird"
+__license__ = "MIT"
+
+import os
+import platform
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from pyngrok import ngrok
+from pyngrok.agent import CapturedRequest
+from pyngrok.recorder import RequestRecorder
+from tests.testcase import NgrokTestCase
+
+
+class TestRecorder(NgrokTestCase):
+    def setUp(self):
+        super(TestRecorder, self).setUp()
+
+        self.now = datetime.now(timezone.utc)
+
+    def test_record_and_query(self):
+        # GIVEN
+        recorder = RequestRecorder()
+        captured_requests = [
+            self.given_captured_request("1", "my-tunnel", "GET", "/health?verbose=1", 200, 3),
+            self.given_captured_request("2", "my-tunnel", "POST", "/webhook", 500, 2),
+            self.given_captured_request("3", "other-tunnel", "POST", "/webhook", 200, 1,
+                                        remote_addr="10.0.0.1"),
+        ]
+
+        # WHEN
+        recorded = recorder.record(captured_requests)
+        rerecorded = recorder.record(captured_requests[:1])
+
+        # THEN
+        self.assertEqual(3, recorded)
+        self.assertEqual(0, rerecorded)
+        self.assertEqual(3, recorder.count())
+        self.assertEqual(["1", "2", "3"], [r.id for r in recorder.query()])
+        self.assertEqual(["3", "2", "1"], [r.id for r in recorder.query(newest_first=True)])
+        self.assertEqual(["1", "2"], [r.id for r in recorder.query(tunnel_name="my-tunnel")])
+        self.assertEqual(["2", "3"], [r.id for r in recorder.query(method="post", path="/webhook")])
+        self.assertEqual(["1"], [r.id for r in recorder.query(path="/health")])
+        self.assertEqual(["2"], [r.id for r in recorder.query(status_code=500)])
+        self.assertEqual(["3"], [r.id for r in recorder.query(remote_addr="10.0.0.1")])
+        self.assertEqual(["2", "3"], [r.id for r in recorder.query(start_after=self.now - timedelta(minutes=2))])
+        self.assertEqual(["1"], [r.id for r in recorder.query(
+            start_before=(self.now - timedelta(minutes=2)).isoformat())])
+        self.assertEqual(["1"], [r.id for r in recorder.query(limit=1)])
+        self.assertEqual(1, recorder.count(tunnel_name="other-tunnel"))
+        self.assertEqual(captured_requests[1].data, recorder.get("2").data)
+        self.assertIsNone(recorder.get("does-not-exist"))
+
+        recorder.close()
+
+    def test_retention(self):
+        # GIVEN
+        recorder = RequestRecorder(max_requests=3, max_age=10 * 60)
+
+        # WHEN
+        recorder.record([self.given_captured_request(str(i), "my-tunnel", "GET", "/", 200, 20 - i)
+                         for i in range(15)])
+
+        # THEN
+        self.assertEqual(["12", "13", "14"], [r.id for r in recorder.query()])
+
+        recorder.max_requests = None
+        recorder.record([self.given_captured_request("old", "my-tunnel", "GET", "/", 200, 60)])
+        self.assertEqual(3, recorder.count())
+
+        recorder.close()
+
+    def test_retention_without_start_time(self):
+        # GIVEN
+        recorder = RequestRecorder(max_age=10 * 60)
+        unparsed_request = CapturedRequest(dict(self.given_captured_request("unparsed", "my-tunnel", "GET", "/", 200,
+                                                                            0).data, start="not a time"))
+        recorder.record([unparsed_request, self.given_captured_request("1", "my-tunnel", "GET", "/", 200, 1)])
+
+        # WHEN
+        recorder.record([self.given_captured_request("old", "my-tunnel", "GET", "/", 200, 60)])
+
+        # THEN
+        self.assertEqual(["1"], [r.id for r in recorder.query()])
+        self.assertEqual(1, recorder.count(
+            start_after=(self.now - timedelta(minutes=2)).strftime("%Y-%m-%dT%H:%M:%S.5Z")))
+
+        recorder.close()
+
+    def test_persists_to_file(self):
+        # GIVEN
+        path = os.path.join(self.pyngrok_config.config_path.rsplit(os.sep, 1)[0], "requests.db")
+        recorder = RequestRecorder(path)
+        recorder.record([self.given_captured_request("1", "my-tunnel", "GET", "/", 200, 1)])
+        recorder.close()
+
+        # WHEN
+        reopened = RequestRecorder(path)
+
+        # THEN
+        self.assertEqual(["1"], [r.id for r in reopened.query()])
+
+        reopened.close()
+
+    def test_sync_process_not_running(self):
+        # GIVEN
+        recorder = RequestRecorder(pyngrok_config=self.pyngrok_config)
+
+        # WHEN
+        recorded = recorder.sync()
+
+        # THEN
+        self.assertEqual(0, recorded)
+        self.assertFalse(ngrok.process.is_process_running(self.pyngrok_config.ngrok_path))
+
+        recorder.close()
+
+    @unittest.skipIf(platform.system() == "Windows", "The fake agent is not supported on Windows")
+    def test_sync(self):
+        # GIVEN
+        self.given_fake_ngrok_installed(self.pyngrok_config)
+        api_url = ngrok.get_ngrok_process(self.pyngrok_config).api_url
+        recorder = RequestRecorder(pyngrok_config=self.pyngrok_config)
+        self.given_fake_captured_requests(api_url, "my-tunnel", 2)
+
+        # WHEN
+        first_recorded = recorder.sync()
+        self.given_fake_captured_requests(api_url, "other-tunnel", 3)
+        second_recorded = recorder.sync()
+
+        # THEN
+        self.assertEqual(2, first_recorded)
+        self.assertEqual(3, second_recorded)
+        self.assertEqual(2, recorder.count(tunnel_name="my-tunnel", method="POST", path="/webhook"))
+        self.assertEqual(5, recorder.count(status_code=200))
+
+        recorder.close()
+
+    @unittest.skipIf(platform.system() == "Windows", "The fake agent is not supported on Windows")
+    def test_sync_per_tunnel(self):
+        # GIVEN
+        self.given_fake_ngrok_installed(self.pyngrok_config)
+        api_url = ngrok.get_ngrok_process(self.pyngrok_config).api_url
+        recorder = RequestRecorder(pyngrok_config=self.pyngrok_config)
+        self.given_fake_captured_requests(api_url, "my-tunnel", 1, start=(self.now - timedelta(minutes=2)).isoformat())
+        self.given_fake_captured_requests(api_url, "other-tunnel", 1, start=self.now.isoformat())
+
+        # WHEN
+        other_recorded = recorder.sync("other-tunnel")
+        my_recorded = recorder.sync("my-tunnel")
+
+        # THEN
+        self.assertEqual(1, other_recorded)
+        self.assertEqual(1, my_recorded)
+        self.assertEqual(1, recorder.count(tunnel_name="my-tunnel"))
+
+        recorder.close()
+
+    @unittest.skipIf(platform.system() == "Windows", "The fake agent is not supported on Windows")
+    def test_sync_same_start(self):
+        # GIVEN
+        self.given_fake_ngrok_installed(self.pyngrok_config)
+        api_url = ngrok.get_ngrok_process(self.pyngrok_config).api_url
+        recorder = RequestRecorder(pyngrok_config=self.pyngrok_config)
+        start = self.now.isoformat()
+        self.given_fake_captured_requests(api_url, "my-tunnel", 1, start=start)
+
+        # WHEN
+        first_recorded = recorder.sync()
+        self.given_fake_captured_requests(api_url, "my-tunnel", 1, start=start)
+        second_recorded = recorder.sync()
+        third_recorded = recorder.sync()
+
+        # THEN
+        self.assertEqual(1, first_recorded)
+        self.assertEqual(1, second_recorded)
+        self.assertEqual(0, third_recorded)
+        self.assertEqual(2, recorder.count(tunnel_name="my-tunnel"))
+
+        recorder.close()
+
+    def given_captured_request(self, request_id, tunnel_name, method, uri, status_code, minutes_ago,
+                               remote_addr="127.0.0.1"):
+        return CapturedRequest({
+            "id": request_id,
+            "tunnel_name": tunnel_name,
+            "remote_addr": remote_addr,
+            "start": (self.now - timedelta(minutes=minutes_ago)).isoformat(),
+            "duration": 1000,
+            "request": {"method": method, "uri": uri, "headers": {}},
+            "response": {"status": str(status_code), "status_code": status_code, "headers": {}},
+        })
+
+    @staticmethod
+    def given_fake_captured_requests(api_url, tunnel_name, count, start=None):
+        ngrok.api_request(f"{api_url}/_fake/requests", method="POST",
+                          data={"tunnel_name": tunnel_name, "method": "POST", "uri": "/webhook", "count": count,
+                                "start": start})
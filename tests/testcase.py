@@ -10,7 +10,7 @@ from copy import copy
 import psutil
 from psutil import AccessDenied, NoSuchProcess
 
-from pyngrok import conf, installer, ngrok, process
+from pyngrok import conf, fake_agent, installer, ngrok, process
 from pyngrok.conf import PyngrokConfig
 
 logger = logging.getLogger(__name__)
@@ -46,6 +46,7 @@ class NgrokTestCase(unittest.TestCase):
                 pass
 
         ngrok._current_tunnels.clear()
+        process._start_counts.clear()
 
         if os.path.exists(self.config_dir):
             shutil.rmtree(self.config_dir)
@@ -54,6 +55,11 @@ class NgrokTestCase(unittest.TestCase):
     def given_ngrok_installed(pyngrok_config):
         ngrok.install_ngrok(pyngrok_config)
 
+    @staticmethod
+    def given_fake_ngrok_installed(pyngrok_config):
+        fake_agent.install_fake_agent(pyngrok_config.ngrok_path)
+        ngrok.install_ngrok(pyngrok_config)
+
     @staticmethod
     def given_file_doesnt_exist(path):
         if os.path.exists(path):